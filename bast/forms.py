@@ -1,9 +1,15 @@
 from django import forms
 from .models import BastRecordModel
+from core.cache import operator_choices
 from django.forms import DateInput
 
 class BastRecordForm(forms.ModelForm):
     bast_id = forms.CharField()
     class Meta:
         model = BastRecordModel
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Operator options come from the directory cache instead of a query per render
+        self.fields['spv'].choices = operator_choices()
@@ -65,5 +65,12 @@ class BastRecordModel(models.Model):
     samsung_exp = models.DateField(default=get_default_samsung_exp)
     notes = models.TextField(max_length=1000, default='', blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='bast_date_id_idx'),
+            models.Index(fields=['shift', 'date'], name='bast_shift_date_idx'),
+            models.Index(fields=['spv', 'date'], name='bast_spv_date_idx'),
+        ]
+
     def __str__(self):
         return self.bast_id
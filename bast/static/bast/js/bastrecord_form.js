@@ -0,0 +1,953 @@
+const bastrecordFormConfig = document.currentScript.dataset;
+
+function showErrorModal(message) {
+    const errorModal = new bootstrap.Modal(document.getElementById('errorModal'));
+    const errorContent = document.getElementById('errorModalContent');
+    errorContent.innerHTML = `<p>${message}</p>`;
+    errorModal.show();
+}
+
+// Initialize tooltips
+var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
+var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+    return new bootstrap.Tooltip(tooltipTriggerEl)
+})
+
+// Form validation with Bootstrap 5 and error modal
+document.addEventListener('DOMContentLoaded', function () {
+    const form = document.querySelector('.needs-validation');
+    if (form) {
+        form.addEventListener('submit', function (event) {
+            if (!form.checkValidity()) {
+                event.preventDefault();
+                event.stopPropagation();
+                const errorModal = new bootstrap.Modal(document.getElementById('errorModal'));
+                const errorContent = document.getElementById('errorModalContent');
+                let errorHtml = '<p>Mohon perbaiki kesalahan berikut:</p><ul class="mb-0">';
+                // Find all invalid fields
+                const invalidFields = form.querySelectorAll(':invalid');
+                invalidFields.forEach(field => {
+                    const fieldLabel = document.querySelector(`label[for="${field.id}"]`);
+                    const labelText = fieldLabel ? fieldLabel.textContent.trim().replace(':', '') : field.name;
+                    errorHtml += `<li><strong>${labelText}:</strong> ${field.validationMessage || 'Wajib diisi'}</li>`;
+                });
+                errorHtml += '</ul>';
+                errorContent.innerHTML = errorHtml;
+                errorModal.show();
+            }
+            form.classList.add('was-validated');
+        }, false);
+    }
+});
+
+// Initialize Flatpickr for datetime inputs
+document.addEventListener('DOMContentLoaded', function () {
+    // Handle start and end datetime changes
+    const startInput = document.getElementById('datetime_bast_start');
+    const endInput = document.getElementById('datetime_bast_end');
+
+    if (startInput && endInput) {
+        startInput.addEventListener('change', function () {
+            if (this.value) {
+                endInput.min = this.value;
+            }
+        });
+    }
+
+    // Setup all date and datetime pickers
+    const pickerConfigs = [
+        { id: 'id_date' },
+        { id: 'id_poco_exp' },
+        { id: 'id_samsung_exp' },
+        { id: 'datetime_bast_start', pickerClass: 'datetime-picker' },
+        { id: 'datetime_bast_end', pickerClass: 'datetime-picker' }
+    ];
+
+    pickerConfigs.forEach(config => {
+        setupCalendarIcon(config.id, config.pickerClass);
+    });
+});
+
+// All prefill data for the form in a single request, fetched once the BAST ID is set
+let bastBootstrap = null;
+function getBastBootstrap() {
+    if (!bastBootstrap) {
+        const params = new URLSearchParams({
+            kelompok: document.getElementById('id_kelompok').value,
+            spv: document.getElementById('id_spv').value,
+            cs_id: document.getElementById('id_bast_id').value.replace('BAST', 'CS'),
+        });
+        bastBootstrap = fetch(`${bastrecordFormConfig.formBootstrapUrl}?${params}`).then(response => {
+            if (!response.ok) {
+                throw new Error('Gagal mengambil data dari server');
+            }
+            return response.json();
+        });
+    }
+    return bastBootstrap;
+}
+
+// Example starter JavaScript for disabling form submissions if there are invalid fields
+(function () {
+    'use strict';
+    window.addEventListener('load', function () {
+        // Fetch all the forms we want to apply custom Bootstrap validation styles to
+        var forms = document.getElementsByClassName('needs-validation');
+        // Loop over them and prevent submission
+        var validation = Array.prototype.filter.call(forms, function (form) {
+            form.addEventListener('submit', function (event) {
+                if (form.checkValidity() === false) {
+                    event.preventDefault();
+                    event.stopPropagation();
+                }
+                form.classList.add('was-validated');
+            }, false);
+        });
+    }, false);
+})();
+
+// Helper for BAST ID suffix
+function getBastSuffix(waktuDinasValue) {
+    switch (waktuDinasValue) {
+        case 'Dini Hari':
+            return '1D';
+        case 'Pagi':
+            return '2P';
+        case 'Siang':
+            return '3S';
+        case 'Malam':
+            return '4M';
+        default:
+            return '';
+    }
+}
+
+// change bast_id and waktu_pelaksanaan value based on date_input and waktu_dinas
+document.addEventListener('DOMContentLoaded', function () {
+    const dateInput = document.getElementById('id_date');
+    const waktuDinasSelect = document.getElementById('id_shift');
+    const bastIdInput = document.getElementById('id_bast_id');
+    // Set initial value
+    bastIdInput.value = "BAST-" + dateInput.value + "-" + getBastSuffix(waktuDinasSelect.value);
+
+    function updateBastId() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        bastIdInput.value = "BAST-" + dateValue + "-" + getBastSuffix(waktuDinasValue);
+        const waktuPelaksanaanSelect = document.getElementById('id_waktu_pelaksanaan');
+        switch (waktuDinasValue) {
+            case 'Pagi':
+                waktuPelaksanaanSelect.selectedIndex = 1;
+                break;
+            case 'Siang':
+                waktuPelaksanaanSelect.selectedIndex = 2;
+                break;
+            case 'Malam':
+                waktuPelaksanaanSelect.selectedIndex = 3;
+                break;
+            case 'Dini Hari':
+                waktuPelaksanaanSelect.selectedIndex = 4;
+                break;
+        }
+    }
+
+    dateInput.addEventListener('change', updateBastId);
+    waktuDinasSelect.addEventListener('change', updateBastId);
+});
+
+// Fetch data and fill events
+document.getElementById('fetch_bast').addEventListener('click', function () {
+    const startDatetime = document.getElementById('datetime_bast_start').value.replace('T', ' ');
+    const endDatetime = document.getElementById('datetime_bast_end').value.replace('T', ' ');
+    const url = bastrecordFormConfig.fetchDataUrl
+        .replace('start_datetime', encodeURIComponent(startDatetime))
+        .replace('end_datetime', encodeURIComponent(endDatetime));
+
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            const bastInput = document.querySelector('[name="events"]');
+            bastInput.value = data.csv;
+
+            // Populate the table with fetched data
+            const tableBody = document.getElementById('fetched-data-table').querySelector('tbody');
+            tableBody.innerHTML = '';
+            data.table_data.forEach(row => {
+                const tr = document.createElement('tr');
+                Object.entries(row).forEach(([key, cell]) => {
+                    const td = document.createElement('td');
+                    td.textContent = cell;
+                    if (['MMI', 'Dis. PGN', 'Dis. PGR'].includes(key)) {
+                        td.contentEditable = true;
+                    }
+                    tr.appendChild(td);
+                });
+                tableBody.appendChild(tr);
+            });
+
+            // Expand the accordion if not already expanded
+            const fetchedDataSection = document.getElementById('fetchedDataSection');
+            const accordionButton = document.querySelector('[data-bs-target="#fetchedDataSection"]');
+            if (fetchedDataSection && accordionButton && !fetchedDataSection.classList.contains('show')) {
+                const bsCollapse = new bootstrap.Collapse(fetchedDataSection, {
+                    toggle: true
+                });
+            }
+        })
+        .catch(error => console.error('Error fetching data:', error));
+});
+
+// populate the table with members from the selected kelompok
+document.addEventListener('DOMContentLoaded', function () {
+    const kelompokSelect = document.getElementById('id_kelompok');
+    const tableBody = document.getElementById('member-data-table').querySelector('tbody');
+    const existingMembers = bastrecordFormConfig.existingMemberData;
+
+    function renderMembers(memberData) {
+                tableBody.innerHTML = '';
+                (memberData || []).forEach((name, index) => {
+                    const tr = document.createElement('tr');
+                    let keterangan = 'Hadir';
+                    if (existingMembers) {
+                        const existingMembersArray = JSON.parse(existingMembers);
+                        keterangan = existingMembersArray[index].keterangan;
+                    }
+                    tr.innerHTML = `
+                        <td>${index + 1}</td>
+                        <td>${name}</td>
+                        <td contentEditable=true>${keterangan}</td>
+                    `;
+                    tableBody.appendChild(tr);
+                });
+
+                // Trigger convertMemberTableToJSON after filling the column with "Hadir"
+                convertMemberTableToJSON();
+    }
+
+    function updateMembers() {
+        const selectedKelompok = kelompokSelect.value;
+        fetch(`/bast/api/get_member_data/${selectedKelompok}/`)
+            .then(response => response.json())
+            .then(data => renderMembers(data.member_data))
+            .catch(error => console.error('Error fetching members:', error));
+    }
+
+    kelompokSelect.addEventListener('change', updateMembers);
+    getBastBootstrap()
+        .then(data => renderMembers(data.member_data))
+        .catch(error => console.error('Error fetching members:', error));
+});
+
+// set the datetime_bast_start and datetime_bast_end default value to be dependent on the waktu_dinas
+document.addEventListener('DOMContentLoaded', function () {
+    const dateInput = document.getElementById('id_date');
+    const waktuDinasSelect = document.getElementById('id_shift');
+    const datetimeBastStart = document.getElementById('datetime_bast_start');
+    const datetimeBastEnd = document.getElementById('datetime_bast_end');
+
+    function updateDatetime() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        let startDatetime, endDatetime;
+
+        const prevDay = new Date(dateValue);
+        prevDay.setDate(prevDay.getDate() - 1);
+        const prevDayValue = prevDay.toISOString().split('T')[0];
+
+        switch (waktuDinasValue[0]) {
+            case 'P':
+                startDatetime = `${dateValue} 01:00:00`;
+                endDatetime = `${dateValue} 07:00:00`;
+                break;
+            case 'S':
+                startDatetime = `${dateValue} 07:00:00`;
+                endDatetime = `${dateValue} 13:00:00`;
+                break;
+            case 'M':
+                startDatetime = `${dateValue} 13:00:00`;
+                endDatetime = `${dateValue} 19:00:00`;
+                break;
+            case 'D':
+                startDatetime = `${prevDayValue} 19:00:00`;
+                endDatetime = `${dateValue} 01:30:00`;
+                break;
+        }
+
+        datetimeBastStart.value = startDatetime;
+        datetimeBastEnd.value = endDatetime;
+    }
+
+    dateInput.addEventListener('change', updateDatetime);
+    waktuDinasSelect.addEventListener('change', updateDatetime);
+    updateDatetime()
+
+    function updateDatetimeBastStart() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        bastIdInput.value = dateValue + "-" + waktuDinasValue;
+    }
+});
+
+// Set NIP's value based on the selected spv
+document.addEventListener('DOMContentLoaded', function () {
+    const spvSelect = document.getElementById('id_spv');
+    const nipInput = document.getElementById('id_NIP');
+
+    function updateNip(initial) {
+        const selectedSpv = spvSelect.value;
+        const selectedSpvText = spvSelect.options[spvSelect.selectedIndex].text;
+
+        // Only proceed if an SPV is actually selected (not the default empty option)
+        if (!selectedSpv) {
+            nipInput.value = '';
+            return;
+        }
+
+        const request = initial === true
+            ? getBastBootstrap().then(data => ({ nip: data.nip }))
+            : fetch(`/bast/api/get_nip/${selectedSpv}/`).then(response => {
+                if (!response.ok) {
+                    throw new Error('Gagal mengambil data dari server');
+                }
+                return response.json();
+            });
+        request
+            .then(data => {
+                if (data && data.nip) {
+                    nipInput.value = data.nip;
+                } else {
+                    nipInput.value = '';
+                    // Show modal for empty NIP
+                    const emptyNipModal = new bootstrap.Modal(document.getElementById('emptyNipModal'));
+                    const modalBody = document.getElementById('emptyNipModalBody');
+                    modalBody.innerHTML = `
+                        <p>Operator <strong>${selectedSpvText}</strong> belum memiliki NIP yang terdaftar.</p>
+                        <p>Silakan tambahkan NIP melalui halaman <a href="${bastrecordFormConfig.operatorListUrl}" class="alert-link">Manajemen Operator</a>.</p>
+                    `;
+                    emptyNipModal.show();
+                }
+            })
+            .catch(error => {
+                console.error('Error fetching NIP:', error);
+                // Only show error modal if an SPV is selected
+                if (spvSelect.value) {
+                    showErrorModal('Gagal mengambil data NIP: ' + (error.message || 'Terjadi kesalahan'));
+                }
+            });
+    }
+
+    spvSelect.addEventListener('change', updateNip);
+    updateNip(true);
+});
+
+// Convert table to CSV and put it in events form
+function convertTableToCSV() {
+    const table = document.getElementById('fetched-data-table');
+    let csv = [];
+    let headers = [];
+    const headerCells = table.querySelectorAll('thead th');
+    headerCells.forEach(th => {
+        const thText = th.childNodes[0].textContent.trim(); // Get the text content without the span and icons
+        headers.push(thText);
+    });
+    csv.push(headers.join(','));
+
+    for (let rowIndex = 1; rowIndex < table.rows.length; rowIndex++) { // Start from 1 to skip the header row
+        let row = table.rows[rowIndex];
+        let rowData = [];
+        for (let cell of row.cells) {
+            let cellText = cell.textContent;
+            if (rowIndex !== 0 && (cell.cellIndex === 8 || cell.cellIndex === 9) && !cellText.startsWith('"')) { // Assuming "Region" is the 9th column (index 8) and "MMI" is the 10th column (index 9)
+                cellText = `"${cellText}"`;
+            }
+            // Omit cells with tooltips
+            if (!cell.querySelector('.fas.fa-info-circle')) {
+                rowData.push(cellText);
+            }
+        }
+        csv.push(rowData.join(','));
+    }
+    const csvString = csv.join('\n');
+    const bastInput = document.querySelector('[name="events"]');
+    bastInput.value = csvString;
+}
+
+// Convert member table to JSON and put it in member form in real-time
+function convertMemberTableToJSON() {
+    const table = document.getElementById('member-data-table');
+    let json = [];
+    for (let rowIndex = 1; rowIndex < table.rows.length; rowIndex++) { // Start from 1 to skip the header row
+        let row = table.rows[rowIndex];
+        let rowData = {};
+        rowData['nama'] = row.cells[1].textContent; // Assuming "Nama" is the 2nd column (index 1)
+        rowData['keterangan'] = row.cells[2].textContent; // Assuming "Keterangan" is the 3rd column (index 2)
+        json.push(rowData);
+    }
+    const jsonString = JSON.stringify(json);
+    const memberInput = document.getElementById('id_member');
+    memberInput.value = jsonString;
+}
+
+// Trigger convertMemberTableToJSON on table cell input
+document.addEventListener('input', function (event) {
+    if (event.target.closest('#member-data-table td[contenteditable="true"]')) {
+        convertMemberTableToJSON();
+    }
+});
+
+// Trigger calculateSelisihPGN, calculateSelisihPGR, and convertTableToCSV on input in fetched-data-table
+document.addEventListener('input', function (event) {
+    if (event.target.closest('#fetched-data-table td[contenteditable="true"]')) {
+        calculateSelisihPGN();
+        calculateSelisihPGR();
+        convertTableToCSV();
+    }
+});
+
+// Populate table with existing data when editing the form
+document.addEventListener('DOMContentLoaded', function () {
+    const existingDataCSV = bastrecordFormConfig.existingData;
+    if (existingDataCSV) {
+        const rows = existingDataCSV.split('\n');
+        const tableBody = document.getElementById('fetched-data-table').querySelector('tbody');
+        if (tableBody) {
+            tableBody.innerHTML = '';
+            rows.forEach((row, rowIndex) => {
+                // Skip the header row (rowIndex === 0)
+                if (rowIndex === 0) return; // or continue;
+
+                const tr = document.createElement('tr');
+                const cells = parseCSV(row);
+                cells.forEach((cell, cellIndex) => {
+                    const td = document.createElement('td');
+                    if (cell) {
+                        td.textContent = cell;
+                    }
+
+                    const th = tableBody.parentElement.querySelector('thead').querySelector('th:nth-child(' + (cellIndex + 1) + ')');
+                    if (th) {
+                        const thText = th.childNodes[0].textContent.trim(); // Get the text content without the span and icons
+                        if (['MMI', 'Dis. PGN', 'Dis. PGR'].includes(thText)) {
+                            td.contentEditable = true;
+                        }
+                    }
+
+                    tr.appendChild(td);
+                });
+                tableBody.appendChild(tr);
+            });
+        } else {
+            console.error("Table body not found!");
+        }
+    }
+});
+
+// Parse CSV string into an array of arrays
+function parseCSV(csvString) {
+    const result = [];
+    let inQuotes = false;
+    let currentField = '';
+
+    for (let i = 0; i < csvString.length; i++) {
+        const char = csvString[i];
+
+        if (char === '"') {
+            if (inQuotes && i + 1 < csvString.length && csvString[i + 1] === '"') {
+                // Escaped double quote
+                currentField += '"';
+                i++; // Skip the next quote
+            } else {
+                inQuotes = !inQuotes;
+            }
+        } else if (char === ',' && !inQuotes) {
+            result.push(currentField.trim());
+            currentField = '';
+        } else {
+            currentField += char;
+        }
+    }
+    result.push(currentField.trim()); // Add the last field
+    return result;
+}
+
+// Function to calculate the difference between Dis. PGN and OT (UTC)
+function calculateSelisihPGN() {
+    const table = document.getElementById('fetched-data-table');
+    for (let rowIndex = 1; rowIndex < table.rows.length; rowIndex++) { // Start from 1 to skip the header row
+        let row = table.rows[rowIndex];
+        let otUTC = row.cells[2].textContent; // Assuming "OT (UTC)" is the 3rd column (index 2)
+        let disPGN = row.cells[10].textContent; // Assuming "Dis. PGN" is the 11th column (index 10)
+        let selisihPGNCell = row.cells[11]; // Assuming "Selisih PGN" is the 12th column (index 11)
+
+        if (otUTC && disPGN) {
+            let otUTCDate = new Date(`1970-01-01T${otUTC}Z`).getTime();
+            let disPGNTime = disPGN.includes(':') ? disPGN : `${disPGN}:00`; // Add seconds if not present
+            let disPGNDate = new Date(`1970-01-01T${disPGNTime}Z`).getTime();
+            let selisihPGN = (disPGNDate - otUTCDate) / 1000; // Difference in seconds
+
+            let hours = Math.floor(selisihPGN / 3600);
+            let minutes = Math.floor((selisihPGN % 3600) / 60);
+            let seconds = Math.floor(selisihPGN % 60);
+
+            if (isNaN(hours) || isNaN(minutes) || isNaN(seconds)) {
+                selisihPGNCell.textContent = "";
+            } else {
+                selisihPGNCell.textContent = `${String(hours).padStart(2, '0')}:${String(minutes).padStart(2, '0')}:${String(seconds).padStart(2, '0')}`;
+            }
+        }
+        else {
+            selisihPGNCell.textContent = "";
+        }
+    }
+}
+
+// Function to calculate the difference between Dis. PGR and OT (UTC)
+function calculateSelisihPGR() {
+    const table = document.getElementById('fetched-data-table');
+    for (let rowIndex = 1; rowIndex < table.rows.length; rowIndex++) { // Start from 1 to skip the header row
+        let row = table.rows[rowIndex];
+        let otUTC = row.cells[2].textContent; // Assuming "OT (UTC)" is the 3rd column (index 2)
+        let disPGR = row.cells[12].textContent; // Assuming "Dis. PGR" is the 13th column (index 12)
+        let selisihPGRCell = row.cells[13]; // Assuming "Selisih PGR" is the 14th column (index 13)
+
+        if (otUTC && disPGR) {
+            let otUTCDate = new Date(`1970-01-01T${otUTC}Z`).getTime();
+            let disPGRTime = disPGR.includes(':') ? disPGR : `${disPGR}:00`; // Add seconds if not present
+            let disPGRDate = new Date(`1970-01-01T${disPGRTime}Z`).getTime();
+            let selisihPGR = (disPGRDate - otUTCDate) / 1000; // Difference in seconds
+
+            let hours = Math.floor(selisihPGR / 3600);
+            let minutes = Math.floor((selisihPGR % 3600) / 60);
+            let seconds = Math.floor(selisihPGR % 60);
+
+            if (isNaN(hours) || isNaN(minutes) || isNaN(seconds)) {
+                selisihPGRCell.textContent = "";
+            } else {
+                selisihPGRCell.textContent = `${String(hours).padStart(2, '0')}:${String(minutes).padStart(2, '0')}:${String(seconds).padStart(2, '0')}`;
+            }
+        }
+        else {
+            selisihPGRCell.textContent = "";
+        }
+    }
+}
+
+// Trigger calculateSelisihPGN and calculateSelisihPGR when the table cells are edited
+document.addEventListener('blur', function (event) {
+    if (event.target.closest('#fetched-data-table td[contenteditable="true"]')) {
+        calculateSelisihPGN();
+        calculateSelisihPGR();
+        convertTableToCSV();
+    }
+});
+
+// Autofill waktu_cs, count_gaps, count_spikes, and count_blanks based on bast_id
+document.addEventListener('DOMContentLoaded', function () {
+    const bastIdInput = document.getElementById('id_bast_id');
+    const countGapsInput = document.getElementById('id_count_gaps');
+    const countSpikesInput = document.getElementById('id_count_spikes');
+    const countBlanksInput = document.getElementById('id_count_blanks');
+    const shiftSelect = document.getElementById('id_shift');
+    const dateInput = document.getElementById('id_date');
+    const waktuCsInput = document.getElementById('id_waktu_cs');
+
+    function simplifyCsId(csId) {
+        // Replace -1D, -2P, -3S, -4M with -D, -P, -S, -M
+        return csId.replace(/-(\\d)([DPSM])$/, '-$2');
+    }
+
+    function fillCounts(data) {
+                if (data.count_gaps !== undefined) {
+                    countGapsInput.value = data.count_gaps;
+                }
+                if (data.count_spikes !== undefined) {
+                    countSpikesInput.value = data.count_spikes;
+                }
+                if (data.count_blanks !== undefined) {
+                    countBlanksInput.value = data.count_blanks;
+                }
+                if (data.waktu_cs !== undefined) {
+                    waktuCsInput.value = data.waktu_cs;
+                }
+    }
+
+    function autofillCounts() {
+        const bastId = bastIdInput.value;
+        let csId = bastId.replace('BAST', 'CS');
+        csId = simplifyCsId(csId);
+        fetch(`/bast/api/get_cs_data/${csId}/`)
+            .then(response => response.json())
+            .then(fillCounts)
+            .catch(error => console.error('Error fetching CS data:', error));
+    }
+
+    // Create a new event to trigger the change event
+    function triggerChangeEvent(element) {
+        const event = new Event('change', { bubbles: true });
+        element.dispatchEvent(event);
+    }
+
+    function handleDateOrShiftChange() {
+        triggerChangeEvent(bastIdInput);
+    }
+
+    shiftSelect.addEventListener('change', handleDateOrShiftChange);
+    dateInput.addEventListener('change', handleDateOrShiftChange);
+    bastIdInput.addEventListener('change', autofillCounts);
+
+    // Fill the counts of the initial BAST ID from the bootstrap data
+    if (bastIdInput.value) {
+        getBastBootstrap()
+            .then(data => fillCounts(data.cs || {}))
+            .catch(error => console.error('Error fetching CS data:', error));
+    }
+});
+// --- Fetch Previous Members Button Logic ---
+document.getElementById('fetch-prev-members-btn').addEventListener('click', function () {
+    getBastBootstrap()
+        .then(bootstrap => bootstrap.previous.members)
+        .then(data => {
+            // Get all existing rows in the table
+            const rows = document.querySelectorAll('#member-data-table tbody tr');
+            let updated = false;
+
+            // For each row, update only the Keterangan column if there's matching data
+            rows.forEach((row, index) => {
+                const namaCell = row.cells[1]; // Nama is in the second cell (index 1)
+                const keteranganCell = row.cells[2]; // Keterangan is in the third cell (index 2)
+
+                // Find matching member data by name (case insensitive)
+                const memberData = data.find(m =>
+                    m.nama && namaCell.textContent.trim().toLowerCase() === m.nama.trim().toLowerCase()
+                );
+
+                // Only update Keterangan if we found a match and it has a value
+                if (memberData && memberData.keterangan) {
+                    keteranganCell.textContent = memberData.keterangan;
+                    updated = true;
+                }
+            });
+
+            // If any updates were made, trigger the conversion to update the hidden field
+            if (updated) {
+                convertMemberTableToJSON();
+            } else {
+                showErrorModal('Hanya bisa mengambil data jika kelompok yang dipilih sama dengan kelompok pada data sebelumnya');
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching previous members:', error);
+            showErrorModal('Gagal mengambil data anggota sebelumnya: ' + error.message);
+        });
+});
+// --- End Fetch Previous Members ---
+// --- Fetch Previous Poco Exp Button Logic ---
+document.addEventListener('DOMContentLoaded', function () {
+    // Poco Expiration Date
+    const fetchPocoButton = document.getElementById('fetchPreviousPocoExp');
+    const pocoExpInput = document.getElementById('id_poco_exp');
+
+    if (fetchPocoButton && pocoExpInput) {
+        fetchPocoButton.addEventListener('click', function () {
+            getBastBootstrap()
+                .then(bootstrap => bootstrap.previous)
+                .then(data => {
+                    if (data.poco_exp !== null && data.poco_exp !== undefined) {
+                        pocoExpInput.value = data.poco_exp;
+                        // Trigger change event in case there are any listeners
+                        const event = new Event('change');
+                        pocoExpInput.dispatchEvent(event);
+                    } else {
+                        showErrorModal('No previous Poco Expiration Date found');
+                    }
+                })
+                .catch(error => {
+                    console.error('Error fetching previous Poco Expiration Date:', error);
+                    showErrorModal('Error fetching previous Poco Expiration Date');
+                });
+        });
+    }
+
+    // Samsung Expiration Date
+    const fetchSamsungButton = document.getElementById('fetchPreviousSamsungExp');
+    const samsungExpInput = document.getElementById('id_samsung_exp');
+
+    if (fetchSamsungButton && samsungExpInput) {
+        fetchSamsungButton.addEventListener('click', function () {
+            getBastBootstrap()
+                .then(bootstrap => bootstrap.previous)
+                .then(data => {
+                    if (data.samsung_exp !== null && data.samsung_exp !== undefined) {
+                        samsungExpInput.value = data.samsung_exp;
+                        // Trigger change event in case there are any listeners
+                        const event = new Event('change');
+                        samsungExpInput.dispatchEvent(event);
+                    } else {
+                        showErrorModal('No previous Samsung Expiration Date found');
+                    }
+                })
+                .catch(error => {
+                    console.error('Error fetching previous Samsung Expiration Date:', error);
+                    showErrorModal('Error fetching previous Samsung Expiration Date');
+                });
+        });
+    }
+
+    // Pulsa Poco
+    const fetchPulsaPocoButton = document.getElementById('fetchPreviousPulsaPoco');
+    const pulsaPocoInput = document.getElementById('id_pulsa_poco');
+
+    if (fetchPulsaPocoButton && pulsaPocoInput) {
+        fetchPulsaPocoButton.addEventListener('click', function () {
+            getBastBootstrap()
+                .then(bootstrap => bootstrap.previous)
+                .then(data => {
+                    if (data.pulsa_poco !== null && data.pulsa_poco !== undefined) {
+                        pulsaPocoInput.value = data.pulsa_poco;
+                        // Trigger change event in case there are any listeners
+                        const event = new Event('change');
+                        pulsaPocoInput.dispatchEvent(event);
+                    } else {
+                        showErrorModal('No previous Pulsa Poco value found');
+                    }
+                })
+                .catch(error => {
+                    console.error('Error fetching previous Pulsa Poco value:', error);
+                    showErrorModal('Error fetching previous Pulsa Poco value');
+                });
+        });
+    }
+});
+// --- End Fetch Previous Poco Exp ---
+
+// Handle form validation errors
+document.addEventListener('DOMContentLoaded', function () {
+    const formErrors = document.getElementById('form-errors');
+    if (formErrors && formErrors.dataset.errors === 'true') {
+        // Get the error modal element
+        const errorModalElement = document.getElementById('errorModal');
+        if (errorModalElement) {
+            // Initialize the Bootstrap 5 modal
+            const errorModal = new bootstrap.Modal(errorModalElement, {
+                backdrop: true, // Enable backdrop click to close
+                keyboard: true  // Enable ESC key to close
+            });
+
+            const errorContent = document.getElementById('errorModalContent');
+
+            if (errorContent) {
+                let errorHtml = '<p>Silakan perbaiki kesalahan berikut:</p><ul class="mb-0">';
+
+                // Get all error elements
+                const errorElements = formErrors.querySelectorAll('[data-field][data-error]');
+                if (errorElements.length > 0) {
+                    errorElements.forEach(el => {
+                        const fieldId = el.dataset.field;
+                        const errorMsg = el.dataset.error;
+                        const fieldLabel = document.querySelector(`label[for="${fieldId}"]`);
+                        const labelText = fieldLabel ? fieldLabel.textContent.trim().replace(':', '') : fieldId;
+                        errorHtml += `<li><strong>${labelText}:</strong> ${errorMsg}</li>`;
+                    });
+                } else {
+                    // Fallback if no specific field errors found
+                    errorHtml += '<li>Terjadi kesalahan saat memproses formulir.</li>';
+                }
+
+                errorHtml += '</ul>';
+                errorContent.innerHTML = errorHtml;
+
+                // Show the modal
+                errorModal.show();
+
+                // Manually handle close button click
+                const closeButtons = errorModalElement.querySelectorAll('[data-bs-dismiss="modal"]');
+                closeButtons.forEach(button => {
+                    button.addEventListener('click', function () {
+                        errorModal.hide();
+                    });
+                });
+            }
+        }
+    }
+});
+
+// Large Table Modal functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const openTableModalBtn = document.getElementById('openTableModal');
+    const largeTableModal = document.getElementById('largeTableModal');
+    const largeTableModalTable = document.getElementById('large-table-modal-table');
+    const refreshTableDataBtn = document.getElementById('refreshTableData');
+    const originalTable = document.getElementById('fetched-data-table');
+
+    // Initialize Bootstrap modal
+    const bsModal = new bootstrap.Modal(largeTableModal);
+
+    // Function to sync data from original table to modal table
+    function syncDataToModal() {
+        const originalTableBody = originalTable.querySelector('tbody');
+        const modalTableBody = largeTableModalTable.querySelector('tbody');
+
+        // Clear modal table body
+        modalTableBody.innerHTML = '';
+
+        // Copy each row from original table to modal table
+        Array.from(originalTableBody.rows).forEach(row => {
+            const newRow = document.createElement('tr');
+
+            Array.from(row.cells).forEach((cell, index) => {
+                const newCell = document.createElement('td');
+                newCell.textContent = cell.textContent;
+
+                // Make editable columns same as original (MMI, Dis. PGN, Dis. PGR)
+                if (cell.contentEditable === 'true') {
+                    newCell.contentEditable = true;
+                    newCell.style.backgroundColor = '#fff3cd'; // Light yellow to indicate editable
+                    newCell.style.cursor = 'text';
+                }
+
+                newRow.appendChild(newCell);
+            });
+
+            modalTableBody.appendChild(newRow);
+        });
+
+        // Initialize tooltips for the modal table
+        var tooltipTriggerList = [].slice.call(largeTableModalTable.querySelectorAll('[data-bs-toggle="tooltip"]'));
+        var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+            return new bootstrap.Tooltip(tooltipTriggerEl);
+        });
+    }
+
+    // Function to sync data from modal table back to original table
+    function syncDataFromModal() {
+        const originalTableBody = originalTable.querySelector('tbody');
+        const modalTableBody = largeTableModalTable.querySelector('tbody');
+
+        // Update each row in original table with data from modal table
+        Array.from(modalTableBody.rows).forEach((modalRow, rowIndex) => {
+            const originalRow = originalTableBody.rows[rowIndex];
+            if (originalRow) {
+                // First, update all editable cells (MMI, Dis. PGN, Dis. PGR)
+                Array.from(modalRow.cells).forEach((modalCell, cellIndex) => {
+                    const originalCell = originalRow.cells[cellIndex];
+                    if (originalCell && modalCell.contentEditable === 'true') {
+                        originalCell.textContent = modalCell.textContent;
+                    }
+                });
+
+                // Update Selisih PGN (column 11) if Dis. PGN (column 10) was edited
+                const disPgnCell = modalRow.cells[10];
+                const selisihPgnCell = originalRow.cells[11];
+                if (disPgnCell && selisihPgnCell && disPgnCell.textContent.trim() !== '') {
+                    const otCell = modalRow.cells[2]; // OT (UTC) column
+                    if (otCell && otCell.textContent.trim() !== '') {
+                        const otTime = new Date('1970-01-01T' + otCell.textContent + 'Z');
+                        const disPgnTime = new Date('1970-01-01T' + disPgnCell.textContent + 'Z');
+
+                        if (!isNaN(otTime) && !isNaN(disPgnTime)) {
+                            const diffInSeconds = (disPgnTime - otTime) / 1000;
+                            const minutes = Math.floor(Math.abs(diffInSeconds) / 60);
+                            const seconds = Math.abs(diffInSeconds) % 60;
+                            const sign = diffInSeconds >= 0 ? '' : '-';
+                            selisihPgnCell.textContent = `${sign}${minutes}:${seconds.toString().padStart(2, '0')}`;
+                        }
+                    }
+                }
+
+                // Update Selisih PGR (column 13) if Dis. PGR (column 12) was edited
+                const disPgrCell = modalRow.cells[12];
+                const selisihPgrCell = originalRow.cells[13];
+                if (disPgrCell && selisihPgrCell && disPgrCell.textContent.trim() !== '') {
+                    const otCell = modalRow.cells[2]; // OT (UTC) column
+                    if (otCell && otCell.textContent.trim() !== '') {
+                        const otTime = new Date('1970-01-01T' + otCell.textContent + 'Z');
+                        const disPgrTime = new Date('1970-01-01T' + disPgrCell.textContent + 'Z');
+
+                        if (!isNaN(otTime) && !isNaN(disPgrTime)) {
+                            const diffInSeconds = (disPgrTime - otTime) / 1000;
+                            const minutes = Math.floor(Math.abs(diffInSeconds) / 60);
+                            const seconds = Math.abs(diffInSeconds) % 60;
+                            const sign = diffInSeconds >= 0 ? '' : '-';
+                            selisihPgrCell.textContent = `${sign}${minutes}:${seconds.toString().padStart(2, '0')}`;
+                        }
+                    }
+                }
+            }
+        });
+
+        // Trigger the CSV conversion to update the form
+        convertTableToCSV();
+    }
+
+    // Open modal button click handler
+    openTableModalBtn.addEventListener('click', function() {
+        // Check if there's data in the original table
+        const originalTableBody = originalTable.querySelector('tbody');
+        if (originalTableBody.rows.length === 0) {
+            alert('No data available. Please fetch data first.');
+            return;
+        }
+
+        // Sync data to modal and show it
+        syncDataToModal();
+        bsModal.show();
+    });
+
+    // Refresh data button click handler
+    refreshTableDataBtn.addEventListener('click', function() {
+        syncDataToModal();
+    });
+
+    // Handle modal close - sync data back to original table
+    largeTableModal.addEventListener('hidden.bs.modal', function() {
+        syncDataFromModal();
+    });
+
+    // Handle input events in modal table (for editable cells)
+    largeTableModalTable.addEventListener('input', function(event) {
+        if (event.target.contentEditable === 'true') {
+            // Calculate selisih values if needed (similar to original table logic)
+            const cell = event.target;
+            const row = cell.parentElement;
+            const cellIndex = cell.cellIndex;
+
+            // Calculate Selisih PGN (column 11) when Dis. PGN (column 10) is edited
+            if (cellIndex === 10) { // Dis. PGN column
+                const otCell = row.cells[2]; // OT (UTC) column
+                const selisihPgnCell = row.cells[11]; // Selisih PGN column
+
+                if (otCell && selisihPgnCell && cell.textContent.trim() !== '') {
+                    const otTime = new Date('1970-01-01T' + otCell.textContent + 'Z');
+                    const disPgnTime = new Date('1970-01-01T' + cell.textContent + 'Z');
+
+                    if (!isNaN(otTime) && !isNaN(disPgnTime)) {
+                        const diffInSeconds = (disPgnTime - otTime) / 1000;
+                        const minutes = Math.floor(Math.abs(diffInSeconds) / 60);
+                        const seconds = Math.abs(diffInSeconds) % 60;
+                        const sign = diffInSeconds >= 0 ? '' : '-';
+                        selisihPgnCell.textContent = `${sign}${minutes}:${seconds.toString().padStart(2, '0')}`;
+                    }
+                }
+            }
+
+            // Calculate Selisih PGR (column 13) when Dis. PGR (column 12) is edited
+            if (cellIndex === 12) { // Dis. PGR column
+                const otCell = row.cells[2]; // OT (UTC) column
+                const selisihPgrCell = row.cells[13]; // Selisih PGR column
+
+                if (otCell && selisihPgrCell && cell.textContent.trim() !== '') {
+                    const otTime = new Date('1970-01-01T' + otCell.textContent + 'Z');
+                    const disPgrTime = new Date('1970-01-01T' + cell.textContent + 'Z');
+
+                    if (!isNaN(otTime) && !isNaN(disPgrTime)) {
+                        const diffInSeconds = (disPgrTime - otTime) / 1000;
+                        const minutes = Math.floor(Math.abs(diffInSeconds) / 60);
+                        const seconds = Math.abs(diffInSeconds) % 60;
+                        const sign = diffInSeconds >= 0 ? '' : '-';
+                        selisihPgrCell.textContent = `${sign}${minutes}:${seconds.toString().padStart(2, '0')}`;
+                    }
+                }
+            }
+        }
+    });
+});
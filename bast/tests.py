@@ -1,3 +1,48 @@
+import datetime
+
 from django.test import TestCase
+from django.urls import reverse
+
+from cl_seiscomp.models import CsRecordModel
+from core.models import Operator, Kelompok
+from core.test_runner import ProcessCachesMixin
+from .models import BastRecordModel
+
+
+class BastFormBootstrapTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.operator = Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+        kelompok = Kelompok.objects.create(name=2)
+        kelompok.set_members([self.operator.pk])
+        BastRecordModel.objects.create(
+            bast_id='BAST-2025-05-01-2P', date=datetime.date(2025, 5, 1), spv=self.operator,
+            member='[{"nama": "Test Operator", "keterangan": "Cuti"}]', pulsa_poco=15000,
+            poco_exp=datetime.date(2025, 12, 31))
+        CsRecordModel.objects.create(cs_id='CS-2025-05-02-2P', date=datetime.date(2025, 5, 2),
+                                     operator=self.operator, jam_pelaksanaan='06:00 WIB')
+
+    def test_bootstrap_returns_all_prefill_data(self):
+        url = reverse('bast:form_bootstrap')
+        params = {'kelompok': 2, 'spv': self.operator.pk, 'cs_id': 'CS-2025-05-02-2P'}
+        self.client.get(url, params)
+        # Member names and the NIP now come from the directory cache
+        with self.assertNumQueries(2):
+            data = self.client.get(url, params).json()
+
+        self.assertEqual(data['previous'], {
+            'members': [{'nama': 'Test Operator', 'keterangan': 'Cuti'}],
+            'poco_exp': '2025-12-31', 'samsung_exp': data['previous']['samsung_exp'], 'pulsa_poco': 15000,
+        })
+        self.assertEqual(data['member_data'], ['Test Operator'])
+        self.assertEqual(data['nip'], '1234567890123456')
+        self.assertEqual(data['cs'], {'count_gaps': 0, 'count_spikes': 0, 'count_blanks': 0, 'waktu_cs': '06:00 WIB'})
+
+    def test_bootstrap_without_parameters(self):
+        with self.assertNumQueries(1):
+            data = self.client.get(reverse('bast:form_bootstrap')).json()
+        self.assertEqual((data['member_data'], data['nip'], data['cs']), (None, None, None))
 
-# Create your tests here.
+    def test_form_page_uses_bootstrap(self):
+        response = self.client.get(reverse('bast:bastrecord_create'))
+        self.assertContains(response, reverse('bast:form_bootstrap'))
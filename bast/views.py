@@ -4,14 +4,12 @@ from django.views.generic import ListView, CreateView, UpdateView
 from django.urls import reverse_lazy
 from .models import BastRecordModel
 from cl_seiscomp.models import CsRecordModel
-from core.models import Kelompok
+from core.cache import kelompok_member_names, operator_nip
 from .forms import BastRecordForm
-import requests, openpyxl, datetime, os
-import pandas as pd
+import datetime, os
+from core.upstream import fetch_table
 from django.http import JsonResponse, HttpResponse
-from core.models import Operator
 from io import StringIO
-from openpyxl.utils.dataframe import dataframe_to_rows
 from django.views import View
 from django.shortcuts import redirect
 from django.forms.models import model_to_dict
@@ -83,6 +81,7 @@ class BastRecordDeleteDirectView(View):
 
 # Functions
 def clean_index3(data, start_datetime='2024-12-11 13:00:00', end_datetime='2024-12-11 19:00:00'):
+    import pandas as pd
     text = data.decode('utf-8')
 
     lines = text.split('\n')
@@ -130,40 +129,19 @@ def clean_index3(data, start_datetime='2024-12-11 13:00:00', end_datetime='2024-
     
     return df_selected
 
-def fetch_data(request, start_datetime='2024-12-11 13:00:00', end_datetime='2024-12-11 19:00:00'):
-    url = "http://202.90.198.41/index3.txt"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = clean_index3(response.content, start_datetime, end_datetime)
-        csv_data = data.to_csv(index=False)
-        table_data = data.to_dict(orient='records')
-        return JsonResponse({'csv': csv_data, 'table_data': table_data})
-    else:
-        return JsonResponse({'error': 'Failed to fetch data'}, status=500)
-
-def get_nip(request, operator_id):
-    try:
-        operator = Operator.objects.get(id=operator_id)
-        return JsonResponse({'nip': operator.NIP})
-    except Operator.DoesNotExist:
-        return JsonResponse({'error': 'Operator not found'}, status=404)
+async def fetch_data(request, start_datetime='2024-12-11 13:00:00', end_datetime='2024-12-11 19:00:00'):
+    return await fetch_table('index3.txt', clean_index3, start_datetime, end_datetime)
 
 def get_member_data(request, kelompok):
-    try:
-        kelompok = Kelompok.objects.get(name=kelompok)
-        member_data = kelompok.member
-        member_pks = [int(member.strip()) for member in member_data.split(',')]
-        member_names = [Operator.objects.get(pk=pk).name for pk in member_pks]
-        return JsonResponse({'member_data': member_names})
-    except Kelompok.DoesNotExist:
+    member_names = kelompok_member_names(kelompok)
+    if member_names is None:
         return JsonResponse({'error': 'Kelompok not found'}, status=404)
-    except Operator.DoesNotExist:
-        return JsonResponse({'error': 'One or more members not found'}, status=404)
+    return JsonResponse({'member_data': member_names})
 
 def export_to_excel(request, record_id):
     from qc.views import format_date_indonesian, get_hari_indonesia
     import json
+    import openpyxl
     
     try:
         record = BastRecordModel.objects.get(id=record_id)
@@ -191,6 +169,7 @@ def export_to_excel(request, record_id):
 def export_to_pdf(request, record_id):
     from qc.views import format_date_indonesian, get_hari_indonesia
     import json
+    import openpyxl
     
     try:
         record = BastRecordModel.objects.get(id=record_id)
@@ -295,28 +274,48 @@ def convert_to_indonesian(number):
     else:
         return str(number)
 
+def cs_prefill_data(cs_id):
+    """Counts and time slot of the CS record used to prefill a BAST, or None if it doesn't exist."""
+    cs_record = (CsRecordModel.objects.filter(cs_id=cs_id)
+                 .values('count_gaps', 'count_spikes', 'count_blanks', 'jam_pelaksanaan').first())
+    if cs_record is None:
+        return None
+    cs_record['waktu_cs'] = cs_record.pop('jam_pelaksanaan')
+    return cs_record
+
 def get_cs_data(request, cs_id):
-    try:
-        cs_record = CsRecordModel.objects.get(cs_id=cs_id)
-        return JsonResponse({
-            'count_gaps': cs_record.count_gaps,
-            'count_spikes': cs_record.count_spikes,
-            'count_blanks': cs_record.count_blanks,
-            'waktu_cs': cs_record.jam_pelaksanaan,
-        })
-    except CsRecordModel.DoesNotExist:
+    cs_data = cs_prefill_data(cs_id)
+    if cs_data is None:
         return JsonResponse({'error': 'CS record not found'}, status=404)
+    return JsonResponse(cs_data)
+
+def latest_bast_values():
+    """
+    Prefill values carried over from the most recent BAST record, from a single query.
+    Returns None if no records exist.
+    """
+    return (BastRecordModel.objects.order_by('-date', '-id')
+            .values('member', 'poco_exp', 'samsung_exp', 'pulsa_poco').first())
+
+def parse_bast_members(member):
+    """Parse the member field into a list of dicts with 'nama' and 'keterangan' keys."""
+    import json
+    try:
+        # The member data is stored as a JSON string in the member field
+        return json.loads(member) if member else []
+    except json.JSONDecodeError:
+        # If member data is not valid JSON, each line is a member name without keterangan
+        return [{'nama': name.strip(), 'keterangan': ''} for name in member.split('\n') if name.strip()]
 
 def get_previous_poco_exp(request):
     """
     Returns the poco_exp value from the most recent BAST record.
     Returns None if no records exist.
     """
-    try:
-        latest_record = BastRecordModel.objects.latest('date')
-        return JsonResponse({'poco_exp': latest_record.poco_exp})
-    except BastRecordModel.DoesNotExist:
+    latest = latest_bast_values()
+    if latest is None:
         return JsonResponse({'poco_exp': None}, status=404)
+    return JsonResponse({'poco_exp': latest['poco_exp']})
 
 
 def get_previous_samsung_exp(request):
@@ -324,11 +323,10 @@ def get_previous_samsung_exp(request):
     Returns the samsung_exp value from the most recent BAST record.
     Returns None if no records exist.
     """
-    try:
-        latest_record = BastRecordModel.objects.latest('date')
-        return JsonResponse({'samsung_exp': latest_record.samsung_exp})
-    except BastRecordModel.DoesNotExist:
+    latest = latest_bast_values()
+    if latest is None:
         return JsonResponse({'samsung_exp': None}, status=404)
+    return JsonResponse({'samsung_exp': latest['samsung_exp']})
 
 
 def get_previous_pulsa_poco(request):
@@ -336,48 +334,61 @@ def get_previous_pulsa_poco(request):
     Returns the pulsa_poco value from the most recent BAST record.
     Returns None if no records exist.
     """
-    try:
-        latest_record = BastRecordModel.objects.latest('date')
-        return JsonResponse({'pulsa_poco': latest_record.pulsa_poco})
-    except BastRecordModel.DoesNotExist:
+    latest = latest_bast_values()
+    if latest is None:
         return JsonResponse({'pulsa_poco': None}, status=404)
+    return JsonResponse({'pulsa_poco': latest['pulsa_poco']})
 
 def get_previous_members(request):
     """
     Returns the members data from the most recent BAST record.
     The response format is a list of dicts with 'nama' and 'keterangan' keys.
     """
-    try:
-        # Get the most recent BAST record
-        latest_record = BastRecordModel.objects.latest('date', 'id')
-        
-        # Parse the member data (assuming it's stored as a JSON string in the member field)
-        try:
-            import json
-            members = json.loads(latest_record.member) if latest_record.member else []
-            return JsonResponse(members, safe=False)
-        except json.JSONDecodeError:
-            # If member data is not valid JSON, try to parse it as a simple string
-            members = []
-            if latest_record.member:
-                # Assuming each line is a member name, and there's no keterangan
-                for i, name in enumerate(latest_record.member.split('\n')):
-                    if name.strip():
-                        members.append({
-                            'nama': name.strip(),
-                            'keterangan': ''
-                        })
-            return JsonResponse(members, safe=False)
-            
-    except BastRecordModel.DoesNotExist:
-        return JsonResponse([], safe=False)  # Return empty list if no records exist
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    latest = latest_bast_values()
+    # Return empty list if no records exist
+    return JsonResponse(parse_bast_members(latest['member']) if latest else [], safe=False)
+
+def bast_form_bootstrap(request):
+    """
+    Everything the BAST form prefills on load, in one response.
+    Query parameters: kelompok, spv (operator pk) and cs_id, all optional.
+    Costs one latest-record query and at most one CS query; member names and the
+    NIP are read through the directory cache.
+    """
+    latest = latest_bast_values()
+    data = {
+        'previous': {
+            'members': parse_bast_members(latest['member']) if latest else [],
+            'poco_exp': latest['poco_exp'] if latest else None,
+            'samsung_exp': latest['samsung_exp'] if latest else None,
+            'pulsa_poco': latest['pulsa_poco'] if latest else None,
+        },
+        'member_data': None,
+        'nip': None,
+        'cs': None,
+    }
+
+    kelompok = request.GET.get('kelompok', '')
+    if kelompok.isdigit():
+        data['member_data'] = kelompok_member_names(int(kelompok))
+
+    spv = request.GET.get('spv', '')
+    if spv.isdigit():
+        data['nip'] = operator_nip(int(spv))
+
+    cs_id = request.GET.get('cs_id')
+    if cs_id:
+        data['cs'] = cs_prefill_data(cs_id)
+
+    return JsonResponse(data)
 
 def populate_bast_sheet(sheet, record):
     from qc.views import format_date_indonesian, get_hari_indonesia
     import json
     import re
+    import openpyxl
+    from openpyxl.utils.dataframe import dataframe_to_rows
+    import pandas as pd
 
     member = json.loads(record.member)
     tanggal = format_date_indonesian(record.bast_id[5:-3])
@@ -496,7 +507,7 @@ def export_bast_to_csv(request):
         ])
         
         # Get all records ordered by bast_id
-        records = BastRecordModel.objects.all().order_by('bast_id')
+        records = BastRecordModel.objects.all().order_by('bast_id').select_related('spv')
         print(f"Found {records.count()} records to export")
         
         # Write data rows
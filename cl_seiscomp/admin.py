@@ -1,6 +1,10 @@
 from django.contrib import admin
-from .models import StationListModel, CsRecordModel
+from .models import StationListModel, CsRecordModel, StationIssue, CsDailySlotStat, CsDailyStationStat, SlmonImageJob
 
 # Register your models here.
 admin.site.register(StationListModel)
-admin.site.register(CsRecordModel)
\ No newline at end of file
+admin.site.register(CsRecordModel)
+admin.site.register(StationIssue)
+admin.site.register(CsDailySlotStat)
+admin.site.register(CsDailyStationStat)
+admin.site.register(SlmonImageJob)
\ No newline at end of file
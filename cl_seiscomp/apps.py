@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ClSeiscompConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cl_seiscomp'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from . import signals  # noqa: F401
+        from .stats import create_version_row
+        post_migrate.connect(create_version_row, sender=self, dispatch_uid='cs_stats_version_row')
@@ -0,0 +1,125 @@
+"""
+Background thumbnailing of uploaded SLMON images.
+
+CsRecordModel.save() only queues a SlmonImageJob when the stored file name
+changes. The job runs after the transaction commits, on a single background
+thread, so CS form submissions don't wait for PIL. Jobs are keyed on
+(cs_record, image) and claimed with a conditional UPDATE, so queueing the same
+upload twice or running the process_slmon_images command next to the worker
+never processes a file twice.
+
+A job stays RUNNING if its worker dies mid-way (a gunicorn restart, an
+out-of-memory kill). Once its claim is older than SLMON_STALE_AFTER it can be
+claimed again, by the next dispatch or by process_slmon_images. Attempts are
+counted when a job is claimed, so an image that keeps killing its worker still
+stops after SLMON_MAX_ATTEMPTS.
+
+Set SLMON_IMAGE_ASYNC = False to run jobs inline when the transaction commits.
+"""
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SLMON_MAX_SIZE = (1006, 600)
+SLMON_MAX_ATTEMPTS = 3
+# A thumbnail takes seconds, a RUNNING job older than this lost its worker
+SLMON_STALE_AFTER = datetime.timedelta(minutes=10)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slmon-images')
+
+
+def thumbnail_image(path, size=SLMON_MAX_SIZE):
+    """Shrink the image at `path` in place. Returns True if the file was rewritten."""
+    with Image.open(path) as img:
+        if img.height > size[0] or img.width > size[1]:
+            img.thumbnail(size)
+            img.save(path)
+            return True
+    return False
+
+
+def enqueue_thumbnail(record):
+    """Queue a thumbnail job for the record's current image, once per uploaded file."""
+    from .models import SlmonImageJob
+
+    job, created = SlmonImageJob.objects.get_or_create(cs_record=record, image=record.slmon_image.name)
+    if created or job.status == SlmonImageJob.PENDING:
+        transaction.on_commit(lambda: _dispatch(job.pk))
+    return job
+
+
+def _dispatch(job_pk):
+    if getattr(settings, 'SLMON_IMAGE_ASYNC', True):
+        _executor.submit(_run_in_thread, job_pk)
+    else:
+        process_job(job_pk)
+
+
+def _run_in_thread(job_pk):
+    try:
+        process_job(job_pk)
+    finally:
+        # Worker threads get their own connection, don't leave it open
+        connection.close()
+
+
+def claimable_jobs(now=None):
+    """Queued jobs, retryable failed jobs and jobs whose worker died while running them."""
+    from .models import SlmonImageJob
+
+    stale = (now or timezone.now()) - SLMON_STALE_AFTER
+    return SlmonImageJob.objects.filter(
+        Q(status__in=[SlmonImageJob.PENDING, SlmonImageJob.FAILED])
+        | Q(status=SlmonImageJob.RUNNING, claimed_at__lt=stale),
+        attempts__lt=SLMON_MAX_ATTEMPTS,
+    )
+
+
+def process_job(job_pk):
+    """Thumbnail the image of one job. Returns None if the job was already claimed or finished."""
+    from .models import SlmonImageJob
+
+    now = timezone.now()
+    claimed = claimable_jobs(now).filter(pk=job_pk).update(
+        status=SlmonImageJob.RUNNING, claimed_at=now, attempts=F('attempts') + 1)
+    if not claimed:
+        return None
+
+    job = SlmonImageJob.objects.select_related('cs_record').get(pk=job_pk)
+    try:
+        # Skip files replaced by a newer upload, that upload has its own job
+        if job.cs_record.slmon_image.name == job.image:
+            thumbnail_image(job.cs_record.slmon_image.path)
+        job.status = SlmonImageJob.DONE
+        job.error = ''
+    except Exception as e:
+        logger.exception('Thumbnailing %s failed', job.image)
+        job.status = SlmonImageJob.FAILED
+        job.error = str(e)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return job.status == SlmonImageJob.DONE
+
+
+def process_pending_jobs(limit=None):
+    """Run queued, retryable failed and stale running jobs inline. Returns (done, failed)."""
+    job_pks = claimable_jobs().order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        job_pks = job_pks[:limit]
+
+    done = failed = 0
+    for job_pk in list(job_pks):
+        result = process_job(job_pk)
+        if result:
+            done += 1
+        elif result is False:
+            failed += 1
+    return done, failed
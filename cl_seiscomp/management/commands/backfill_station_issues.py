@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from cl_seiscomp.models import CsRecordModel, StationIssue
+
+class Command(BaseCommand):
+    help = 'Rebuild the StationIssue table from the gaps, spikes and blanks of every CS record.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of StationIssue rows inserted per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        records = CsRecordModel.objects.only('pk', 'date', 'gaps', 'spikes', 'blanks').order_by('pk')
+        created = 0
+
+        with transaction.atomic():
+            deleted, _ = StationIssue.objects.all().delete()
+            issues = []
+            for record in records.iterator(chunk_size=batch_size):
+                issues.extend(record.get_station_issues())
+                if len(issues) >= batch_size:
+                    StationIssue.objects.bulk_create(issues, batch_size=batch_size)
+                    created += len(issues)
+                    issues = []
+            StationIssue.objects.bulk_create(issues, batch_size=batch_size)
+            created += len(issues)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Backfilled {created} station issues from {records.count()} CS records ({deleted} old rows removed).'))
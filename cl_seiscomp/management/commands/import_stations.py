@@ -1,42 +1,28 @@
-import csv
 from django.core.management.base import BaseCommand
-from cl_seiscomp.models import StationListModel
+from cl_seiscomp.station_import import import_stations, IMPORT_BATCH_SIZE
 
 class Command(BaseCommand):
-    help = 'Import station data from CSV file'
+    help = 'Sync the station list with a CSV file, upserting on (network, code)'
 
-    def handle(self, *args, **options):
-        # First, delete all existing station data
-        StationListModel.objects.all().delete()
-        self.stdout.write(self.style.SUCCESS('Existing station data cleared'))
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default='station_list.csv', help='CSV file with a header row')
+        parser.add_argument('--keep-missing', action='store_true', help='Keep stations that are not in the file')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without saving them')
 
-        # Read and import new data
-        with open('station_list.csv', 'r') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Extract coordinates
-                coordinates = row.get('Coordinates', '').strip()
-                if coordinates:
-                    try:
-                        # Split by comma and take first two values (lat, lon)
-                        lat, lon, _ = coordinates.split(',')
-                        lat = float(lat)
-                        lon = float(lon)
-                    except (ValueError, IndexError):
-                        lat = lon = None
-                else:
-                    lat = lon = None
+    def handle(self, *args, **options):
+        with open(options['file'], 'r', encoding='utf-8', newline='') as csvfile:
+            report = import_stations(
+                csvfile, header=True, remove_missing=not options['keep_missing'],
+                batch_size=options['batch_size'], dry_run=options['dry_run'],
+            )
 
-                station = StationListModel(
-                    network=row['network'],
-                    code=row['code'],
-                    province=row['province'],
-                    location=row['location'],
-                    digitizer_type=row['digitizer_type'],
-                    UPT=row['UPT'],
-                    longitude=lon,
-                    latitude=lat,
-                )
-                station.save()
+        for label, codes in (('Added', report.added), ('Changed', report.changed), ('Removed', report.removed)):
+            if codes:
+                self.stdout.write(f"{label}: {', '.join(codes)}")
+        for error in report.errors:
+            self.stdout.write(self.style.WARNING(error))
 
-        self.stdout.write(self.style.SUCCESS('Successfully imported station data'))
+        summary = ', '.join(f'{count} {key}' for key, count in report.summary().items())
+        prefix = 'Dry run, nothing saved: ' if options['dry_run'] else 'Successfully imported station data: '
+        self.stdout.write(self.style.SUCCESS(prefix + summary))
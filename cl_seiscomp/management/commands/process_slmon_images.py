@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from cl_seiscomp.images import process_pending_jobs
+
+class Command(BaseCommand):
+    help = 'Run queued SLMON thumbnail jobs, including the ones a worker restart left running.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of jobs to run')
+
+    def handle(self, *args, **options):
+        done, failed = process_pending_jobs(limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} SLMON image jobs, {failed} failed.'))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from cl_seiscomp.stats import rebuild_daily_stats
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily CS rollups (per slot and per station) used by the statistics page.'
+
+    def handle(self, *args, **options):
+        days = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt CS daily statistics for {days} days.'))
@@ -1,7 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Min, Max, Q
 from core.models import Operator
 from django.utils import timezone
-from PIL import Image  # Add this import
 
 KELOMPOK = (
     (1, 1),
@@ -26,6 +26,12 @@ SHIFT = (
     ('Dini Hari', 'Dini Hari'),
 )
 
+ISSUE_KIND = (
+    ('gaps', 'Gaps'),
+    ('spikes', 'Spikes'),
+    ('blanks', 'Blanks'),
+)
+
 class CsRecordModel(models.Model):
     # fields of the model
     date = models.DateField(default=timezone.now)
@@ -43,11 +49,27 @@ class CsRecordModel(models.Model):
     count_blanks = models.PositiveIntegerField(null=True, blank=True, default=0)
     slmon_image = models.ImageField(upload_to='cl_seiscomp/slmon_images/', null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'jam_pelaksanaan'], name='cs_date_jam_idx'),
+            models.Index(fields=['shift', 'date'], name='cs_shift_date_idx'),
+            models.Index(fields=['operator', 'date'], name='cs_operator_date_idx'),
+        ]
+
     def __str__(self):
         return self.cs_id
 
     def save(self, *args, **kwargs):
-        sensor_list = StationListModel.objects.values_list('code', flat=True)
+        from .stats import refresh_daily_stats
+        from .station_directory import station_directory
+        from .images import enqueue_thumbnail
+
+        previous_date = previous_image = None
+        if self.pk:
+            previous = CsRecordModel.objects.filter(pk=self.pk).values_list('date', 'slmon_image').first()
+            if previous:
+                previous_date, previous_image = previous
+        sensor_list = station_directory.codes()
 
         def clean_sensor(data):
             cleaned_data = []
@@ -76,14 +98,141 @@ class CsRecordModel(models.Model):
             self.blanks = '\n'.join(self.blanks)
 
         super().save(*args, **kwargs)
-        if self.slmon_image:
-            img = Image.open(self.slmon_image.path) # Open slmon_image using self
-
-            if img.height > 1006 or img.width > 600:
-                new_img = (1006, 600)
-                img.thumbnail(new_img)
-                img.save(self.slmon_image.path)
-            
+        self.sync_station_issues()
+        refresh_daily_stats([self.date, previous_date])
+        # Thumbnailing runs in the background, and only for a newly stored file
+        if self.slmon_image and self.slmon_image.name != previous_image:
+            enqueue_thumbnail(self)
+
+    def get_station_issues(self):
+        """Build (unsaved) StationIssue rows from the gaps, spikes and blanks text."""
+        issues = []
+        for kind, _ in ISSUE_KIND:
+            # dict.fromkeys drops repeated stations while keeping their order
+            for station in dict.fromkeys((getattr(self, kind) or '').splitlines()):
+                if station:
+                    issues.append(StationIssue(cs_record=self, station=station, kind=kind, date=self.date))
+        return issues
+
+    def sync_station_issues(self):
+        with transaction.atomic():
+            StationIssue.objects.filter(cs_record=self).delete()
+            StationIssue.objects.bulk_create(self.get_station_issues())
+
+class StationIssueQuerySet(models.QuerySet):
+    def per_station(self):
+        """Error frequency per station, worst first, in a single grouped query."""
+        return (
+            self.values('station')
+            .annotate(
+                gaps=Count('id', filter=Q(kind='gaps')),
+                spikes=Count('id', filter=Q(kind='spikes')),
+                blanks=Count('id', filter=Q(kind='blanks')),
+                total=Count('id'),
+                first_seen=Min('date'),
+                last_seen=Max('date'),
+            )
+            .order_by('-total', 'station')
+        )
+
+class StationIssue(models.Model):
+    """One station listed under gaps, spikes or blanks in a CS record."""
+    cs_record = models.ForeignKey(CsRecordModel, on_delete=models.CASCADE, related_name='station_issues')
+    station = models.CharField(max_length=10)
+    kind = models.CharField(max_length=6, choices=ISSUE_KIND)
+    # Copied from the CS record so date-bounded aggregates don't need a join
+    date = models.DateField()
+
+    objects = StationIssueQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cs_record', 'station', 'kind'], name='unique_station_issue'),
+        ]
+        indexes = [
+            models.Index(fields=['station', 'kind', 'date'], name='issue_station_kind_date_idx'),
+            models.Index(fields=['date', 'kind'], name='issue_date_kind_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.cs_record_id} {self.kind} {self.station}"
+
+class CsDailySlotStat(models.Model):
+    """Daily rollup of the CS counts per time slot, maintained by cl_seiscomp.stats."""
+    date = models.DateField()
+    jam_pelaksanaan = models.CharField(max_length=20, choices=WAKTU)
+    records = models.PositiveIntegerField(default=0)
+    count_gaps = models.PositiveIntegerField(default=0)
+    count_spikes = models.PositiveIntegerField(default=0)
+    count_blanks = models.PositiveIntegerField(default=0)
+    slmon = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'jam_pelaksanaan'], name='unique_cs_daily_slot'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.jam_pelaksanaan}"
+
+class CsDailyStationStat(models.Model):
+    """Daily rollup of the StationIssue rows per station, maintained by cl_seiscomp.stats."""
+    date = models.DateField()
+    station = models.CharField(max_length=10)
+    gaps = models.PositiveIntegerField(default=0)
+    spikes = models.PositiveIntegerField(default=0)
+    blanks = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'station'], name='unique_cs_daily_station'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.station}"
+
+class CsStatsVersion(models.Model):
+    """Single row counter, bumped whenever the CS rollups change. Used to key cached StatsView figures."""
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.version)
+
+class SlmonImageJob(models.Model):
+    """Thumbnail job for one uploaded SLMON image, processed by cl_seiscomp.images."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    cs_record = models.ForeignKey(CsRecordModel, on_delete=models.CASCADE, related_name='image_jobs')
+    # File name at upload time, a later upload gets its own job
+    image = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the job was last set to RUNNING, a claim older than SLMON_STALE_AFTER is taken over
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cs_record', 'image'], name='unique_slmon_image_job'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='slmon_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.image} ({self.status})"
+
 class StationListModel(models.Model):
     network = models.CharField(max_length=5)
     code = models.CharField(max_length=10)
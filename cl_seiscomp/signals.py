@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.db import defer_to_commit
+from .models import CsRecordModel, StationListModel
+from .stats import refresh_daily_stats
+from .station_directory import station_directory
+
+@receiver(post_delete, sender=CsRecordModel, dispatch_uid='cs_daily_stats_delete')
+def refresh_stats_on_delete(sender, instance, **kwargs):
+    # StationIssue rows are already gone through the cascade. Once per transaction,
+    # with the dates of every deleted record, when an operator delete cascades here
+    defer_to_commit(refresh_daily_stats, instance.date)
+
+@receiver(post_save, sender=StationListModel, dispatch_uid='station_directory_save')
+@receiver(post_delete, sender=StationListModel, dispatch_uid='station_directory_delete')
+def invalidate_station_directory(sender, **kwargs):
+    station_directory.invalidate()
@@ -0,0 +1,183 @@
+const csFormConfig = document.currentScript.dataset;
+
+document.getElementById('fetchDataButton').addEventListener('click', function () {
+    fetch(csFormConfig.fetchGapsBlanksUrl)
+        .then(response => response.text())
+        .then(data => {
+            const spikesFetch = document.getElementById("fetchSpikesCheckbox").checked;
+            const gapsField = document.getElementById('id_gaps');
+            const blanksField = document.getElementById('id_blanks');
+            const spikesField = document.getElementById('id_spikes');
+            const lastUpdate = document.getElementById('last_update');
+            data = JSON.parse(data);
+            lastUpdate.innerHTML = `Last Update: <strong>${data.last_update}</strong>`;
+            gapsField.value = data.gaps;
+            blanksField.value = data.blanks;
+            spikesField.value = spikesFetch ? data.spikes : [];
+        })
+        .catch(error => console.error('Error fetching data:', error));
+});
+
+// date picker initialization
+(function () {
+    const dateInput = document.getElementById('id_date');
+    dateInput.type = 'date';
+
+    // change cs_id value based on date_input and waktu_dinas
+    const waktuDinasSelect = document.getElementById('id_shift');
+    const qcIdInput = document.getElementById('id_cs_id');
+    const jamPelaksanaanSelect = document.getElementById('id_jam_pelaksanaan');
+
+    // Helper for CS ID suffix
+    function getCsSuffix(waktuDinasValue) {
+        switch (waktuDinasValue) {
+            case 'Dini Hari':
+                return '1D';
+            case 'Pagi':
+                return '2P';
+            case 'Siang':
+                return '3S';
+            case 'Malam':
+                return '4M';
+            default:
+                return '';
+        }
+    }
+
+    function updateQcId() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        qcIdInput.value = "CS-" + dateValue + "-" + getCsSuffix(waktuDinasValue);
+    }
+
+    function updateJamPelaksanaan() {
+        const shiftValue = waktuDinasSelect.value;
+        let jamPelaksanaanValue = "";
+        if (shiftValue === "Pagi") {
+            jamPelaksanaanValue = "12:00 WIB";
+        } else if (shiftValue === "Siang") {
+            jamPelaksanaanValue = "18:00 WIB";
+        } else if (shiftValue === "Malam") {
+            jamPelaksanaanValue = "00:00 WIB";
+        } else {
+            jamPelaksanaanValue = "06:00 WIB";
+        }
+        jamPelaksanaanSelect.value = jamPelaksanaanValue;
+    }
+
+    dateInput.addEventListener('change', updateQcId);
+    waktuDinasSelect.addEventListener('change', function () {
+        updateQcId();
+        updateJamPelaksanaan();
+    });
+
+    // Initialize cs_id and jam_pelaksanaan based on the default values
+    updateQcId();
+    updateJamPelaksanaan();
+})();
+
+// Paste functionality
+document.addEventListener('paste', function (event) {
+    const items = event.clipboardData.items;
+    for (let i = 0; i < items.length; i++) {
+        if (items[i].type.indexOf('image') !== -1) {
+            const file = items[i].getAsFile();
+            const reader = new FileReader();
+            reader.onload = function (event) {
+                const imgElement = document.getElementById('pasted_image');
+                imgElement.src = event.target.result;
+                imgElement.style.display = 'block';
+                const dataTransfer = new DataTransfer();
+                dataTransfer.items.add(file);
+                document.getElementById('slmon_image').files = dataTransfer.files;
+                document.getElementById('drop_zone').style.display = 'none';
+            };
+            reader.readAsDataURL(file);
+        }
+    }
+});
+
+// Drag and drop functionality
+const dropZone = document.getElementById('drop_zone');
+dropZone.addEventListener('dragover', function (event) {
+    event.preventDefault();
+    event.stopPropagation();
+    dropZone.classList.add('bg-light');
+});
+
+dropZone.addEventListener('dragleave', function (event) {
+    event.preventDefault();
+    event.stopPropagation();
+    dropZone.classList.remove('bg-light');
+});
+
+dropZone.addEventListener('drop', function (event) {
+    event.preventDefault();
+    event.stopPropagation();
+    dropZone.classList.remove('bg-light');
+    const file = event.dataTransfer.files[0];
+    if (file && file.type.indexOf('image') !== -1) {
+        const reader = new FileReader();
+        reader.onload = function (event) {
+            const imgElement = document.getElementById('pasted_image');
+            imgElement.src = event.target.result;
+            imgElement.style.display = 'block';
+            const dataTransfer = new DataTransfer();
+            dataTransfer.items.add(file);
+            document.getElementById('slmon_image').files = dataTransfer.files;
+            dropZone.style.display = 'none';
+        };
+        reader.readAsDataURL(file);
+    }
+});
+
+// Handle form validation errors
+document.addEventListener('DOMContentLoaded', function () {
+    const formErrors = document.getElementById('form-errors');
+    if (formErrors && formErrors.dataset.errors === 'true') {
+        // Get the error modal element
+        const errorModalElement = document.getElementById('errorModal');
+        if (errorModalElement) {
+            // Initialize the Bootstrap 5 modal
+            const errorModal = new bootstrap.Modal(errorModalElement, {
+                backdrop: true, // Enable backdrop click to close
+                keyboard: true  // Enable ESC key to close
+            });
+
+            const errorContent = document.getElementById('errorModalContent');
+
+            if (errorContent) {
+                let errorHtml = '<p>Silakan perbaiki kesalahan berikut:</p><ul class="mb-0">';
+
+                // Get all error elements
+                const errorElements = formErrors.querySelectorAll('[data-field][data-error]');
+                if (errorElements.length > 0) {
+                    errorElements.forEach(el => {
+                        const fieldId = el.dataset.field;
+                        const errorMsg = el.dataset.error;
+                        const fieldLabel = document.querySelector(`label[for="${fieldId}"]`);
+                        const labelText = fieldLabel ? fieldLabel.textContent.trim().replace(':', '') : fieldId;
+                        errorHtml += `<li><strong>${labelText}:</strong> ${errorMsg}</li>`;
+                    });
+                } else {
+                    // Fallback if no specific field errors found
+                    errorHtml += '<li>Terjadi kesalahan saat memproses formulir.</li>';
+                }
+
+                errorHtml += '</ul>';
+                errorContent.innerHTML = errorHtml;
+
+                // Show the modal
+                errorModal.show();
+
+                // Manually handle close button click
+                const closeButtons = errorModalElement.querySelectorAll('[data-bs-dismiss="modal"]');
+                closeButtons.forEach(button => {
+                    button.addEventListener('click', function () {
+                        errorModal.hide();
+                    });
+                });
+            }
+        }
+    }
+});
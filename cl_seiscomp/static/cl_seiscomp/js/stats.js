@@ -0,0 +1,63 @@
+const statsConfig = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Load the main plot from JSON
+    const plotData = JSON.parse(statsConfig.plotJson);
+    const stationPlotData = JSON.parse(statsConfig.stationPlotJson);
+
+    // Create main chart with improved x-axis tick formatting
+    Plotly.newPlot('statsChart', plotData.data, {
+        ...plotData.layout,
+        xaxis: {
+            ...plotData.layout.xaxis,
+            tickformatstops: [
+                {dtickrange: [null, 1000 * 60 * 60 * 24], value: "%H:%M"}, // For less than 1 day
+                {dtickrange: [1000 * 60 * 60 * 24, 1000 * 60 * 60 * 24 * 7], value: "%b %d"}, // For 1-7 days
+                {dtickrange: [1000 * 60 * 60 * 24 * 7, 1000 * 60 * 60 * 24 * 30], value: "%b %d"}, // For 1-4 weeks
+                {dtickrange: [1000 * 60 * 60 * 24 * 30, 1000 * 60 * 60 * 24 * 90], value: "%b"}, // For 1-3 months
+                {dtickrange: [1000 * 60 * 60 * 24 * 90, null], value: "%Y-%m"} // For more than 3 months
+            ],
+            tickmode: 'auto',
+            nticks: 10
+        }
+    });
+
+    // Create station error frequency chart
+    Plotly.newPlot('stationChart', stationPlotData.data, stationPlotData.layout);
+
+    // Update date inputs with current date range
+    const startDateInput = document.getElementById('start_date');
+    const endDateInput = document.getElementById('end_date');
+    const timeSelect = document.getElementById('time');
+
+    if (startDateInput && endDateInput) {
+        // Set min/max dates for inputs
+        const today = new Date();
+        const minDate = new Date(today.getFullYear() - 1, today.getMonth(), today.getDate());
+
+        startDateInput.min = minDate.toISOString().split('T')[0];
+        endDateInput.min = startDateInput.value;
+        endDateInput.max = today.toISOString().split('T')[0];
+
+        // Update min/max when start date changes
+        startDateInput.addEventListener('change', () => {
+            endDateInput.min = startDateInput.value;
+        });
+
+        // Update the chart when any input changes
+        function updateChart() {
+            const formData = new FormData();
+            formData.append('start_date', startDateInput.value);
+            formData.append('end_date', endDateInput.value);
+            formData.append('time', timeSelect.value);
+
+            // Submit the form
+            document.querySelector('form').submit();
+        }
+
+        // Add change listeners to all inputs
+        startDateInput.addEventListener('change', updateChart);
+        endDateInput.addEventListener('change', updateChart);
+        timeSelect.addEventListener('change', updateChart);
+    }
+});
@@ -0,0 +1,119 @@
+"""
+Process-wide cache of the station list.
+
+CsRecordModel.save(), ErrorStationForm and the ErrorStation views all need the
+station codes (and some metadata) on every request. StationDirectory loads them
+once with a single query and serves set membership and code lookups from memory.
+
+StationListModel post_save/post_delete signals (see cl_seiscomp.signals) and
+import_stations call invalidate(), which drops this worker's copy and bumps a
+version in the shared Django cache, as core.cache does for operators. The other
+gunicorn workers trust their copy for STATION_DIRECTORY_TTL seconds, then read
+the version (one cache file, no query) and reload only when it changed. The
+bump is repeated on commit, so a worker that reloaded the old rows before the
+transaction committed reloads again. Code paths that bypass signals
+(bulk_create, queryset.update) must call station_directory.invalidate()
+themselves.
+"""
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+STATION_DIRECTORY_TTL = 10
+
+STATION_FIELDS = ('code', 'network', 'province', 'location', 'digitizer_type', 'UPT', 'longitude', 'latitude')
+
+VERSION_KEY = 'station_directory:version'
+
+
+class StationDirectory:
+    def __init__(self, ttl=STATION_DIRECTORY_TTL, alias='default'):
+        self.ttl = ttl
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._version = None
+        self._stations = []
+        self._codes = frozenset()
+        self._by_code = {}
+
+    def _shared_version(self):
+        shared = caches[self.alias]
+        version = shared.get(VERSION_KEY)
+        if version is None:
+            version = time.time_ns()
+            # add() keeps the version another worker may have set in the meantime
+            if not shared.add(VERSION_KEY, version, timeout=None):
+                version = shared.get(VERSION_KEY, version)
+        return version
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.ttl:
+                self.hits += 1
+                return
+            version = self._shared_version()
+            if self._checked_at is not None and version == self._version:
+                self._checked_at = time.monotonic()
+                self.hits += 1
+                return
+            self.misses += 1
+            from .models import StationListModel
+
+            stations = list(StationListModel.objects.order_by('pk').values(*STATION_FIELDS))
+            by_code = {}
+            for station in stations:
+                # Keep the first row if a code appears in more than one network
+                by_code.setdefault(station['code'], station)
+            self._stations = stations
+            self._by_code = by_code
+            self._codes = frozenset(by_code)
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def codes(self):
+        """Frozenset of all station codes."""
+        self._ensure_loaded()
+        return self._codes
+
+    def get(self, code):
+        """Metadata dict for a station code, or None if unknown."""
+        self._ensure_loaded()
+        return self._by_code.get(code)
+
+    def stations(self, *fields):
+        """All stations in primary key order, optionally reduced to the given fields."""
+        self._ensure_loaded()
+        if not fields:
+            return list(self._stations)
+        return [{field: station[field] for field in fields} for station in self._stations]
+
+    def invalidate(self):
+        """Drop the station list in this process and, through the shared version, in the other workers."""
+        self._bump()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(self._bump)
+
+    def _bump(self):
+        self.clear_local()
+        caches[self.alias].set(VERSION_KEY, time.time_ns(), timeout=None)
+
+    def clear_local(self):
+        with self._lock:
+            self._checked_at = None
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'size': len(self._codes),
+        }
+
+
+station_directory = StationDirectory()
@@ -0,0 +1,161 @@
+"""
+Station list import shared by StationBulkCreateView and the import_stations command.
+
+Rows are read from any iterable of CSV lines, validated and written in batches:
+each batch costs one SELECT for the stations it mentions plus one bulk INSERT and
+one bulk UPDATE, keyed on (network, code) so re-imports keep the existing row IDs.
+The returned StationImportReport lists which stations were added, changed,
+unchanged or removed.
+"""
+import csv
+
+from django.db import transaction
+
+from .models import StationListModel
+from .station_directory import station_directory
+
+STATION_COLUMNS = ('network', 'code', 'province', 'location', 'digitizer_type', 'UPT', 'longitude', 'latitude')
+IMPORT_BATCH_SIZE = 500
+
+
+class StationImportReport:
+    def __init__(self):
+        self.added = []
+        self.changed = []
+        self.unchanged = []
+        self.removed = []
+        self.errors = []
+
+    def summary(self):
+        return {
+            'added': len(self.added),
+            'changed': len(self.changed),
+            'unchanged': len(self.unchanged),
+            'removed': len(self.removed),
+            'errors': len(self.errors),
+        }
+
+
+def looks_like_header(row):
+    cells = [cell.strip().lower() for cell in row]
+    return any(column.lower() in cells for column in STATION_COLUMNS)
+
+
+def parse_float(value, label, row_number):
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Row {row_number}: Invalid {label} value '{value}'")
+
+
+def read_station_rows(lines, header='auto'):
+    """
+    Yield (row_number, station_dict, error) for every non-empty CSV row.
+
+    `header` is True when the first row is always a header, 'auto' to detect it.
+    A header naming all STATION_COLUMNS is used to map columns by name, otherwise
+    the columns are read in STATION_COLUMNS order.
+    """
+    reader = csv.reader(lines)
+    positions = {column: i for i, column in enumerate(STATION_COLUMNS)}
+    for row_number, row in enumerate(reader, start=1):
+        if row_number == 1 and (header is True or (header == 'auto' and looks_like_header(row))):
+            names = [cell.strip() for cell in row]
+            if all(column in names for column in STATION_COLUMNS):
+                positions = {column: names.index(column) for column in STATION_COLUMNS}
+            continue
+
+        if not row or all(cell.strip() == '' for cell in row):
+            continue
+
+        expected = max(positions.values()) + 1
+        if len(row) < expected:
+            yield row_number, None, f"Row {row_number}: Expected {expected} columns, got {len(row)}. Row data: {row}"
+            continue
+
+        try:
+            station = {column: row[positions[column]].strip() for column in STATION_COLUMNS[:6]}
+            station['longitude'] = parse_float(row[positions['longitude']], 'longitude', row_number)
+            station['latitude'] = parse_float(row[positions['latitude']], 'latitude', row_number)
+        except ValueError as e:
+            yield row_number, None, str(e)
+            continue
+
+        if not station['network'] or not station['code']:
+            yield row_number, None, f"Row {row_number}: network and code are required"
+            continue
+        yield row_number, station, None
+
+
+def _write_batch(batch, seen, report):
+    codes = {station['code'] for _, station in batch}
+    networks = {station['network'] for _, station in batch}
+    existing = {
+        (station.network, station.code): station
+        for station in StationListModel.objects.filter(code__in=codes, network__in=networks)
+    }
+
+    to_create, to_update = [], []
+    for row_number, values in batch:
+        key = (values['network'], values['code'])
+        current = existing.get(key)
+        if current is None:
+            to_create.append(StationListModel(**values))
+            report.added.append(values['code'])
+        elif any(getattr(current, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(current, field, value)
+            to_update.append(current)
+            report.changed.append(values['code'])
+            seen.add(current.pk)
+        else:
+            report.unchanged.append(values['code'])
+            seen.add(current.pk)
+
+    seen.update(station.pk for station in StationListModel.objects.bulk_create(to_create))
+    StationListModel.objects.bulk_update(to_update, STATION_COLUMNS[2:])
+
+
+def import_stations(lines, header='auto', remove_missing=False, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Upsert stations from CSV `lines` on (network, code) in one transaction.
+    With `remove_missing`, stations absent from the input are deleted.
+    With `dry_run`, the report is computed and the transaction rolled back.
+    """
+    report = StationImportReport()
+    keys = {}
+    seen = set()
+
+    with transaction.atomic():
+        batch = []
+        for row_number, station, error in read_station_rows(lines, header):
+            if error:
+                report.errors.append(error)
+                continue
+            key = (station['network'], station['code'])
+            if key in keys:
+                report.errors.append(
+                    f"Row {row_number}: Duplicate station {key[0]}.{key[1]}, already listed in row {keys[key]}")
+                continue
+            keys[key] = row_number
+            batch.append((row_number, station))
+            if len(batch) >= batch_size:
+                _write_batch(batch, seen, report)
+                batch = []
+        if batch:
+            _write_batch(batch, seen, report)
+
+        if remove_missing:
+            missing = StationListModel.objects.exclude(pk__in=seen)
+            report.removed = list(missing.values_list('code', flat=True))
+            missing.delete()
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    # bulk_create/bulk_update don't send the signals that keep the directory fresh
+    station_directory.invalidate()
+    return report
@@ -0,0 +1,253 @@
+"""
+Daily rollups behind the CS statistics page.
+
+CsDailySlotStat holds the summed counts per (date, jam_pelaksanaan) and
+CsDailyStationStat the per-station error counts per date. Both are refreshed
+for the affected dates whenever a CS record is saved or deleted. StatsView reads
+finished days from the rollups and only aggregates raw rows for today.
+
+Every refresh bumps CsStatsVersion, which is part of the cache key of the
+serialized StatsView figures, so cached payloads never outlive the data.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+STATS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Upper bound of time-series points rendered on the statistics page
+STATS_MAX_POINTS = 1000
+
+
+def get_data_version():
+    from .models import CsStatsVersion
+    return CsStatsVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def bump_data_version():
+    from .models import CsStatsVersion
+    if not CsStatsVersion.objects.filter(pk=1).update(version=F('version') + 1):
+        # The row is created by migrate, unless the table was flushed since
+        CsStatsVersion.objects.update_or_create(pk=1, defaults={'version': F('version') + 1},
+                                                create_defaults={'version': 1})
+
+
+def create_version_row(using='default', **kwargs):
+    """post_migrate handler: create the version row, so bumping it is a single UPDATE."""
+    from .models import CsStatsVersion
+    CsStatsVersion.objects.using(using).get_or_create(pk=1)
+
+
+def stats_cache_key(start_date, end_date, selected_time):
+    return f"cs_stats:{start_date}:{end_date}:{selected_time or 'All'}:{get_data_version()}".replace(' ', '_')
+
+
+def _as_date(value):
+    from .models import CsRecordModel
+    return CsRecordModel._meta.get_field('date').to_python(value)
+
+
+def refresh_daily_stats(dates):
+    """Recompute both rollups for the given dates from CsRecordModel and StationIssue."""
+    from .models import CsRecordModel, StationIssue, CsDailySlotStat, CsDailyStationStat
+
+    dates = {_as_date(value) for value in dates if value}
+    if not dates:
+        return
+
+    slot_rows = (
+        CsRecordModel.objects.filter(date__in=dates)
+        .values('date', 'jam_pelaksanaan')
+        .annotate(
+            n=Count('id'),
+            n_gaps=Coalesce(Sum('count_gaps'), 0),
+            n_spikes=Coalesce(Sum('count_spikes'), 0),
+            n_blanks=Coalesce(Sum('count_blanks'), 0),
+            n_slmon=Coalesce(Sum('slmon'), 0),
+        )
+        .order_by()
+    )
+    station_rows = (
+        StationIssue.objects.filter(date__in=dates)
+        .values('date', 'station')
+        .annotate(
+            n_gaps=Count('id', filter=Q(kind='gaps')),
+            n_spikes=Count('id', filter=Q(kind='spikes')),
+            n_blanks=Count('id', filter=Q(kind='blanks')),
+        )
+        .order_by()
+    )
+
+    with transaction.atomic():
+        CsDailySlotStat.objects.filter(date__in=dates).delete()
+        CsDailyStationStat.objects.filter(date__in=dates).delete()
+        CsDailySlotStat.objects.bulk_create([
+            CsDailySlotStat(
+                date=row['date'], jam_pelaksanaan=row['jam_pelaksanaan'], records=row['n'],
+                count_gaps=row['n_gaps'], count_spikes=row['n_spikes'], count_blanks=row['n_blanks'],
+                slmon=row['n_slmon'],
+            )
+            for row in slot_rows
+        ])
+        CsDailyStationStat.objects.bulk_create([
+            CsDailyStationStat(
+                date=row['date'], station=row['station'],
+                gaps=row['n_gaps'], spikes=row['n_spikes'], blanks=row['n_blanks'],
+            )
+            for row in station_rows
+        ])
+        bump_data_version()
+
+
+def rebuild_daily_stats(batch_days=366):
+    """Rebuild the rollups for every date that has a CS record. Returns the number of dates."""
+    from .models import CsRecordModel, CsDailySlotStat, CsDailyStationStat
+
+    dates = list(CsRecordModel.objects.order_by('date').values_list('date', flat=True).distinct())
+    with transaction.atomic():
+        CsDailySlotStat.objects.all().delete()
+        CsDailyStationStat.objects.all().delete()
+        for i in range(0, len(dates), batch_days):
+            refresh_daily_stats(dates[i:i + batch_days])
+    return len(dates)
+
+
+def _split_range(start_date, end_date, today=None):
+    """Split [start, end] into the finished part served by rollups and the raw part (today, if included)."""
+    today = today or datetime.date.today()
+    rollup_end = min(end_date, today - datetime.timedelta(days=1))
+    raw_start = max(start_date, today)
+    return rollup_end, raw_start
+
+
+def get_time_series(start_date, end_date, selected_time=None, today=None):
+    """
+    Return [(label, gaps, blanks, spikes, slmon), ...] ordered by date and slot,
+    one point per (date, jam_pelaksanaan).
+    """
+    from .models import CsRecordModel, CsDailySlotStat
+
+    rollup_end, raw_start = _split_range(start_date, end_date, today)
+    filter_time = selected_time and selected_time != 'All'
+
+    series = []
+    if start_date <= rollup_end:
+        slots = CsDailySlotStat.objects.filter(date__range=[start_date, rollup_end])
+        if filter_time:
+            slots = slots.filter(jam_pelaksanaan=selected_time)
+        fields = ('date', 'jam_pelaksanaan', 'count_gaps', 'count_blanks', 'count_spikes', 'slmon')
+        series.extend(slots.order_by('date', 'jam_pelaksanaan').values_list(*fields))
+
+    if raw_start <= end_date:
+        records = CsRecordModel.objects.filter(date__range=[raw_start, end_date])
+        if filter_time:
+            records = records.filter(jam_pelaksanaan=selected_time)
+        series.extend(
+            records.values('date', 'jam_pelaksanaan')
+            .annotate(
+                n_gaps=Coalesce(Sum('count_gaps'), 0),
+                n_blanks=Coalesce(Sum('count_blanks'), 0),
+                n_spikes=Coalesce(Sum('count_spikes'), 0),
+                n_slmon=Coalesce(Sum('slmon'), 0),
+            )
+            .order_by('date', 'jam_pelaksanaan')
+            .values_list('date', 'jam_pelaksanaan', 'n_gaps', 'n_blanks', 'n_spikes', 'n_slmon')
+        )
+
+    return [
+        (f"{date.strftime('%Y-%m-%d')} {jam}", gaps, blanks, spikes, slmon)
+        for date, jam, gaps, blanks, spikes, slmon in series
+    ]
+
+
+def get_station_errors(start_date, end_date, selected_time=None, today=None):
+    """
+    Return [(station, {'gaps': n, 'spikes': n, 'blanks': n}), ...] sorted by total errors, descending.
+    """
+    from .models import StationIssue, CsDailyStationStat
+
+    if selected_time and selected_time != 'All':
+        # The station rollup is per day only, a single slot comes straight from StationIssue
+        issues = StationIssue.objects.filter(
+            date__range=[start_date, end_date], cs_record__jam_pelaksanaan=selected_time)
+        return [
+            (row['station'], {'gaps': row['gaps'], 'spikes': row['spikes'], 'blanks': row['blanks']})
+            for row in issues.per_station()
+        ]
+
+    rollup_end, raw_start = _split_range(start_date, end_date, today)
+    station_errors = {}
+
+    def add(station, gaps, spikes, blanks):
+        counts = station_errors.setdefault(station, {'gaps': 0, 'spikes': 0, 'blanks': 0})
+        counts['gaps'] += gaps
+        counts['spikes'] += spikes
+        counts['blanks'] += blanks
+
+    if start_date <= rollup_end:
+        rows = (
+            CsDailyStationStat.objects.filter(date__range=[start_date, rollup_end])
+            .values('station')
+            .annotate(n_gaps=Sum('gaps'), n_spikes=Sum('spikes'), n_blanks=Sum('blanks'))
+            .order_by()
+        )
+        for row in rows:
+            add(row['station'], row['n_gaps'], row['n_spikes'], row['n_blanks'])
+
+    if raw_start <= end_date:
+        for row in StationIssue.objects.filter(date__range=[raw_start, end_date]).per_station():
+            add(row['station'], row['gaps'], row['spikes'], row['blanks'])
+
+    return sorted(station_errors.items(), key=lambda x: (-sum(x[1].values()), x[0]))
+
+
+def lttb(values, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of evenly spaced values.
+    Returns the indices of the `threshold` points that best keep the visual shape.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (avg_start + avg_end - 1) / 2
+        avg_y = sum(values[avg_start:avg_end]) / (avg_end - avg_start)
+
+        bucket_start = int(i * every) + 1
+        bucket_end = int((i + 1) * every) + 1
+        ax, ay = a, values[a]
+        best, max_area = bucket_start, -1
+        for j in range(bucket_start, bucket_end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > max_area:
+                best, max_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def downsample_time_series(series, max_points):
+    """
+    Reduce a get_time_series() result to at most `max_points` points.
+    Each count column is downsampled with LTTB and the union of the kept points is
+    returned, so all traces still share the same x positions.
+    """
+    if not max_points or len(series) <= max_points:
+        return series
+    columns = len(series[0]) - 1
+    per_column = max(3, max_points // columns)
+    keep = set()
+    for column in range(1, columns + 1):
+        keep.update(lttb([point[column] or 0 for point in series], per_column))
+    return [series[i] for i in sorted(keep)]
@@ -1,15 +1,26 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.messages import get_messages
 from django.core.files.uploadedfile import SimpleUploadedFile
-from .models import StationListModel
+from .models import StationListModel, CsRecordModel, StationIssue, CsDailySlotStat, CsDailyStationStat, SlmonImageJob
+from .images import process_job
+from .station_import import import_stations
+from .station_directory import station_directory
+from .stats import get_time_series, get_station_errors, lttb, downsample_time_series
 from core.models import Operator
+from core.test_runner import ProcessCachesMixin
 from django.contrib.auth.models import User
 import io
+import tempfile
+from PIL import Image
+import datetime
+from django.core.management import call_command
+from django.core.cache import cache
 
 
-class StationBulkCreateViewTest(TestCase):
+class StationBulkCreateViewTest(ProcessCachesMixin, TestCase):
     def setUp(self):
+        super().setUp()
         self.client = Client()
         self.user = User.objects.create_user(username='testuser', password='testpass')
         self.operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
@@ -85,3 +96,345 @@ class StationBulkCreateViewTest(TestCase):
         self.assertEqual(response.status_code, 302)  # Redirect with error message
         messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('This is not a CSV file' in str(m) for m in messages))
+
+
+class StationImportTest(ProcessCachesMixin, TestCase):
+    header = "network,code,province,location,digitizer_type,UPT,longitude,latitude\n"
+
+    def test_reimport_upserts_and_reports_diff(self):
+        first = import_stations(io.StringIO(
+            self.header + "IA,ST01,P1,L1,T1,U1,106.1,-6.4\nIA,ST02,P2,L2,T2,U2,107.7,-7.1\nIA,ST03,P3,L3,T3,U3,,"))
+        self.assertEqual(first.summary(), {'added': 3, 'changed': 0, 'unchanged': 0, 'removed': 0, 'errors': 0})
+        pk = StationListModel.objects.get(code='ST01').pk
+
+        with self.assertNumQueries(8):
+            # savepoint, SELECT, INSERT, UPDATE, removal (list, collect, DELETE), release
+            second = import_stations(io.StringIO(
+                self.header + "IA,ST01,P1,L1,T1,U1,106.1,-6.4\nIA,ST02,P2,Moved,T2,U2,107.7,-7.1\nIA,ST04,P4,L4,T4,U4,1,2"),
+                remove_missing=True)
+        self.assertEqual((second.added, second.changed, second.unchanged, second.removed),
+                         (['ST04'], ['ST02'], ['ST01'], ['ST03']))
+        self.assertEqual(StationListModel.objects.get(code='ST01').pk, pk)
+        self.assertEqual(StationListModel.objects.get(code='ST02').location, 'Moved')
+        self.assertFalse(StationListModel.objects.filter(code='ST03').exists())
+        self.assertIn('ST04', station_directory.codes())
+
+    def test_duplicates_and_dry_run(self):
+        report = import_stations(io.StringIO("IA,ST01,P,L,T,U,1,2\nIA,ST01,P,L,T,U,1,2"), dry_run=True)
+        self.assertEqual(report.added, ['ST01'])
+        self.assertIn('Duplicate station IA.ST01', report.errors[0])
+        self.assertEqual(StationListModel.objects.count(), 0)
+
+    def test_import_stations_command(self):
+        StationListModel.objects.create(network='XX', code='OLD', province='P', location='L', digitizer_type='T', UPT='U')
+        out = io.StringIO()
+        call_command('import_stations', stdout=out)
+        self.assertFalse(StationListModel.objects.filter(code='OLD').exists())
+        station = StationListModel.objects.get(network='IA', code='AAFM')
+        self.assertEqual((station.longitude, station.latitude), (124.7237, -8.2734))
+        self.assertIn('1 removed', out.getvalue())
+
+
+class StationIssueTest(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
+        for code in ('ST01', 'ST02', 'ST03'):
+            StationListModel.objects.create(network='IA', code=code, province='P', location='L', digitizer_type='T', UPT='U')
+
+    def create_record(self, cs_id, date, **kwargs):
+        return CsRecordModel.objects.create(cs_id=cs_id, date=date, operator=self.operator, **kwargs)
+
+    def test_save_populates_and_replaces_issues(self):
+        record = self.create_record('CS-2025-05-01-2P', datetime.date(2025, 5, 1),
+                                    gaps='st01\nST02\nUNKNOWN', blanks='ST01')
+        issues = set(record.station_issues.values_list('station', 'kind'))
+        self.assertEqual(issues, {('ST01', 'gaps'), ('ST02', 'gaps'), ('ST01', 'blanks')})
+
+        record.gaps = 'ST03'
+        record.save()
+        self.assertEqual(set(record.station_issues.values_list('station', 'kind')),
+                         {('ST03', 'gaps'), ('ST01', 'blanks')})
+
+    def test_per_station_aggregate(self):
+        self.create_record('CS-2025-05-01-2P', datetime.date(2025, 5, 1), gaps='ST01\nST02', spikes='ST01')
+        self.create_record('CS-2025-05-02-2P', datetime.date(2025, 5, 2), gaps='ST01')
+
+        rows = list(StationIssue.objects.per_station())
+        self.assertEqual(rows[0]['station'], 'ST01')
+        self.assertEqual((rows[0]['gaps'], rows[0]['spikes'], rows[0]['total']), (2, 1, 3))
+        self.assertEqual(rows[0]['first_seen'], datetime.date(2025, 5, 1))
+        self.assertEqual(rows[0]['last_seen'], datetime.date(2025, 5, 2))
+
+    def test_backfill_command(self):
+        record = self.create_record('CS-2025-05-01-2P', datetime.date(2025, 5, 1), gaps='ST01', blanks='ST02')
+        StationIssue.objects.all().delete()
+
+        call_command('backfill_station_issues', stdout=io.StringIO())
+        self.assertEqual(record.station_issues.count(), 2)
+
+    def test_stats_view_uses_issue_table(self):
+        self.create_record('CS-2025-05-01-2P', datetime.date(2025, 5, 1), gaps='ST01\nST02')
+        response = self.client.get(reverse('cl_seiscomp:stats'), {'start_date': '2025-04-01', 'end_date': '2025-05-31'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ST01', response.context['station_plot_json'])
+
+
+class CsDailyStatsTest(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
+        for code in ('ST01', 'ST02'):
+            StationListModel.objects.create(network='IA', code=code, province='P', location='L', digitizer_type='T', UPT='U')
+        self.day1 = datetime.date(2025, 5, 1)
+        self.day2 = datetime.date(2025, 5, 2)
+        self.record1 = CsRecordModel.objects.create(
+            cs_id='CS-2025-05-01-2P', date=self.day1, jam_pelaksanaan='06:00 WIB', operator=self.operator,
+            gaps='ST01\nST02', slmon=3)
+        self.record2 = CsRecordModel.objects.create(
+            cs_id='CS-2025-05-02-2P', date=self.day2, jam_pelaksanaan='06:00 WIB', operator=self.operator,
+            gaps='ST01', blanks='ST02')
+
+    def test_rollups_follow_saves_and_deletes(self):
+        slot = CsDailySlotStat.objects.get(date=self.day1)
+        self.assertEqual((slot.records, slot.count_gaps, slot.slmon), (1, 2, 3))
+        self.assertEqual(CsDailyStationStat.objects.filter(date=self.day1).count(), 2)
+
+        self.record1.date = self.day2
+        self.record1.cs_id = 'CS-2025-05-02-1D'
+        self.record1.save()
+        self.assertFalse(CsDailySlotStat.objects.filter(date=self.day1).exists())
+        self.assertEqual(CsDailySlotStat.objects.get(date=self.day2).records, 2)
+
+        # Refreshed when the delete commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record2.delete()
+        self.assertEqual(CsDailyStationStat.objects.get(date=self.day2, station='ST01').gaps, 1)
+
+    def test_cascade_refreshes_rollups_once(self):
+        from unittest import mock
+        from .models import CsStatsVersion
+        from .stats import get_data_version, refresh_daily_stats
+
+        CsStatsVersion.objects.all().delete()
+        with mock.patch('cl_seiscomp.signals.refresh_daily_stats', wraps=refresh_daily_stats) as refresh, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.operator.delete()
+        # Both dates in one refresh, which bumps the data version once
+        refresh.assert_called_once()
+        self.assertEqual(sorted(refresh.call_args.args[0]), [self.day1, self.day2])
+        self.assertFalse(CsDailySlotStat.objects.exists())
+        self.assertFalse(CsDailyStationStat.objects.exists())
+        self.assertEqual(get_data_version(), 1)
+
+    def test_rollup_and_raw_paths_agree(self):
+        # today=day2: day1 is read from the rollup, day2 from raw records
+        mixed = get_station_errors(self.day1, self.day2, today=self.day2)
+        rollup_only = get_station_errors(self.day1, self.day2, today=datetime.date(2025, 6, 1))
+        self.assertEqual(mixed, rollup_only)
+        self.assertEqual(mixed[0], ('ST01', {'gaps': 2, 'spikes': 0, 'blanks': 0}))
+
+        series = get_time_series(self.day1, self.day2, today=self.day2)
+        self.assertEqual(series, [('2025-05-01 06:00 WIB', 2, 0, 0, 3), ('2025-05-02 06:00 WIB', 1, 1, 0, 0)])
+        self.assertEqual(get_time_series(self.day1, self.day2, '12:00 WIB', today=self.day2), [])
+
+    def test_rebuild_command(self):
+        CsDailySlotStat.objects.all().delete()
+        CsDailyStationStat.objects.all().delete()
+        call_command('rebuild_cs_daily_stats', stdout=io.StringIO())
+        self.assertEqual(CsDailySlotStat.objects.count(), 2)
+        self.assertEqual(CsDailyStationStat.objects.count(), 4)
+
+
+class StatsViewCacheTest(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
+        StationListModel.objects.create(network='IA', code='ST01', province='P', location='L', digitizer_type='T', UPT='U')
+        self.record = CsRecordModel.objects.create(
+            cs_id='CS-2025-05-01-2P', date=datetime.date(2025, 5, 1), operator=self.operator, gaps='ST01')
+        self.url = reverse('cl_seiscomp:stats')
+        self.params = {'start_date': '2025-04-01', 'end_date': '2025-04-30'}
+
+    def test_cached_payload_skips_queries(self):
+        first = self.client.get(self.url, self.params)
+        # Only the data version lookup remains on a cache hit, the payload comes from the cache files
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url, self.params)
+        self.assertEqual(first.context['plot_json'], second.context['plot_json'])
+
+    def test_saving_a_record_invalidates_payload(self):
+        params = {'start_date': '2025-04-01', 'end_date': '2025-05-31'}
+        before = self.client.get(self.url, params).context['station_plot_json']
+
+        CsRecordModel.objects.create(
+            cs_id='CS-2025-05-02-2P', date=datetime.date(2025, 5, 2), operator=self.operator, blanks='ST01')
+        after = self.client.get(self.url, params).context['station_plot_json']
+        self.assertNotEqual(before, after)
+
+
+class StatsDownsamplingTest(ProcessCachesMixin, TestCase):
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        values = [0] * 1000
+        values[123] = 50
+        values[777] = 80
+        kept = lttb(values, 50)
+        self.assertEqual(len(kept), 50)
+        self.assertEqual((kept[0], kept[-1]), (0, 999))
+        self.assertIn(123, kept)
+        self.assertIn(777, kept)
+
+    def test_downsample_time_series_is_bounded(self):
+        series = [(f'label {i}', i % 7, i % 5, i % 3, i % 11) for i in range(4000)]
+        sampled = downsample_time_series(series, 400)
+        self.assertLessEqual(len(sampled), 400)
+        self.assertEqual(sampled[0], series[0])
+        self.assertEqual(sampled[-1], series[-1])
+        self.assertEqual(downsample_time_series(series[:100], 400), series[:100])
+
+    def test_timeseries_api(self):
+        operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
+        StationListModel.objects.create(network='IA', code='ST01', province='P', location='L', digitizer_type='T', UPT='U')
+        for day in range(1, 31):
+            CsRecordModel.objects.create(
+                cs_id=f'CS-2025-04-{day:02d}-2P', date=datetime.date(2025, 4, day), operator=operator,
+                gaps='ST01' if day % 2 else '')
+
+        url = reverse('cl_seiscomp:stats_timeseries_api')
+        data = self.client.get(url, {'start_date': '2025-04-01', 'end_date': '2025-04-30', 'points': 12, 'top': 1}).json()
+        self.assertEqual(data['total_points'], 30)
+        self.assertLessEqual(data['points'], 12)
+        self.assertEqual(len(data['series']['x']), data['points'])
+        self.assertEqual(data['stations'], {'station': ['ST01'], 'gaps': [15], 'spikes': [0], 'blanks': [0]})
+
+        response = self.client.get(url, {'start_date': 'bad', 'end_date': '2025-04-30'})
+        self.assertEqual(response.status_code, 400)
+
+
+class StationDirectoryTest(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        station_directory.invalidate()
+        StationListModel.objects.create(network='IA', code='ST01', province='Jawa Barat', location='Bandung', digitizer_type='T', UPT='UPT 1')
+        StationListModel.objects.create(network='IA', code='ST02', province='Bali', location='Denpasar', digitizer_type='T', UPT='UPT 2')
+
+    def test_lookups_are_served_from_memory(self):
+        self.assertEqual(station_directory.codes(), frozenset({'ST01', 'ST02'}))
+        misses = station_directory.misses
+        with self.assertNumQueries(0):
+            self.assertIn('ST02', station_directory.codes())
+            self.assertEqual(station_directory.get('ST01')['province'], 'Jawa Barat')
+            self.assertIsNone(station_directory.get('NOPE'))
+            self.assertEqual([s['code'] for s in station_directory.stations('code')], ['ST01', 'ST02'])
+        self.assertEqual(station_directory.misses, misses)
+        self.assertGreaterEqual(station_directory.stats()['hits'], 4)
+
+    def test_signals_invalidate(self):
+        self.assertNotIn('ST03', station_directory.codes())
+        station = StationListModel.objects.create(network='IA', code='ST03', province='P', location='L', digitizer_type='T', UPT='U')
+        self.assertIn('ST03', station_directory.codes())
+
+        station.location = 'Moved'
+        station.save()
+        self.assertEqual(station_directory.get('ST03')['location'], 'Moved')
+
+        station.delete()
+        self.assertNotIn('ST03', station_directory.codes())
+
+    def test_other_workers_reload_after_invalidation(self):
+        from .station_directory import StationDirectory
+
+        # Another gunicorn worker, revalidating its copy on every lookup
+        other = StationDirectory(ttl=0)
+        self.assertEqual(other.codes(), frozenset({'ST01', 'ST02'}))
+        with self.assertNumQueries(0):
+            # Unchanged version: the copy is kept, only the cache file is read
+            other.codes()
+
+        StationListModel.objects.filter(code='ST02').delete()
+        self.assertEqual(other.codes(), frozenset({'ST01'}))
+
+        # import_stations writes in bulk, without signals, and invalidates itself
+        import_stations(io.StringIO("IA,ST05,P,L,T,U,1,2"))
+        self.assertIn('ST05', other.codes())
+        self.assertIn('ST05', station_directory.codes())
+
+    def test_cs_record_save_uses_directory(self):
+        operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
+        station_directory.codes()
+        record = CsRecordModel(cs_id='CS-2025-05-01-2P', date=datetime.date(2025, 5, 1), operator=operator,
+                               gaps='st01\nXX99')
+        misses = station_directory.misses
+        record.save()
+        self.assertEqual(record.gaps, 'ST01')
+        self.assertEqual(station_directory.misses, misses)
+
+
+@override_settings(SLMON_IMAGE_ASYNC=False)
+class SlmonImageJobTest(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.operator = Operator.objects.create(name='Test Operator', NIP='1234567890')
+
+    def upload(self, name, size=(2000, 1500)):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, 'white').save(buffer, format='PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def test_new_upload_is_thumbnailed_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            record = CsRecordModel.objects.create(
+                cs_id='CS-2025-05-01-2P', date=datetime.date(2025, 5, 1), operator=self.operator,
+                slmon_image=self.upload('slmon.png'))
+        self.assertEqual(len(callbacks), 1)
+        job = SlmonImageJob.objects.get(cs_record=record)
+        self.assertEqual((job.status, job.attempts), (SlmonImageJob.DONE, 1))
+        with Image.open(record.slmon_image.path) as img:
+            self.assertLessEqual(img.width, 1006)
+
+        # Saving again without a new file queues nothing, and a finished job is never rerun
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            record.slmon = 3
+            record.save()
+        self.assertEqual(callbacks, [])
+        self.assertIsNone(process_job(job.pk))
+        self.assertEqual(SlmonImageJob.objects.count(), 1)
+
+    def test_replaced_upload_gets_its_own_job(self):
+        record = CsRecordModel.objects.create(
+            cs_id='CS-2025-05-01-2P', date=datetime.date(2025, 5, 1), operator=self.operator,
+            slmon_image=self.upload('first.png'))
+        record.slmon_image = self.upload('second.png')
+        record.save()
+        self.assertEqual(SlmonImageJob.objects.filter(cs_record=record).count(), 2)
+
+        call_command('process_slmon_images', stdout=io.StringIO())
+        self.assertFalse(SlmonImageJob.objects.exclude(status=SlmonImageJob.DONE).exists())
+
+    def test_job_left_running_by_a_dead_worker_is_reclaimed(self):
+        from django.utils import timezone
+        from .images import SLMON_MAX_ATTEMPTS, SLMON_STALE_AFTER
+
+        record = CsRecordModel.objects.create(
+            cs_id='CS-2025-05-01-2P', date=datetime.date(2025, 5, 1), operator=self.operator,
+            slmon_image=self.upload('slmon.png'))
+        job = SlmonImageJob.objects.get(cs_record=record)
+        # Claimed a minute ago: another worker may still be on it
+        SlmonImageJob.objects.filter(pk=job.pk).update(
+            status=SlmonImageJob.RUNNING, attempts=1, claimed_at=timezone.now() - datetime.timedelta(minutes=1))
+        self.assertIsNone(process_job(job.pk))
+
+        SlmonImageJob.objects.filter(pk=job.pk).update(claimed_at=timezone.now() - SLMON_STALE_AFTER * 2)
+        call_command('process_slmon_images', stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (SlmonImageJob.DONE, 2))
+
+        # A job that keeps killing its worker stops at the attempt limit
+        SlmonImageJob.objects.filter(pk=job.pk).update(
+            status=SlmonImageJob.RUNNING, attempts=SLMON_MAX_ATTEMPTS, claimed_at=timezone.now() - SLMON_STALE_AFTER * 2)
+        self.assertIsNone(process_job(job.pk))
@@ -23,4 +23,5 @@ urlpatterns = [
     path('api/export-csv/', export_cs_to_csv, name='export_cs_to_csv'),
     path('cs/fetch_gaps_blanks/', fetch_gaps_blanks, name='fetch_gaps_blanks'),
     path('stats/', views.StatsView.as_view(), name='stats'),
+    path('api/stats/timeseries/', views.stats_timeseries_api, name='stats_timeseries_api'),
 ]
\ No newline at end of file
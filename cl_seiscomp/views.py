@@ -1,19 +1,22 @@
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.shortcuts import render
-import requests, openpyxl, datetime, os
+import datetime, os
 from django.http import JsonResponse, HttpResponse
 from core.models import Operator
 from io import StringIO
 from django.views import View
 from django.shortcuts import redirect
 from .models import CsRecordModel, StationListModel
+from .station_import import import_stations
+from .stats import (
+    get_time_series, get_station_errors, downsample_time_series, stats_cache_key,
+    STATS_CACHE_TIMEOUT, STATS_MAX_POINTS,
+)
+from django.core.cache import cache
 from django.contrib import messages
-import csv, json
-import plotly.graph_objects as go
-import plotly.utils
+import csv, json, codecs
 from django.forms.models import model_to_dict
-from django.db import transaction
 import logging
 
 # Set up logging
@@ -74,116 +77,31 @@ class StationBulkCreateView(View):
             return redirect('cl_seiscomp:sl_bulk_create')
 
         try:
-            # Parse CSV data
             if csv_file:
                 if not csv_file.name.endswith('.csv'):
                     messages.error(request, 'This is not a CSV file')
                     return redirect('cl_seiscomp:sl_bulk_create')
-
-                file_data = csv_file.read().decode('utf-8')
-                csv_reader = csv.reader(StringIO(file_data), delimiter=',')
-                # Skip header row for file uploads
-                try:
-                    header = next(csv_reader)
-                    logger.info(f"CSV header detected: {header}")
-                except StopIteration:
-                    messages.error(request, 'CSV file is empty')
-                    return redirect('cl_seiscomp:sl_bulk_create')
+                # Uploaded files always start with a header row, stream them line by line
+                report = import_stations(codecs.iterdecode(csv_file, 'utf-8'), header=True,
+                                         remove_missing=bool(remove_existing))
             else:
-                # For pasted data, check if first row looks like a header
-                lines = csv_data.strip().split('\n')
-                if not lines:
-                    messages.error(request, 'CSV data is empty')
-                    return redirect('cl_seiscomp:sl_bulk_create')
-                
-                csv_reader = csv.reader(StringIO(csv_data), delimiter=',')
-                first_row = next(csv_reader)
-                
-                # Check if first row looks like a header (contains expected column names)
-                expected_headers = ['network', 'code', 'province', 'location', 'digitizer_type', 'UPT', 'longitude', 'latitude']
-                if any(header.lower() in [cell.lower() for cell in first_row] for header in expected_headers):
-                    logger.info(f"Header detected in pasted data: {first_row}")
-                    # Skip the header row by creating a new reader
-                    csv_reader = csv.reader(StringIO(csv_data), delimiter=',')
-                    next(csv_reader)  # Skip header
-                else:
-                    # Reset reader to include the first row as data
-                    csv_reader = csv.reader(StringIO(csv_data), delimiter=',')
-
-            stations_created = 0
-            stations_deleted = 0
-            errors = []
-            
-            # Use database transaction to ensure data consistency
-            with transaction.atomic():
-                # Remove existing stations if requested
-                if remove_existing:
-                    stations_deleted = StationListModel.objects.count()
-                    StationListModel.objects.all().delete()
-                    logger.info(f"Deleted {stations_deleted} existing stations as requested")
-                
-                for row_number, row in enumerate(csv_reader, start=2):  # start=2 because we might have skipped header
-                    # Skip empty rows
-                    if not row or all(cell.strip() == '' for cell in row):
-                        continue
-                    
-                    # Validate row length
-                    if len(row) < 8:
-                        error_msg = f"Row {row_number}: Expected 8 columns, got {len(row)}. Row data: {row}"
-                        errors.append(error_msg)
-                        continue
-                    
-                    try:
-                        # Parse and validate longitude and latitude
-                        longitude_str = row[6].strip() if row[6].strip() else None
-                        latitude_str = row[7].strip() if row[7].strip() else None
-                        
-                        longitude = None
-                        latitude = None
-                        
-                        if longitude_str:
-                            try:
-                                longitude = float(longitude_str)
-                            except ValueError:
-                                error_msg = f"Row {row_number}: Invalid longitude value '{longitude_str}'"
-                                errors.append(error_msg)
-                                continue
-                        
-                        if latitude_str:
-                            try:
-                                latitude = float(latitude_str)
-                            except ValueError:
-                                error_msg = f"Row {row_number}: Invalid latitude value '{latitude_str}'"
-                                errors.append(error_msg)
-                                continue
-                        
-                        # Create station record
-                        StationListModel.objects.create(
-                            network=row[0].strip(),
-                            code=row[1].strip(),
-                            province=row[2].strip(),
-                            location=row[3].strip(),
-                            digitizer_type=row[4].strip(),
-                            UPT=row[5].strip(),
-                            longitude=longitude,
-                            latitude=latitude,
-                        )
-                        stations_created += 1
-                        
-                    except Exception as e:
-                        error_msg = f"Row {row_number}: Error creating station - {str(e)}"
-                        errors.append(error_msg)
-                        logger.error(error_msg)
-                        continue
+                report = import_stations(StringIO(csv_data.strip()), remove_missing=bool(remove_existing))
 
             # Report results
-            if remove_existing and stations_deleted > 0:
-                messages.warning(request, f'{stations_deleted} existing stations were removed as requested')
-            
-            if stations_created > 0:
-                messages.success(request, f'{stations_created} stations added successfully')
-            
-            if errors:
+            if report.removed:
+                messages.warning(request, f'{len(report.removed)} existing stations were removed as requested')
+
+            if report.added:
+                messages.success(request, f'{len(report.added)} stations added successfully')
+
+            if report.changed:
+                messages.success(request, f'{len(report.changed)} stations updated')
+
+            if report.unchanged:
+                messages.info(request, f'{len(report.unchanged)} stations unchanged')
+
+            if report.errors:
+                errors = report.errors
                 if len(errors) <= 5:
                     # Show all errors if there are few
                     for error in errors:
@@ -194,9 +112,10 @@ class StationBulkCreateView(View):
                     for error in errors[:3]:
                         messages.error(request, error)
                     messages.warning(request, f'... and {len(errors) - 3} more errors')
-            
+            logger.info(f"Station import: {report.summary()}")
+
             return redirect('cl_seiscomp:station_list')
-            
+
         except UnicodeDecodeError:
             messages.error(request, 'Error reading CSV file. Please ensure the file is encoded in UTF-8')
             logger.error(f"Unicode decode error while processing CSV file: {csv_file.name if csv_file else 'pasted data'}")
@@ -208,69 +127,62 @@ class StationBulkCreateView(View):
 
 
 ##### Stats View
+def parse_stats_range(request):
+    """Read start_date, end_date and time from the query string, defaulting to the last 30 days."""
+    start_date = request.GET.get('start_date')
+    end_date = request.GET.get('end_date')
+    selected_time = request.GET.get('time')
+
+    # Set default date range to last 30 days if not specified
+    if not start_date or not end_date:
+        end_date = datetime.date.today()
+        start_date = end_date - datetime.timedelta(days=30)
+    else:
+        start_date = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
+        end_date = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
+    return start_date, end_date, selected_time
+
 class StatsView(View):
     template_name = 'cl_seiscomp/stats.html'
 
     def get(self, request):
-        # Get date range from request parameters
-        start_date = request.GET.get('start_date')
-        end_date = request.GET.get('end_date')
-        selected_time = request.GET.get('time')
-        
-        # Set default date range to last 30 days if not specified
-        if not start_date or not end_date:
-            end_date = datetime.date.today()
-            start_date = end_date - datetime.timedelta(days=30)
-        else:
-            start_date = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
-            end_date = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
-        
-        # Get records within the date range
-        records = CsRecordModel.objects.filter(date__range=[start_date, end_date])
-        
-        # Filter by time if specified
-        if selected_time and selected_time != 'All':
-            records = records.filter(jam_pelaksanaan=selected_time)
-        
-        # Prepare data for charts
-        dates = []
-        gaps_data = []
-        blanks_data = []
-        spikes_data = []
-        slmon_data = []
-        
-        # Calculate error frequencies per station
-        station_errors = {}
-        
-        for record in records:
-            dates.append(f"{record.date.strftime('%Y-%m-%d')} {record.jam_pelaksanaan}")
-            gaps_data.append(record.count_gaps)
-            blanks_data.append(record.count_blanks)
-            spikes_data.append(record.count_spikes)
-            slmon_data.append(record.slmon)
-            
-            # Process gaps
-            if record.gaps:
-                for station in record.gaps.splitlines():
-                    station_errors[station] = station_errors.get(station, {'gaps': 0, 'spikes': 0, 'blanks': 0})
-                    station_errors[station]['gaps'] += 1
-            
-            # Process spikes
-            if record.spikes:
-                for station in record.spikes.splitlines():
-                    station_errors[station] = station_errors.get(station, {'gaps': 0, 'spikes': 0, 'blanks': 0})
-                    station_errors[station]['spikes'] += 1
-            
-            # Process blanks
-            if record.blanks:
-                for station in record.blanks.splitlines():
-                    station_errors[station] = station_errors.get(station, {'gaps': 0, 'spikes': 0, 'blanks': 0})
-                    station_errors[station]['blanks'] += 1
+        start_date, end_date, selected_time = parse_stats_range(request)
+        plot_json, station_plot_json = self.get_figures(start_date, end_date, selected_time)
+
+        context = {
+            'plot_json': plot_json,
+            'station_plot_json': station_plot_json,
+            'start_date': start_date,
+            'end_date': end_date,
+            'times': WAKTU,
+            'selected_time': selected_time or 'All'
+        }
+        return render(request, self.template_name, context)
+
+    def get_figures(self, start_date, end_date, selected_time):
+        """Return the serialized figures, reusing the cached payload while the CS data is unchanged."""
+        cache_key = stats_cache_key(start_date, end_date, selected_time)
+        figures = cache.get(cache_key)
+        if figures is None:
+            figures = self.build_figures(start_date, end_date, selected_time)
+            cache.set(cache_key, figures, STATS_CACHE_TIMEOUT)
+        return figures
+
+    def build_figures(self, start_date, end_date, selected_time):
+        import plotly.graph_objects as go
+        import plotly.utils
+
+        # Finished days come from the daily rollups, only today is aggregated from raw rows
+        series = get_time_series(start_date, end_date, selected_time)
+        series = downsample_time_series(series, STATS_MAX_POINTS)
+        dates = [point[0] for point in series]
+        gaps_data = [point[1] for point in series]
+        blanks_data = [point[2] for point in series]
+        spikes_data = [point[3] for point in series]
+        slmon_data = [point[4] for point in series]
         
-        # Sort stations by total errors (descending)
-        sorted_stations = sorted(station_errors.items(), 
-                               key=lambda x: sum(x[1].values()), 
-                               reverse=True)
+        # Error frequencies per station, sorted by total errors (descending)
+        sorted_stations = get_station_errors(start_date, end_date, selected_time)
         
         # Create Plotly figure for main chart
         fig = go.Figure()
@@ -432,15 +344,47 @@ class StatsView(View):
         plot_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
         station_plot_json = json.dumps(station_fig, cls=plotly.utils.PlotlyJSONEncoder)
 
-        context = {
-            'plot_json': plot_json,
-            'station_plot_json': station_plot_json,
-            'start_date': start_date,
-            'end_date': end_date,
-            'times': WAKTU,
-            'selected_time': selected_time or 'All'
-        }
-        return render(request, self.template_name, context)
+        return plot_json, station_plot_json
+
+def stats_timeseries_api(request):
+    """
+    Downsampled CS statistics as JSON.
+    Query parameters: start_date, end_date, time (as on the stats page),
+    points (target number of time-series points) and top (number of stations).
+    """
+    try:
+        start_date, end_date, selected_time = parse_stats_range(request)
+        points = min(max(int(request.GET.get('points', 500)), 10), 5000)
+        top = request.GET.get('top')
+        top = int(top) if top else None
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid parameter: {e}'}, status=400)
+
+    series = get_time_series(start_date, end_date, selected_time)
+    sampled = downsample_time_series(series, points)
+    stations = get_station_errors(start_date, end_date, selected_time)
+
+    return JsonResponse({
+        'start_date': start_date,
+        'end_date': end_date,
+        'time': selected_time or 'All',
+        'total_points': len(series),
+        'points': len(sampled),
+        'series': {
+            'x': [point[0] for point in sampled],
+            'gaps': [point[1] for point in sampled],
+            'blanks': [point[2] for point in sampled],
+            'spikes': [point[3] for point in sampled],
+            'slmon': [point[4] for point in sampled],
+        },
+        'total_stations': len(stations),
+        'stations': {
+            'station': [station for station, _ in stations[:top]],
+            'gaps': [counts['gaps'] for _, counts in stations[:top]],
+            'spikes': [counts['spikes'] for _, counts in stations[:top]],
+            'blanks': [counts['blanks'] for _, counts in stations[:top]],
+        },
+    })
 
 ##### Checklist Seiscomp View
 def csrecord_list_api(request, counts=0):
@@ -525,6 +469,7 @@ def prepare_workbook(record):
     from qc.views import format_date_indonesian, get_hari_indonesia
     from datetime import timedelta
     from openpyxl.drawing.image import Image
+    import openpyxl
 
     file_path = os.path.join(os.path.dirname(__file__), 'static/cl_seiscomp/cl_seiscomp.xlsx')
     workbook = openpyxl.load_workbook(file_path)
@@ -735,7 +680,7 @@ def export_cs_to_csv(request):
         ])
         
         # Get all records ordered by cs_id
-        records = CsRecordModel.objects.all().order_by('cs_id')
+        records = CsRecordModel.objects.all().order_by('cs_id').select_related('operator')
         print(f"Found {records.count()} records to export")
         print(f"First record: {records.first()}")
         
@@ -1,9 +1,17 @@
 from django.contrib import admin
-from .models import Operator, Kelompok
+from .models import Operator, Kelompok, KelompokMember
 
 class OperatorProperty(admin.ModelAdmin):
   list_display = ("name", "NIP")
 
 # Register your models here.
 admin.site.register(Operator, OperatorProperty)
-admin.site.register(Kelompok)
\ No newline at end of file
+class KelompokMemberInline(admin.TabularInline):
+  model = KelompokMember
+  extra = 0
+
+class KelompokProperty(admin.ModelAdmin):
+  inlines = [KelompokMemberInline]
+  exclude = ("member",)
+
+admin.site.register(Kelompok, KelompokProperty)
\ No newline at end of file
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import cache, search
+        from .db import configure_sqlite_connection
+        from .metrics import install_query_recorder
+
+        search.connect_signals()
+        cache.connect_signals()
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='core_sqlite_pragmas')
+        connection_created.connect(install_query_recorder, dispatch_uid='core_metrics_queries')
@@ -0,0 +1,221 @@
+"""
+Micro-benchmarks of the hot paths.
+
+Times the upstream parsers (clean_index3, clean_fm_data), the spreadsheet
+builders behind the Excel and PDF exports, the list APIs, the CSV exports, the
+CS statistics page and the earthquake decay models against the data seeded by
+core.synthetic. Every benchmark runs once to warm up and then `repeat` times;
+setup work such as loading the spreadsheet template isn't timed.
+
+The run_benchmarks command seeds a throwaway database, runs the suite and
+writes the results as JSON, so two runs (before and after a change) can be
+compared with `--compare`.
+"""
+import contextlib
+import datetime
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+# The window a shift form fetches from the upstream lists
+UPSTREAM_WINDOW = datetime.timedelta(hours=6)
+UPSTREAM_DAYS = 30
+
+
+class Benchmark:
+    def __init__(self, name, func, setup=None):
+        self.name = name
+        self.func = func
+        # Returns the arguments of func, run before every timed call
+        self.setup = setup
+
+    def run(self, repeat, warmup=1):
+        timings = []
+        for i in range(warmup + repeat):
+            args = self.setup() if self.setup else ()
+            start = time.perf_counter()
+            self.func(*args)
+            elapsed = (time.perf_counter() - start) * 1000
+            if i >= warmup:
+                timings.append(elapsed)
+        return {
+            'runs': repeat,
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+        }
+
+
+def _load_sheet(app, template, title):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(os.path.join(settings.BASE_DIR, app, 'static', app, template))
+    sheet = workbook.active
+    sheet.title = title
+    return sheet
+
+
+def _get(client, view_name, **kwargs):
+    from django.urls import reverse
+
+    url = reverse(view_name, kwargs=kwargs)
+
+    def request():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'GET {url} returned {response.status_code}')
+        if response.streaming:
+            b''.join(response.streaming_content)
+    return request
+
+
+def _linregress_fits(rentang_count, frekuensi):
+    """The decay model fits as they were computed before fit_models: one filtered linregress per model."""
+    import numpy as np
+    from scipy.stats import linregress
+    from earthquake_decay.calculation import MODELS, model_designs
+
+    x, y = model_designs(rentang_count, frekuensi)
+    fits = {}
+    for model, model_x, model_y in zip(MODELS, x, y):
+        valid = np.where(np.isfinite(model_x) & np.isfinite(model_y))[0]
+        slope, intercept, r_value, _, _ = linregress(model_x[valid], model_y[valid])
+        fits[model] = (r_value, slope, intercept)
+    return fits
+
+
+def collect_benchmarks(end=None):
+    """The benchmarks, against the records of the current database. `end` closes the upstream window."""
+    from django.core.cache import cache
+    from django.test import Client
+
+    from bast.models import BastRecordModel
+    from bast.views import clean_index3 as bast_clean_index3, populate_bast_sheet
+    from cl_seiscomp.models import CsRecordModel
+    from cl_seiscomp.views import StatsView, prepare_workbook as cs_prepare_workbook
+    from earthquake_decay.calculation import (
+        SWEEP_INTERVALS, bin_event_times, fit_models, run_earthquake_decay_models, sweep_intervals,
+    )
+    from qc.models import QcRecord
+    from qc.views import clean_index3 as qc_clean_index3, populate_sheet_with_record
+    from qcfm.models import QcFmRecord
+    from qcfm.views import clean_fm_data, prepare_workbook as qcfm_prepare_workbook
+    from .synthetic import aftershock_times, index3_text, qc_focal_text
+
+    end = end or datetime.datetime.combine(datetime.date.today(), datetime.time(12))
+    start = end - datetime.timedelta(days=UPSTREAM_DAYS)
+    index3 = index3_text(start, end).encode('utf-8')
+    qc_focal = qc_focal_text(start, end).encode('utf-8')
+    window = (str(end - UPSTREAM_WINDOW), str(end))
+    # Focal mechanisms are sparse, the QC FM form looks back a whole day
+    fm_window = (str(end - datetime.timedelta(days=1)), str(end))
+
+    bast = BastRecordModel.objects.select_related('spv').latest('date', 'id')
+    qc = QcRecord.objects.select_related('operator').latest('date', 'id')
+    qcfm = QcFmRecord.objects.select_related('operator').latest('date', 'id')
+    cs = CsRecordModel.objects.select_related('operator').latest('date', 'id')
+    stats_end = CsRecordModel.objects.latest('date').date
+    stats_start = stats_end - datetime.timedelta(days=365)
+    aftershocks = aftershock_times()
+    daily = bin_event_times(aftershocks, 1.0, 'Days')[:2]
+    hourly = bin_event_times(aftershocks, 1.0, 'Hours')[:2]
+
+    client = Client()
+
+    def cold_stats():
+        cache.clear()
+        return ()
+
+    benchmarks = [
+        Benchmark('bast.views.clean_index3', lambda: bast_clean_index3(index3, *window)),
+        Benchmark('qc.views.clean_index3', lambda: qc_clean_index3(index3, *window)),
+        Benchmark('qcfm.views.clean_fm_data', lambda: clean_fm_data(qc_focal, *fm_window)),
+        Benchmark('bast.views.populate_bast_sheet', lambda sheet: populate_bast_sheet(sheet, bast),
+                  setup=lambda: (_load_sheet('bast', 'BAST.xlsx', 'BAST'),)),
+        Benchmark('qc.views.populate_sheet_with_record', lambda sheet: populate_sheet_with_record(sheet, qc),
+                  setup=lambda: (_load_sheet('qc', 'QC Seiscomp.xlsx', 'QC Records'),)),
+        Benchmark('qcfm.views.prepare_workbook', lambda: qcfm_prepare_workbook(qcfm)),
+        Benchmark('cl_seiscomp.views.prepare_workbook', lambda: cs_prepare_workbook(cs)),
+    ]
+    for namespace, name in (('bast', 'bastrecord_list_api'), ('qc', 'qcrecord_list_api'),
+                            ('qcfm', 'qcfmrecord_list_api'), ('cl_seiscomp', 'csrecord_list_api')):
+        benchmarks += [
+            Benchmark(f'GET {namespace}:{name} (20)', _get(client, f'{namespace}:{name}', counts=20)),
+            Benchmark(f'GET {namespace}:{name} (all)', _get(client, f'{namespace}:{name}', counts=0)),
+        ]
+    for view_name in ('bast:export_bast_csv', 'qc:export_qc_csv', 'qcfm:export_qcfm_csv',
+                      'cl_seiscomp:export_cs_to_csv'):
+        benchmarks.append(Benchmark(f'GET {view_name}', _get(client, view_name)))
+    benchmarks += [
+        Benchmark('cl_seiscomp.views.StatsView.build_figures (1 year)',
+                  lambda: StatsView().build_figures(stats_start, stats_end, None)),
+        Benchmark('GET cl_seiscomp:stats (cold cache)', _get(client, 'cl_seiscomp:stats'), setup=cold_stats),
+        Benchmark('GET cl_seiscomp:stats (cached)', _get(client, 'cl_seiscomp:stats')),
+        Benchmark(f'earthquake_decay.calculation.run_earthquake_decay_models ({len(aftershocks)} events)',
+                  lambda: run_earthquake_decay_models(aftershocks, 1.0, 'Days')),
+    ]
+    for workers, label in ((1, 'in process'), (len(SWEEP_INTERVALS), 'process pool')):
+        benchmarks.append(Benchmark(
+            f'earthquake_decay.calculation.sweep_intervals ({len(SWEEP_INTERVALS)} intervals, {label})',
+            lambda workers=workers: sweep_intervals(aftershocks, workers=workers),
+        ))
+    for label, bins in (('daily', daily), ('hourly', hourly)):
+        benchmarks += [
+            Benchmark(f'earthquake_decay.calculation.fit_models ({len(bins[0])} {label} bins)',
+                      lambda bins=bins: fit_models(*bins)),
+            Benchmark(f'linregress per model, previous path ({len(bins[0])} {label} bins)',
+                      lambda bins=bins: _linregress_fits(*bins)),
+        ]
+    return benchmarks
+
+
+def run_benchmarks(benchmarks, repeat=10, names=None, progress=None):
+    """
+    {name: timings} of the benchmarks whose name contains one of `names` (all by
+    default). A benchmark that raises gets {'error': message} and the rest still run.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        if names and not any(name in benchmark.name for name in names):
+            continue
+        # The views print progress per row; keep it out of the report but not out of the timing
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            try:
+                results[benchmark.name] = benchmark.run(repeat)
+            except Exception as e:
+                results[benchmark.name] = {'error': f'{type(e).__name__}: {e}'}
+        if progress:
+            progress(benchmark.name, results[benchmark.name])
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+    }
+
+
+def compare(baseline, results):
+    """[(name, baseline median, median, ratio)] for the benchmarks in both runs, ratio > 1 is slower."""
+    rows = []
+    for name, timings in results.items():
+        if 'median_ms' in timings and 'median_ms' in baseline.get(name, {}):
+            before, after = baseline[name]['median_ms'], timings['median_ms']
+            rows.append((name, before, after, after / before if before else float('inf')))
+    return rows
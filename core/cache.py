@@ -0,0 +1,185 @@
+"""
+Read-through cache for operator and kelompok lookups.
+
+The operator list, NIP lookups, operator form choices and kelompok member names
+are read on nearly every form page. ReadThroughCache keeps them in two layers:
+
+- a small per-process LRU, trusted for LOCAL_TTL seconds, so repeated lookups
+  in one gunicorn worker don't touch the database at all;
+- the shared Django cache (CACHES['default'], a FileBasedCache directory), so
+  a value loaded by one worker is reused by the others. The files keep the
+  cache off the database: a hit or a miss costs no query beyond the loader's.
+
+Shared entries are stored under a namespace version. invalidate() bumps the
+version, which orphans every entry of the namespace in all workers at once.
+The file cache isn't part of the database transaction, so inside one the bump
+is repeated on commit: a worker that reloaded the old rows in between has
+cached them under a version that is then orphaned as well.
+
+Operator, Kelompok and KelompokMember signals invalidate the directory cache
+(connected in CoreConfig.ready). Code that bypasses signals (bulk_create,
+bulk_update, queryset.update) must call directory_cache.invalidate() itself.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+LOCAL_TTL = 10
+LOCAL_MAXSIZE = 256
+SHARED_TIMEOUT = 300
+
+_missing = object()
+
+
+class ReadThroughCache:
+    def __init__(self, namespace, maxsize=LOCAL_MAXSIZE, local_ttl=LOCAL_TTL, timeout=SHARED_TIMEOUT,
+                 alias='default'):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.local_ttl = local_ttl
+        self.timeout = timeout
+        self.alias = alias
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _version_key(self):
+        return f'{self.namespace}:version'
+
+    def _version(self):
+        version = self.shared.get(self._version_key())
+        if version is None:
+            version = time.time_ns()
+            # add() keeps the version another worker may have set in the meantime
+            if not self.shared.add(self._version_key(), version, timeout=None):
+                version = self.shared.get(self._version_key(), version)
+        return version
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _missing
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return _missing
+            self._local.move_to_end(key)
+            self.local_hits += 1
+            return value
+
+    def _set_local(self, key, value):
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def get(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` to compute it on a miss."""
+        value = self._get_local(key)
+        if value is not _missing:
+            return value
+
+        shared_key = f'{self.namespace}:{self._version()}:{key}'
+        value = self.shared.get(shared_key, _missing)
+        if value is not _missing:
+            with self._lock:
+                self.shared_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            value = loader()
+            self.shared.set(shared_key, value, timeout=self.timeout)
+        self._set_local(key, value)
+        return value
+
+    def invalidate(self):
+        """Drop every entry of the namespace, in this process and in the shared cache."""
+        self._bump()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(self._bump)
+
+    def _bump(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.set(self._version_key(), time.time_ns(), timeout=None)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def stats(self):
+        total = self.local_hits + self.shared_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.local_hits + self.shared_hits) / total, 4) if total else 0.0,
+            'size': len(self._local),
+        }
+
+
+directory_cache = ReadThroughCache('directory')
+
+
+def operator_list():
+    """[{'pk', 'name'}, ...] for all operators in primary key order."""
+    from .models import Operator
+
+    return directory_cache.get('operators', lambda: list(Operator.objects.order_by('pk').values('pk', 'name')))
+
+
+def operator_choices(empty_label='---------'):
+    """Choices for an operator select, without querying the operator table."""
+    return [('', empty_label)] + [(operator['pk'], operator['name']) for operator in operator_list()]
+
+
+def operator_nip(operator_id):
+    """NIP of an operator, or None if the operator doesn't exist."""
+    from .models import Operator
+
+    return directory_cache.get(
+        f'nip:{operator_id}',
+        lambda: Operator.objects.filter(pk=operator_id).values_list('NIP', flat=True).first(),
+    )
+
+
+def kelompok_member_names(kelompok):
+    """Member names of a kelompok in group order, or None if the kelompok doesn't exist."""
+    from .models import Kelompok, KelompokMember
+
+    def load():
+        member_names = list(
+            KelompokMember.objects.filter(kelompok__name=kelompok)
+            .order_by('kelompok_id', 'position')
+            .values_list('operator__name', flat=True)
+        )
+        if not member_names and not Kelompok.objects.filter(name=kelompok).exists():
+            return None
+        return member_names
+
+    return directory_cache.get(f'members:{kelompok}', load)
+
+
+def _invalidate_directory(sender, **kwargs):
+    directory_cache.invalidate()
+
+
+def connect_signals():
+    from .models import Operator, Kelompok, KelompokMember
+
+    for model in (Operator, Kelompok, KelompokMember):
+        post_save.connect(_invalidate_directory, sender=model, dispatch_uid=f'directory_cache_save_{model._meta.label}')
+        post_delete.connect(_invalidate_directory, sender=model,
+                            dispatch_uid=f'directory_cache_delete_{model._meta.label}')
@@ -0,0 +1,89 @@
+"""
+SQLite connection tuning.
+
+configure_sqlite_connection() runs on Django's connection_created signal
+(connected in CoreConfig.ready) and applies the PRAGMAs in settings.SQLITE_PRAGMAS
+to every new SQLite connection. With WAL, readers no longer block the writer
+and the writer no longer blocks readers, and busy_timeout makes a writer wait
+for the lock instead of failing with "database is locked".
+
+defer_to_commit() batches the per-row work of delete signals. A cascade (an
+operator and all their records) sends post_delete once per row; handlers that
+refresh a derived table call it instead of doing the work themselves, and the
+work runs once with every row when the transaction commits.
+"""
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'busy_timeout': 5000,
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+}
+
+
+def sqlite_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    """Run `PRAGMA name = value` for every item. Works on DB-API and Django cursors."""
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = sqlite_pragmas()
+    if connection.settings_dict['NAME'] == ':memory:' or 'mode=memory' in str(connection.settings_dict['NAME']):
+        # WAL needs a database file, in-memory test databases keep their journal
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+    cursor = connection.connection.cursor()
+    try:
+        apply_sqlite_pragmas(cursor, pragmas)
+    finally:
+        cursor.close()
+
+
+_commit_batches = threading.local()
+
+
+class _CommitBatch:
+    def __init__(self, func, using):
+        self.func = func
+        self.items = []
+        self.done = False
+        self.connection = transaction.get_connection(using)
+        transaction.on_commit(self.run, using=using)
+
+    def pending(self):
+        # Django drops the callback when its transaction or savepoint rolls back
+        return not self.done and any(callback == self.run for _, callback, _ in self.connection.run_on_commit)
+
+    def run(self):
+        self.done = True
+        self.func(self.items)
+
+
+def defer_to_commit(func, *items, using=None):
+    """
+    Call func(items) once when the current transaction commits, with the items
+    of every defer_to_commit(func, ...) made during it. Runs right away outside
+    a transaction.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        func(list(items))
+        return
+    batches = getattr(_commit_batches, 'batches', None)
+    if batches is None:
+        batches = _commit_batches.batches = {}
+    batch = batches.get((connection.alias, func))
+    if batch is None or not batch.pending():
+        batch = batches[(connection.alias, func)] = _CommitBatch(func, using)
+    batch.items.extend(items)
@@ -7,6 +7,37 @@ class OperatorForm(forms.ModelForm):
         fields = '__all__'
 
 class KelompokForm(forms.ModelForm):
+    # Comma-separated operator pks in display order, filled in by kelompok_form.js
+    member = forms.CharField(required=False)
+
     class Meta:
         model = Kelompok
-        fields = '__all__'
\ No newline at end of file
+        fields = ['name']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['member'].initial = ','.join(str(pk) for pk in self.instance.member_ids())
+
+    def clean_member(self):
+        value = self.cleaned_data['member']
+        pks = [pk.strip() for pk in value.split(',') if pk.strip()]
+        if not all(pk.isdigit() for pk in pks):
+            raise forms.ValidationError('Invalid member list')
+        pks = [int(pk) for pk in pks]
+        if len(set(pks)) != Operator.objects.filter(pk__in=pks).count():
+            raise forms.ValidationError('One or more members not found')
+        return pks
+
+    def save(self, commit=True):
+        kelompok = super().save(commit=commit)
+        if commit:
+            kelompok.set_members(self.cleaned_data['member'])
+        else:
+            save_m2m = self.save_m2m
+
+            def save_members():
+                save_m2m()
+                kelompok.set_members(self.cleaned_data['member'])
+            self.save_m2m = save_members
+        return kelompok
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Bulk renaming of record ids (bast_id, qc_id, qcfm_id, cs_id).
+
+migrate_ids() walks a table in primary key order, computes the new ids of each
+batch with a plain function and writes them with bulk_update, one transaction
+per table. Model save() is never called, so CsRecordModel's station cleaning,
+rollups and image jobs are not triggered by a pure rename. The full-text search
+index, which stores the record id, is updated alongside.
+"""
+from django.db import transaction
+
+from .search import rename_record_ids
+
+ID_MIGRATION_BATCH_SIZE = 1000
+
+# (model label, id field) of every table with a formatted record id
+RECORD_ID_FIELDS = (
+    ('bast.BastRecordModel', 'bast_id'),
+    ('qcfm.QcFmRecord', 'qcfm_id'),
+    ('qc.QcRecord', 'qc_id'),
+    ('cl_seiscomp.CsRecordModel', 'cs_id'),
+)
+
+
+class IdMigrationResult:
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.scanned = 0
+        self.renamed = []
+        self.conflicts = []
+
+    def __str__(self):
+        return (f'{self.model._meta.label}.{self.field}: {self.scanned} scanned, '
+                f'{len(self.renamed)} renamed, {len(self.conflicts)} conflicts')
+
+
+def migrate_ids(model, field, transform, batch_size=ID_MIGRATION_BATCH_SIZE, dry_run=False):
+    """
+    Rename `field` on every row of `model` to transform(old_id).
+    `transform` returns the new id, or None/the same id to leave a row alone.
+    Rows whose new id is already taken are reported as conflicts and skipped.
+    Returns an IdMigrationResult with the (old_id, new_id) pairs that were renamed.
+    """
+    result = IdMigrationResult(model, field)
+    assigned = set()
+
+    with transaction.atomic():
+        last_pk = None
+        while True:
+            rows = model.objects.order_by('pk')
+            if last_pk is not None:
+                rows = rows.filter(pk__gt=last_pk)
+            rows = list(rows.values_list('pk', field)[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            result.scanned += len(rows)
+
+            changes = []
+            for pk, old_id in rows:
+                new_id = transform(old_id) if old_id else None
+                if new_id and new_id != old_id:
+                    changes.append((pk, old_id, new_id))
+            if not changes:
+                continue
+
+            taken = set(model.objects.filter(**{f'{field}__in': [new_id for _, _, new_id in changes]})
+                        .values_list(field, flat=True))
+            updates = []
+            for pk, old_id, new_id in changes:
+                if new_id in taken or new_id in assigned:
+                    result.conflicts.append((old_id, new_id))
+                    continue
+                assigned.add(new_id)
+                updates.append(model(pk=pk, **{field: new_id}))
+                result.renamed.append((old_id, new_id))
+
+            if not dry_run:
+                model.objects.bulk_update(updates, [field], batch_size=batch_size)
+                rename_record_ids(model, [(obj.pk, getattr(obj, field)) for obj in updates])
+
+    return result
+
+
+def migrate_record_ids(transform, batch_size=ID_MIGRATION_BATCH_SIZE, dry_run=False):
+    """Run migrate_ids() with the same transform over every table in RECORD_ID_FIELDS."""
+    from django.apps import apps
+
+    return [
+        migrate_ids(apps.get_model(label), field, transform, batch_size=batch_size, dry_run=dry_run)
+        for label, field in RECORD_ID_FIELDS
+    ]
@@ -0,0 +1,485 @@
+"""
+End-to-end load test of a booted deployment.
+
+UpstreamStandIn serves synthetic index3.txt and qc_focal.txt (core.synthetic)
+and an FDSN dataselect endpoint returning miniSEED, with a configurable
+latency and share of failed responses, so the app can be driven without the
+real upstream servers.
+
+AppServer boots the app the way the deployment does: gunicorn with 3 workers,
+either sync workers on ebast.wsgi or uvicorn workers on ebast.asgi, against a
+scratch SQLite database seeded by seed_synthetic and pointed at the stand-in
+through the EBAST_* environment variables in the settings.
+
+run_load replays shift-change traffic: every virtual operator loops over the
+BAST, QC and QC FM flows (open the form, fetch the events, save, find the
+record in the list and export it) until the duration is up, and summarize()
+turns the timings into throughput, p50/p95/p99 latency and error rates per
+request and overall.
+
+The FDSN endpoint is for qc_download.py, the cron script that checks station
+waveforms; no request of the app reaches it, so the flows don't either.
+"""
+import datetime
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+
+WORKER_CLASSES = {
+    'sync': ('sync', 'ebast.wsgi:application'),
+    'uvicorn': ('uvicorn.workers.UvicornWorker', 'ebast.asgi:application'),
+}
+
+# Shift windows the forms fetch; focal mechanisms are sparse, the QC FM form looks back a day
+FETCH_WINDOWS = {'bast': datetime.timedelta(hours=6), 'qc': datetime.timedelta(hours=6),
+                 'qcfm': datetime.timedelta(days=1)}
+FLOWS = ('bast', 'qc', 'qcfm')
+EXPORTS = ('pdf', 'excel')
+
+# Records saved by the load test get far-future dates, one day per saved form,
+# so their IDs never collide with each other or with the seeded records
+FIRST_DAY = datetime.date(2100, 1, 1)
+
+# Rows the record list pages ask the list API for
+LIST_COUNT = 10
+
+MSEED_RECORD_LENGTH = 512
+MSEED_SAMPLES = (MSEED_RECORD_LENGTH - 64) // 4
+
+
+def percentile(values, pct):
+    """The `pct` percentile of `values`, interpolated between the closest ranks."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def miniseed_records(network, station, location, channel, start, end, sample_rate=20, seed=0):
+    """Big-endian INT32 miniSEED records of synthetic noise between the `start` and `end` datetimes."""
+    rng = random.Random(seed)
+    total = max(1, int((end - start).total_seconds() * sample_rate))
+    records = []
+    for sequence, first in enumerate(range(0, total, MSEED_SAMPLES), 1):
+        count = min(MSEED_SAMPLES, total - first)
+        t = start + datetime.timedelta(seconds=first / sample_rate)
+        header = struct.pack(
+            '>6scc5s2s3s2sHHBBBBHHhhBBBBlHH',
+            f'{sequence:06d}'.encode(), b'D', b' ', station.encode().ljust(5), location.encode().ljust(2),
+            channel.encode().ljust(3), network.encode().ljust(2),
+            t.year, t.timetuple().tm_yday, t.hour, t.minute, t.second, 0, t.microsecond // 100,
+            count, sample_rate, 1, 0, 0, 0, 1, 0, 64, 48,
+        )
+        # Blockette 1000: INT32 encoding, big-endian, 2^9 byte records
+        blockette = struct.pack('>HHBBBB', 1000, 0, 3, 1, 9, 0)
+        samples = struct.pack(f'>{count}i', *(rng.randrange(-5000, 5000) for _ in range(count)))
+        records.append((header + blockette + b'\0' * 8 + samples).ljust(MSEED_RECORD_LENGTH, b'\0'))
+    return b''.join(records)
+
+
+class UpstreamStandIn:
+    """
+    Threaded HTTP server on 127.0.0.1 standing in for the upstream event lists and
+    the FDSN waveform service. Every response waits `latency` seconds plus up to
+    `jitter`; a `failure_rate` share of them is answered with HTTP 503 instead.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, days=2, seed=0, port=0):
+        from .synthetic import index3_text, qc_focal_text
+
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.served = {}
+        self.failed = {}
+
+        end = datetime.datetime.now() + datetime.timedelta(hours=1)
+        start = end - datetime.timedelta(days=days)
+        self.files = {
+            '/index3.txt': index3_text(start, end, seed=seed).encode('utf-8'),
+            '/qc_focal.txt': qc_focal_text(start, end, seed=seed).encode('utf-8'),
+        }
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self):
+        with self.lock:
+            return {'served': dict(self.served), 'failed': dict(self.failed)}
+
+    def _delay_and_fail(self, path):
+        """Sleep the configured latency, count the request and return True if it should fail."""
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.failure_rate
+            counts = self.failed if fail else self.served
+            counts[path] = counts.get(path, 0) + 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def dataselect(self, query):
+        """miniSEED for an FDSN dataselect query, or None for no data (HTTP 204)."""
+        def param(*names, default=''):
+            for name in names:
+                if name in query:
+                    return query[name][0]
+            return default
+
+        try:
+            start = datetime.datetime.fromisoformat(param('starttime', 'start'))
+            end = datetime.datetime.fromisoformat(param('endtime', 'end'))
+        except ValueError:
+            return None
+        if end <= start:
+            return None
+        location = param('location', 'loc')
+        return miniseed_records(
+            param('network', 'net', default='IA'), param('station', 'sta', default='XXXX'),
+            '' if location == '--' else location, param('channel', 'cha', default='BHZ'),
+            start, min(end, start + datetime.timedelta(hours=1)),
+        )
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path
+                if stand_in._delay_and_fail(path):
+                    return self.reply(503, b'Service Unavailable')
+                if path in stand_in.files:
+                    return self.reply(200, stand_in.files[path])
+                if path == '/fdsnws/dataselect/1/version':
+                    return self.reply(200, b'1.1.0')
+                if path in ('/fdsnws/dataselect/1/query', '/fdsnws/dataselect/1/queryauth'):
+                    body = stand_in.dataselect(parse_qs(parts.query))
+                    if body is None:
+                        return self.reply(204, b'')
+                    return self.reply(200, body, 'application/vnd.fdsn.mseed')
+                self.reply(404, b'Not Found')
+
+            def reply(self, status, body, content_type='text/plain; charset=utf-8'):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class AppServer:
+    """
+    The app under gunicorn on 127.0.0.1:`port`, with a database in `directory`
+    seeded with `years` of synthetic records. Use as a context manager.
+    """
+
+    def __init__(self, directory, upstream_url, workers=3, worker_class='sync', port=8765, years=0.25, seed=0,
+                 log=None):
+        self.directory = directory
+        self.workers = workers
+        self.worker_class = worker_class
+        self.port = port
+        self.years = years
+        self.seed = seed
+        self.log = log
+        self.process = None
+        self.env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE='ebast.settings',
+            DEBUG='False',
+            EBAST_DB_PATH=os.path.join(directory, 'db.sqlite3'),
+            EBAST_METRICS_DB=os.path.join(directory, 'metrics.sqlite3'),
+            EBAST_CACHE_DIR=os.path.join(directory, 'cache'),
+            EBAST_UPSTREAM_URL=upstream_url,
+        )
+        if worker_class == 'uvicorn':
+            # As in the ASGI service profile
+            self.env['EBAST_CONN_MAX_AGE'] = '0'
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}'
+
+    def manage(self, *args):
+        subprocess.run([sys.executable, 'manage.py', *args], cwd=settings.BASE_DIR, env=self.env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+    def prepare(self):
+        self.manage('migrate', '--run-syncdb', '--verbosity', '0')
+        self.manage('seed_synthetic', '--years', str(self.years), '--seed', str(self.seed))
+
+    def start(self, timeout=60):
+        import httpx
+
+        worker_class, application = WORKER_CLASSES[self.worker_class]
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--workers', str(self.workers), '--worker-class', worker_class,
+             '--bind', f'127.0.0.1:{self.port}', '--timeout', '120', application],
+            cwd=settings.BASE_DIR, env=self.env, stdout=self.log or subprocess.DEVNULL,
+            stderr=self.log or subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with status {self.process.returncode}')
+            try:
+                httpx.get(f'{self.url}/core/api/get_operator_list/', timeout=1)
+                return self
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f'The app did not answer on {self.url} within {timeout} seconds')
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    def __enter__(self):
+        self.prepare()
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class VirtualOperator:
+    """
+    One operator at the shift change: fills in and exports BAST, QC and QC FM
+    records in turn. Every request is appended to `samples` as
+    (label, seconds, ok); a flow stops at the first failed save or lookup.
+    """
+
+    def __init__(self, index, users, base_url, operators, export='pdf', think_time=0.0, seed=0):
+        import httpx
+
+        self.index = index
+        self.users = users
+        self.operators = operators
+        self.export = export
+        self.think_time = think_time
+        self.rng = random.Random(seed * 1000 + index)
+        self.client = httpx.Client(base_url=base_url, timeout=120)
+        self.samples = []
+        self.flows = []
+        self.iteration = 0
+
+    def request(self, label, method, url, expect=200, **kwargs):
+        import httpx
+
+        start = time.perf_counter()
+        try:
+            response = self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - start
+        ok = response is not None and response.status_code == expect
+        self.samples.append((label, elapsed, ok))
+        return response if ok else None
+
+    def think(self):
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, self.think_time))
+
+    def run(self, deadline):
+        try:
+            while time.monotonic() < deadline:
+                app = FLOWS[self.iteration % len(FLOWS)]
+                start = time.perf_counter()
+                ok = self.flow(app)
+                self.flows.append((app, time.perf_counter() - start, ok))
+                self.iteration += 1
+        finally:
+            self.client.close()
+
+    def flow(self, app):
+        # Unique for every saved form across all virtual operators
+        day = FIRST_DAY + datetime.timedelta(days=self.iteration * self.users + self.index)
+        operator = self.rng.choice(self.operators)
+        kelompok = str(self.rng.randrange(1, 6))
+        shift, suffix = self.rng.choice((('Dini Hari', '1D'), ('Pagi', '2P'), ('Siang', '3S'), ('Malam', '4M')))
+        ok = True
+
+        # Open the form
+        form = self.request(f'{app} open form', 'GET', f'/{app}/create/')
+        if form is None:
+            return False
+        csrf_token = self.client.cookies.get('csrftoken', '')
+        if app == 'bast':
+            ok &= self.request(f'{app} form data', 'GET', '/bast/api/form_bootstrap/', params={
+                'kelompok': kelompok, 'spv': operator['pk'], 'cs_id': f'CS-{day}-{suffix}',
+            }) is not None
+        nip = self.request(f'{app} form data', 'GET', f"/{app}/api/get_nip/{operator['pk']}/")
+        ok &= nip is not None
+        self.think()
+
+        # Fetch the events; on an upstream failure the operator types them in instead
+        now = datetime.datetime.now()
+        window = FETCH_WINDOWS[app]
+        events = []
+        for end in ((now - window, now) if app != 'bast' else (now,)):
+            fetched = self.request(f'{app} fetch events', 'GET', '/{}/fetch-data/{}/{}/'.format(
+                app, (end - window).strftime('%Y-%m-%d %H:%M'), end.strftime('%Y-%m-%d %H:%M')))
+            ok &= fetched is not None
+            events.append(fetched.json()['csv'] if fetched is not None else self.typed_events(app, end))
+        self.think()
+
+        # Save, which redirects to the record list
+        data = self.form_data(app, day, suffix, shift, kelompok, operator, nip.json()['nip'] if nip else '', events)
+        data['csrfmiddlewaretoken'] = csrf_token
+        if self.request(f'{app} save', 'POST', f'/{app}/create/', expect=302, data=data) is None:
+            return False
+        self.request(f'{app} record list', 'GET', f'/{app}/')
+        record_id = self.find_record(app, data[f'{app}_id'])
+        if record_id is None:
+            return False
+        self.think()
+
+        # Export
+        export = 'export-to-pdf' if self.export == 'pdf' else 'export-to-excel'
+        ok &= self.request(f'{app} export {self.export}', 'GET', f'/{app}/api/{export}/{record_id}/') is not None
+        return ok
+
+    def typed_events(self, app, end):
+        from .synthetic import bast_events, qc_events, qcfm_events
+
+        write = {'bast': bast_events, 'qc': qc_events, 'qcfm': qcfm_events}[app]
+        return write(self.rng, end.date(), self.rng.randrange(1, 10))
+
+    def find_record(self, app, record_id):
+        """Primary key of the record saved as `record_id`, looked up the way the list page does."""
+        list_api = {'bast': 'bastrecord-list', 'qc': 'qcrecord-list', 'qcfm': 'qcfmrecord-list'}[app]
+        id_field = f'{app}_id'
+        for label, count in ((f'{app} list api', LIST_COUNT), (f'{app} list api (all)', 0)):
+            response = self.request(label, 'GET', f'/{app}/api/{list_api}/{count}/')
+            if response is None:
+                return None
+            for record in response.json():
+                if record[id_field] == record_id:
+                    return record['id']
+        return None
+
+    def form_data(self, app, day, suffix, shift, kelompok, operator, nip, events):
+        date = day.isoformat()
+        event_count = max(0, events[-1].count('\n') - 1)
+        if app == 'bast':
+            waktu, waktu_cs = {
+                '1D': ('02:00 - 08:30 WIB', '00:00 WIB'), '2P': ('08:00 - 14:00 WIB', '06:00 WIB'),
+                '3S': ('14:00 - 20:00 WIB', '12:00 WIB'), '4M': ('20:00 - 02:00 WIB', '18:00 WIB'),
+            }[suffix]
+            return {
+                'date': date, 'bast_id': f'BAST-{date}-{suffix}', 'waktu_pelaksanaan': waktu, 'shift': shift,
+                'kelompok': kelompok, 'kel_berikut': str(int(kelompok) % 5 + 1), 'events': events[0],
+                'spv': operator['pk'], 'NIP': nip, 'event_indonesia': event_count, 'event_luar': 0,
+                'event_dirasakan': 0, 'event_dikirim': 0,
+                'member': json.dumps([{'nama': operator['name'], 'keterangan': 'Hadir'}]),
+                'count_gaps': 0, 'count_spikes': 0, 'count_blanks': 0, 'waktu_cs': waktu_cs, 'pulsa_poco': 0,
+                'poco_exp': date, 'samsung_exp': date, 'notes': '',
+            }
+        data = {
+            'date': date, f'{app}_id': f'{app.upper()}-{date}-{suffix}', 'shift': shift, 'kelompok': kelompok,
+            'jam_pelaksanaan': '08:00', f'{app}_prev': events[0], app: events[1], 'operator': operator['pk'],
+            'NIP': nip, 'kel_sebelum': str((int(kelompok) - 2) % 5 + 1),
+        }
+        if app == 'qc':
+            data.update(event_indonesia=event_count, event_luar=0)
+        return data
+
+
+def run_load(base_url, users=10, duration=60.0, export='pdf', think_time=0.0, seed=0):
+    """Run `users` virtual operators against `base_url` for `duration` seconds and return them."""
+    import httpx
+
+    operators = httpx.get(f'{base_url}/core/api/get_operator_list/', timeout=30).json()['operators']
+    virtual_users = [VirtualOperator(i, users, base_url, operators, export=export, think_time=think_time, seed=seed)
+                     for i in range(users)]
+    deadline = time.monotonic() + duration
+    threads = [threading.Thread(target=user.run, args=(deadline,)) for user in virtual_users]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return virtual_users, time.perf_counter() - start
+
+
+def _latency(seconds):
+    return {
+        'p50_ms': round(percentile(seconds, 50) * 1000, 1),
+        'p95_ms': round(percentile(seconds, 95) * 1000, 1),
+        'p99_ms': round(percentile(seconds, 99) * 1000, 1),
+        'max_ms': round(max(seconds) * 1000, 1),
+    }
+
+
+def summarize(virtual_users, elapsed):
+    """Throughput, latency percentiles and error rates of a run, overall and per request label."""
+    samples = [sample for user in virtual_users for sample in user.samples]
+    flows = [flow for user in virtual_users for flow in user.flows]
+    by_label = {}
+    for label, seconds, ok in samples:
+        by_label.setdefault(label, []).append((seconds, ok))
+
+    def group(rows):
+        errors = sum(1 for _, ok in rows if not ok)
+        return {
+            'count': len(rows),
+            'per_second': round(len(rows) / elapsed, 2),
+            'error_rate': round(errors / len(rows), 4),
+            **_latency([seconds for seconds, _ in rows]),
+        }
+
+    report = {
+        'users': len(virtual_users),
+        'elapsed_s': round(elapsed, 1),
+        'requests': group([(seconds, ok) for _, seconds, ok in samples]) if samples else {'count': 0},
+        'flows': group([(seconds, ok) for _, seconds, ok in flows]) if flows else {'count': 0},
+        'by_request': {label: group(rows) for label, rows in sorted(by_label.items())},
+    }
+    return report
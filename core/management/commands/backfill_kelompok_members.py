@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.models import Kelompok, KelompokMember, Operator
+
+class Command(BaseCommand):
+    help = 'Move the legacy comma-separated Kelompok.member ids into the ordered KelompokMember table.'
+
+    def handle(self, *args, **options):
+        existing = set(Operator.objects.values_list('pk', flat=True))
+        migrated = skipped = 0
+        with transaction.atomic():
+            for kelompok in Kelompok.objects.exclude(member=''):
+                pks = [int(pk) for pk in kelompok.member.split(',') if pk.strip().isdigit()]
+                missing = [pk for pk in pks if pk not in existing]
+                if missing:
+                    self.stdout.write(self.style.WARNING(
+                        f'Kelompok {kelompok}: skipping unknown operators {missing}'))
+                    skipped += len(missing)
+                # Only fill empty groups, memberships edited after the move win
+                if not KelompokMember.objects.filter(kelompok=kelompok).exists():
+                    kelompok.set_members([pk for pk in pks if pk in existing])
+                kelompok.member = ''
+                kelompok.save(update_fields=['member'])
+                migrated += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Moved members of {migrated} groups ({skipped} unknown operators skipped).'))
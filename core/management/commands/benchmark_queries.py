@@ -0,0 +1,104 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.synthetic import seed_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway database with synthetic records and report query plans and timings '
+        'of the common filters with and without the model indexes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=float, default=3, help='Years of synthetic records to seed')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query, the median is reported')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data')
+        parser.add_argument('--plans', action='store_true', help='Print the query plan of every query')
+
+    def handle(self, *args, **options):
+        from bast.models import BastRecordModel
+        from qc.models import QcRecord
+        from qcfm.models import QcFmRecord
+        from cl_seiscomp.models import CsRecordModel
+
+        indexed_models = [BastRecordModel, QcRecord, QcFmRecord, CsRecordModel]
+
+        # Never touch the real database: run everything inside a test database
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"Seeding {options['years']} years of synthetic records...")
+            counts = seed_records(years=options['years'], seed=options['seed'])
+            self.stdout.write(', '.join(f'{key}: {value}' for key, value in counts.items()))
+
+            queries = self.get_queries()
+
+            with connection.schema_editor() as editor:
+                for model in indexed_models:
+                    for index in model._meta.indexes:
+                        editor.remove_index(model, index)
+            before = self.run_queries(queries, options['repeat'])
+
+            with connection.schema_editor() as editor:
+                for model in indexed_models:
+                    for index in model._meta.indexes:
+                        editor.add_index(model, index)
+            after = self.run_queries(queries, options['repeat'])
+
+            self.report(queries, before, after, options['plans'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def get_queries(self):
+        from bast.models import BastRecordModel
+        from qc.models import QcRecord
+        from qcfm.models import QcFmRecord
+        from cl_seiscomp.models import CsRecordModel
+        from core.models import Operator
+
+        end_date = CsRecordModel.objects.order_by('-date').values_list('date', flat=True).first()
+        start_date = end_date - datetime.timedelta(days=30)
+        operator = Operator.objects.order_by('pk').first()
+
+        return [
+            ('stats: cs date range', lambda: CsRecordModel.objects.filter(date__range=[start_date, end_date])),
+            ('stats: cs date range + jam', lambda: CsRecordModel.objects.filter(
+                date__range=[start_date, end_date], jam_pelaksanaan='12:00 WIB')),
+            ('form: bast latest(date)', lambda: BastRecordModel.objects.order_by('-date')[:1]),
+            ('form: bast latest(date, id)', lambda: BastRecordModel.objects.order_by('-date', '-id')[:1]),
+            ('bast shift + date range', lambda: BastRecordModel.objects.filter(
+                shift='Pagi', date__range=[start_date, end_date])),
+            ('bast spv recent', lambda: BastRecordModel.objects.filter(spv=operator).order_by('-date')[:20]),
+            ('qc operator recent', lambda: QcRecord.objects.filter(operator=operator).order_by('-date')[:20]),
+            ('qcfm operator recent', lambda: QcFmRecord.objects.filter(operator=operator).order_by('-date')[:20]),
+            ('cs operator recent', lambda: CsRecordModel.objects.filter(operator=operator).order_by('-date')[:20]),
+        ]
+
+    def run_queries(self, queries, repeat):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        results = {}
+        for name, factory in queries:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(factory())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {'ms': statistics.median(timings), 'plan': factory().explain()}
+        return results
+
+    def report(self, queries, before, after, show_plans):
+        self.stdout.write('')
+        self.stdout.write(f"{'query':<32} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>9}")
+        for name, _ in queries:
+            b, a = before[name]['ms'], after[name]['ms']
+            speedup = b / a if a else float('inf')
+            self.stdout.write(f'{name:<32} {b:>12.3f} {a:>12.3f} {speedup:>8.1f}x')
+            if show_plans:
+                self.stdout.write(f"    before: {' | '.join(before[name]['plan'].splitlines())}")
+                self.stdout.write(f"    after:  {' | '.join(after[name]['plan'].splitlines())}")
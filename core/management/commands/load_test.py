@@ -0,0 +1,93 @@
+import json
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import environment
+from core.loadtest import EXPORTS, WORKER_CLASSES, AppServer, UpstreamStandIn, run_load, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Boot the app under gunicorn against a scratch database and a local stand-in for the upstream servers, '
+        'replay concurrent operators opening, fetching, saving and exporting BAST/QC/QC FM records, and report '
+        'throughput, latency percentiles and error rates. The real database is never touched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Concurrent virtual operators')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds of load')
+        parser.add_argument('--think-time', type=float, default=0, help='Up to this many seconds between steps')
+        parser.add_argument('--export', choices=EXPORTS, default='pdf', help='Export every saved record as')
+        parser.add_argument('--workers', type=int, default=3, help='gunicorn workers, as deployed')
+        parser.add_argument('--worker-class', choices=sorted(WORKER_CLASSES), default='sync',
+                            help='sync runs ebast.wsgi, uvicorn runs ebast.asgi')
+        parser.add_argument('--port', type=int, default=8765, help='Port the app listens on')
+        parser.add_argument('--years', type=float, default=0.25, help='Years of synthetic records to seed')
+        parser.add_argument('--latency', type=float, default=0.05, help='Seconds the stand-in waits per response')
+        parser.add_argument('--jitter', type=float, default=0.05, help='Up to this many extra seconds per response')
+        parser.add_argument('--failure-rate', type=float, default=0,
+                            help='Share of stand-in responses that fail with HTTP 503')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the data and the operators')
+        parser.add_argument('--upstream-port', type=int, default=0, help='Port of the stand-in (default any free)')
+        parser.add_argument('--base-url', help='Load an already running app instead of booting one')
+        parser.add_argument('--output', help='Write the report as JSON to this path')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['failure_rate'] <= 1:
+            raise CommandError('--failure-rate must be between 0 and 1.')
+        if options['export'] == 'pdf' and not options['base_url'] and not (
+                shutil.which('soffice') or shutil.which('libreoffice')):
+            raise CommandError('PDF exports need LibreOffice, which is not installed; use --export excel.')
+
+        stand_in = UpstreamStandIn(latency=options['latency'], jitter=options['jitter'],
+                                   failure_rate=options['failure_rate'], seed=options['seed'],
+                                   port=options['upstream_port'])
+        with stand_in, tempfile.TemporaryDirectory() as directory:
+            if options['base_url']:
+                self.stdout.write(f"Stand-in upstream on {stand_in.url}, loading {options['base_url']}")
+                virtual_users, elapsed = self.load(options['base_url'], options)
+            else:
+                app = AppServer(directory, stand_in.url, workers=options['workers'],
+                                worker_class=options['worker_class'], port=options['port'],
+                                years=options['years'], seed=options['seed'])
+                self.stdout.write(f"Seeding {options['years']} years of records and starting {options['workers']} "
+                                  f"{options['worker_class']} workers...")
+                try:
+                    with app:
+                        virtual_users, elapsed = self.load(app.url, options)
+                except RuntimeError as e:
+                    raise CommandError(str(e))
+
+        report = {
+            'environment': environment(),
+            'options': {key: options[key] for key in (
+                'users', 'duration', 'think_time', 'export', 'workers', 'worker_class', 'years', 'latency',
+                'jitter', 'failure_rate', 'seed')},
+            'upstream': stand_in.stats(),
+            **summarize(virtual_users, elapsed),
+        }
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    def load(self, base_url, options):
+        self.stdout.write(f"Running {options['users']} operators for {options['duration']:g} seconds...")
+        return run_load(base_url, users=options['users'], duration=options['duration'], export=options['export'],
+                        think_time=options['think_time'], seed=options['seed'])
+
+    def print_report(self, report):
+        self.stdout.write('')
+        self.stdout.write(f"{'request':<28} {'count':>7} {'req/s':>8} {'errors':>8} "
+                          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        rows = list(report['by_request'].items()) + [('all requests', report['requests']),
+                                                     ('complete flows', report['flows'])]
+        for label, row in rows:
+            if not row['count']:
+                continue
+            line = (f"{label:<28} {row['count']:>7} {row['per_second']:>8.2f} {row['error_rate']:>8.1%} "
+                    f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+            self.stdout.write(self.style.WARNING(line) if row['error_rate'] else line)
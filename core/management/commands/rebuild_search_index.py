@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.search import rebuild_search_index, fts5_available
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for BAST, QC, QC FM and Checklist Seiscomp records.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of index rows inserted per batch')
+
+    def handle(self, *args, **options):
+        if not fts5_available():
+            self.stdout.write(self.style.WARNING('SQLite FTS5 is not available, nothing to rebuild.'))
+            return
+
+        counts = rebuild_search_index(batch_size=options['batch_size'])
+        for source, count in counts.items():
+            self.stdout.write(f'  {source}: {count} rows indexed')
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt with {sum(counts.values())} rows.'))
@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from core.benchmarks import collect_benchmarks, compare, environment, run_benchmarks
+from core.synthetic import build_derived_tables, seed_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway database with synthetic records and time the hot paths: the upstream parsers, '
+        'the spreadsheet builders, the list APIs, the CSV exports, the CS statistics and the decay models.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=float, default=1, help='Years of synthetic records to seed')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per benchmark, after one warm-up')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data')
+        parser.add_argument('--only', action='append', help='Run the benchmarks whose name contains this text')
+        parser.add_argument('--output', help='Write the results as JSON to this path')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)['results']
+
+        # Never touch the real database: run everything inside a test database
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"Seeding {options['years']} years of synthetic records...")
+            counts = seed_records(years=options['years'], seed=options['seed'])
+            build_derived_tables()
+            self.stdout.write(', '.join(f'{key}: {value}' for key, value in counts.items()))
+
+            # Time what production runs, without the DEBUG query log and profiler
+            with override_settings(DEBUG=False):
+                results = run_benchmarks(
+                    collect_benchmarks(), repeat=options['repeat'], names=options['only'],
+                    progress=self.progress,
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'environment': environment(),
+            'dataset': {'years': options['years'], 'seed': options['seed'], 'counts': counts},
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            self.stdout.write('')
+            self.stdout.write(f"{'benchmark':<72} {'before (ms)':>12} {'after (ms)':>12} {'change':>8}")
+            for name, before, after, ratio in compare(baseline, results):
+                line = f'{name:<72} {before:>12.2f} {after:>12.2f} {ratio:>7.2f}x'
+                self.stdout.write(self.style.WARNING(line) if ratio > 1.1 else line)
+
+    def progress(self, name, timings):
+        if 'error' in timings:
+            self.stdout.write(self.style.ERROR(f"{'failed':>13}  {name}: {timings['error']}"))
+        else:
+            self.stdout.write(f"{timings['median_ms']:>10.2f} ms  {name}")
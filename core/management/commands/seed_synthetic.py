@@ -0,0 +1,46 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.synthetic import build_derived_tables, seed_records, write_upstream_files
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill an empty database with synthetic operators, groups, stations and BAST/QC/QC FM/CS records, '
+        'and optionally write synthetic index3.txt and qc_focal.txt upstream files.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=float, default=3, help='Years of records, one per shift per day')
+        parser.add_argument('--operators', type=int, default=40)
+        parser.add_argument('--stations', type=int, default=550)
+        parser.add_argument('--end-date', type=datetime.date.fromisoformat, help='Last day of records (default today)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, the same seed gives the same data')
+        parser.add_argument('--upstream-dir', help='Also write index3.txt and qc_focal.txt to this directory')
+        parser.add_argument('--upstream-days', type=int, default=30, help='Days of events in the upstream files')
+
+    def handle(self, *args, **options):
+        from core.models import Operator
+
+        if Operator.objects.exists():
+            raise CommandError('The database already has operators; seed_synthetic only fills an empty database.')
+
+        end_date = options['end_date'] or datetime.date.today()
+        self.stdout.write(f"Seeding {options['years']} years of synthetic records up to {end_date}...")
+        counts = seed_records(
+            years=options['years'], operators=options['operators'], stations=options['stations'],
+            end_date=end_date, seed=options['seed'],
+        )
+        self.stdout.write(', '.join(f'{key}: {value}' for key, value in counts.items()))
+        issues = build_derived_tables()
+        self.stdout.write(f'Built {issues} station issues, the CS daily rollups and the search index.')
+
+        if options['upstream_dir']:
+            end = datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time())
+            paths = write_upstream_files(
+                options['upstream_dir'], end - datetime.timedelta(days=options['upstream_days']), end,
+                seed=options['seed'],
+            )
+            self.stdout.write(f"Wrote {', '.join(paths.values())}")
+        self.stdout.write(self.style.SUCCESS('Done.'))
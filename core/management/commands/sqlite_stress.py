@@ -0,0 +1,39 @@
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import sqlite_pragmas
+from core.sqlite_stress import compare
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent form-save and list-load worker processes through Django against scratch SQLite '
+        'databases and compare Django\'s defaults with SQLITE_PRAGMAS and the configured transaction_mode. '
+        'The real database is never touched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=3, help='Processes saving records')
+        parser.add_argument('--readers', type=int, default=3, help='Processes loading record lists')
+        parser.add_argument('--duration', type=float, default=5, help='Seconds per run')
+        parser.add_argument('--rows', type=int, default=20000, help='Records seeded before each run')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            results = compare(directory, sqlite_pragmas(),
+                              settings.DATABASES['default']['OPTIONS'].get('transaction_mode'),
+                              writers=options['writers'], readers=options['readers'],
+                              duration=options['duration'], rows=options['rows'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'profile':<10} {'saves/s':>10} {'lock errors':>12} {'reads/s':>10}")
+        for name, result in results.items():
+            self.stdout.write(f"{name:<10} {result['commits_per_second']:>10} {result['errors']:>12} "
+                              f"{result['reads_per_second']:>10}")
@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import measure_startup, STARTUP_IMPORT_BUDGET_MS, STARTUP_RSS_BUDGET_MB
+
+
+class Command(BaseCommand):
+    help = (
+        'Boot a worker in a fresh interpreter under `python -X importtime` and report the import time, '
+        'the RSS after boot and any heavy library loaded at startup.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='Number of slowest top-level imports to list')
+        parser.add_argument('--output', help='Also write the measurement as JSON to this path')
+        parser.add_argument('--json', action='store_true', help='Print the measurement as JSON')
+        parser.add_argument('--check', action='store_true',
+                            help='Fail when a budget is exceeded or a heavy library is loaded, for a quiet machine')
+
+    def handle(self, *args, **options):
+        result = measure_startup(top=options['top'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(result, f, indent=2)
+
+        problems = []
+        if result['import_ms'] > STARTUP_IMPORT_BUDGET_MS:
+            problems.append(f"import time {result['import_ms']} ms > {STARTUP_IMPORT_BUDGET_MS} ms")
+        if result['rss_mb'] is not None and result['rss_mb'] > STARTUP_RSS_BUDGET_MB:
+            problems.append(f"RSS {result['rss_mb']} MB > {STARTUP_RSS_BUDGET_MB} MB")
+        if result['heavy_modules']:
+            problems.append(f"loaded {', '.join(result['heavy_modules'])}")
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self.print_report(result)
+        if options['check'] and problems:
+            raise CommandError(f"Worker boot is over budget: {'; '.join(problems)}")
+
+    def print_report(self, result):
+        self.stdout.write(f"Import time: {result['import_ms']} ms (budget {STARTUP_IMPORT_BUDGET_MS} ms)")
+        self.stdout.write(f"RSS after boot: {result['rss_mb']} MB (budget {STARTUP_RSS_BUDGET_MB} MB)")
+        self.stdout.write('Slowest top-level imports:')
+        for entry in result['slowest_imports']:
+            self.stdout.write(f"  {entry['ms']:>8} ms  {entry['module']}")
+        if result['import_ms'] > STARTUP_IMPORT_BUDGET_MS or (result['rss_mb'] or 0) > STARTUP_RSS_BUDGET_MB:
+            self.stdout.write(self.style.WARNING('Over budget.'))
+        if result['heavy_modules']:
+            self.stdout.write(self.style.WARNING(f"Loaded at boot: {', '.join(result['heavy_modules'])}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('No heavy libraries loaded at boot.'))
@@ -0,0 +1,259 @@
+"""
+Per-view request metrics.
+
+MetricsMiddleware records, for every request, the resolved URL name
+(`bast:export_to_pdf`, `cl_seiscomp:stats`, ...), the status, the latency, the
+response size and the number and duration of the database queries it ran.
+Latency is measured up to the response headers; the body of a streaming
+response isn't included.
+
+Each worker adds its observations to an in-process registry and, at most every
+METRICS_FLUSH_INTERVAL seconds, adds the accumulated deltas to a small SQLite
+file shared by all workers (settings.METRICS_DB). The file is separate from
+the application database, so metrics writes never wait on the application's
+write lock and never show up in the query counts. /metrics renders the totals
+of all workers in the Prometheus text format, to staff users and to the
+addresses in METRICS_ALLOWED_IPS.
+
+The last observations of a worker are flushed when it exits. The exit hook is
+registered with the first observation, so management commands that serve no
+requests never write to the store.
+
+Queries are counted by an execute wrapper installed on every database
+connection (connection_created, see CoreConfig.ready). It adds to the stats of
+the current request through a context variable, which asgiref carries into the
+threads that run sync code under ASGI.
+"""
+import atexit
+import contextvars
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# name: (type, help), in /metrics order
+FAMILIES = {
+    'ebast_http_requests_total': ('counter', 'Requests by view, method and status.'),
+    'ebast_http_request_duration_seconds': ('histogram', 'Time to response headers by view.'),
+    'ebast_http_response_size_bytes': ('histogram', 'Response body size by view, when known.'),
+    'ebast_db_queries_total': ('counter', 'Database queries by view.'),
+    'ebast_db_query_duration_seconds_total': ('counter', 'Time spent in database queries by view.'),
+}
+
+UNRESOLVED = '<unresolved>'
+
+_request_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('started', 'queries', 'query_seconds')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the current request's stats."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        # First, so the wrappers pushed and popped by connection.execute_wrapper() stay last
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_bound(bound):
+    return f'{bound:g}' if isinstance(bound, float) else str(bound)
+
+
+class MetricsRegistry:
+    """Observations of this process that haven't been added to the shared store yet."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        self._flush_at_exit = False
+
+    def _add(self, name, labels, value):
+        key = (name, labels)
+        self._pending[key] = self._pending.get(key, 0) + value
+
+    def _observe(self, name, view, value, buckets):
+        for bound in buckets:
+            if value <= bound:
+                self._add(f'{name}_bucket', format_labels(view=view, le=_format_bound(bound)), 1)
+        self._add(f'{name}_bucket', format_labels(view=view, le='+Inf'), 1)
+        self._add(f'{name}_sum', format_labels(view=view), value)
+        self._add(f'{name}_count', format_labels(view=view), 1)
+
+    def observe_request(self, view, method, status, duration, size, queries, query_seconds):
+        with self._lock:
+            if not self._flush_at_exit:
+                self._flush_at_exit = True
+                atexit.register(self.flush)
+            self._add('ebast_http_requests_total', format_labels(view=view, method=method, status=status), 1)
+            self._observe('ebast_http_request_duration_seconds', view, duration, LATENCY_BUCKETS)
+            if size is not None:
+                self._observe('ebast_http_response_size_bytes', view, size, SIZE_BUCKETS)
+            self._add('ebast_db_queries_total', format_labels(view=view), queries)
+            self._add('ebast_db_query_duration_seconds_total', format_labels(view=view), query_seconds)
+
+    def flush_due(self):
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', FLUSH_INTERVAL)
+        return bool(self._pending) and time.monotonic() - self._last_flush >= interval
+
+    def flush(self, path=None):
+        """Add the pending observations to the shared store. They are kept for the next flush on failure."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            add_to_store(path or metrics_db(), pending)
+        except sqlite3.Error as e:
+            logger.warning('Writing metrics to %s failed: %s', path or metrics_db(), e)
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + value
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+
+registry = MetricsRegistry()
+
+
+def metrics_db():
+    return str(getattr(settings, 'METRICS_DB', settings.BASE_DIR / 'metrics.sqlite3'))
+
+
+def client_address(request):
+    # gunicorn leaves REMOTE_ADDR empty on the unix socket, which only the local
+    # Nginx can reach; proxy_params passes the client address as X-Real-IP
+    return request.META.get('REMOTE_ADDR') or request.META.get('HTTP_X_REAL_IP', '')
+
+
+def metrics_allowed(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    return client_address(request) in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    conn.execute('PRAGMA journal_mode = wal')
+    conn.execute('CREATE TABLE IF NOT EXISTS series ('
+                 'name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, PRIMARY KEY (name, labels))')
+    return conn
+
+
+def add_to_store(path, deltas):
+    """Add {(name, labels): value} to the totals in the SQLite file at `path`."""
+    conn = _connect(path)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(
+            'INSERT INTO series (name, labels, value) VALUES (?, ?, ?) '
+            'ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value',
+            [(name, labels, value) for (name, labels), value in deltas.items()],
+        )
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+
+def read_store(path):
+    conn = _connect(path)
+    try:
+        return conn.execute('SELECT name, labels, value FROM series').fetchall()
+    finally:
+        conn.close()
+
+
+def _family(name):
+    for family in FAMILIES:
+        if name == family or (name.startswith(family) and name[len(family):] in ('_bucket', '_sum', '_count')):
+            return family
+    return None
+
+
+def _sort_key(row):
+    name, labels, _ = row
+    suffix_order = {'_bucket': 0, '_sum': 1, '_count': 2}
+    le = re.search(r'le="([^"]+)"', labels)
+    bound = math.inf if le is None or le.group(1) == '+Inf' else float(le.group(1))
+    return (re.sub(r',?le="[^"]+"', '', labels), suffix_order.get(name[name.rfind('_'):], 0), bound)
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(rows):
+    """Prometheus text exposition of (name, labels, value) rows."""
+    by_family = {family: [] for family in FAMILIES}
+    for row in rows:
+        family = _family(row[0])
+        if family is not None:
+            by_family[family].append(row)
+    lines = []
+    for family, (kind, help_text) in FAMILIES.items():
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        for name, labels, value in sorted(by_family[family], key=_sort_key):
+            lines.append(f'{name}{labels} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def finish_request(request, response, stats, token):
+    """Record the request and return True when this worker should flush to the shared store."""
+    _request_stats.reset(token)
+    duration = time.perf_counter() - stats.started
+    match = getattr(request, 'resolver_match', None)
+    view = match.view_name if match is not None else UNRESOLVED
+    if response.streaming:
+        size = int(response['Content-Length']) if response.has_header('Content-Length') else None
+    else:
+        size = len(response.content)
+    registry.observe_request(view, request.method, response.status_code, duration, size,
+                             stats.queries, stats.query_seconds)
+    return registry.flush_due()
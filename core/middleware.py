@@ -0,0 +1,138 @@
+"""
+Project middleware.
+
+MetricsMiddleware records per-view request metrics (see core.metrics).
+
+QueryProfilerMiddleware counts the queries of every request in development and
+warns about repeated query shapes (see core.querycount).
+
+StaticFilesMiddleware is WhiteNoise's Django middleware with an async path.
+WhiteNoiseMiddleware is sync only, so under the uvicorn worker profile Django
+would run the whole middleware chain, and the async fetch_data views behind it,
+through a thread. Here the lookup is a dict access either way; under ASGI the
+file body is read in a worker thread and streamed as an async iterator.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+from .querycount import QueryRecorder, profiling_enabled
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per thread hop when streaming a static file under ASGI
+ASYNC_BLOCK_SIZE = 64 * 1024
+
+
+async def _read_blocks(filelike, block_size=ASYNC_BLOCK_SIZE):
+    read = sync_to_async(filelike.read, thread_sensitive=False)
+    while True:
+        data = await read(block_size)
+        if not data:
+            break
+        yield data
+
+
+async def _no_body():
+    return
+    yield
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    # Tied to whitenoise==6.7.0: lookup() and __acall__ use its internals (files,
+    # find_file, autorefresh, serve and the FileResponse it returns), which
+    # StaticFilesTests.test_whitenoise_internals_are_unchanged checks. Re-check
+    # them before upgrading whitenoise.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    def lookup(self, path):
+        if self.autorefresh:
+            return self.find_file(path)
+        return self.files.get(path)
+
+    async def __acall__(self, request):
+        static_file = self.lookup(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        response = self.serve(static_file, request)
+        # HEAD and 304 responses have no file to stream
+        filelike = response.file_to_stream
+        response.streaming_content = _read_blocks(filelike) if filelike is not None else _no_body()
+        return response
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats, token = metrics.start_request()
+        response = self.get_response(request)
+        if metrics.finish_request(request, response, stats, token):
+            metrics.registry.flush()
+        return response
+
+    async def __acall__(self, request):
+        stats, token = metrics.start_request()
+        response = await self.get_response(request)
+        if metrics.finish_request(request, response, stats, token):
+            await sync_to_async(metrics.registry.flush, thread_sensitive=False)()
+        return response
+
+
+class QueryProfilerMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not profiling_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        response['X-Query-Count'] = str(len(recorder))
+        repeated = recorder.repeated_shapes()
+        if repeated:
+            logger.warning(
+                '%s %s ran %d queries, repeated shapes (likely N+1):\n%s', request.method, request.path,
+                len(recorder), '\n'.join(f'{count}x {shape}' for shape, count in repeated.items()),
+            )
+        return response
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 # Create your models here.
 class Operator(models.Model):
@@ -12,7 +12,44 @@ class Operator(models.Model):
 class Kelompok(models.Model):
     KELOMPOK_CHOICES = models.IntegerChoices('Kelompok', '1 2 3 4 5 6')
     name = models.IntegerField(choices=KELOMPOK_CHOICES.choices, default=1)
-    member = models.CharField(max_length=300, default='')
+    members = models.ManyToManyField(Operator, through='KelompokMember', related_name='kelompok_set', blank=True)
+    # Legacy comma-separated operator pks, moved into `members` by the backfill_kelompok_members command
+    member = models.CharField(max_length=300, default='', blank=True)
 
     def __str__(self):
-        return str(self.name)
\ No newline at end of file
+        return str(self.name)
+
+    def member_ids(self):
+        """Operator pks in group order."""
+        return list(self.memberships.values_list('operator_id', flat=True))
+
+    def ordered_members(self):
+        """Operators in group order, in one query."""
+        return Operator.objects.filter(kelompokmember__kelompok=self).order_by('kelompokmember__position')
+
+    def set_members(self, operator_ids):
+        """Replace the membership with `operator_ids`, keeping their order."""
+        operator_ids = list(dict.fromkeys(int(pk) for pk in operator_ids))
+        with transaction.atomic():
+            self.memberships.all().delete()
+            KelompokMember.objects.bulk_create([
+                KelompokMember(kelompok=self, operator_id=pk, position=position)
+                for position, pk in enumerate(operator_ids)
+            ])
+        # bulk_create doesn't send the signals that keep the directory cache fresh
+        from .cache import directory_cache
+        directory_cache.invalidate()
+
+class KelompokMember(models.Model):
+    kelompok = models.ForeignKey(Kelompok, on_delete=models.CASCADE, related_name='memberships')
+    operator = models.ForeignKey(Operator, on_delete=models.CASCADE)
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['kelompok', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['kelompok', 'operator'], name='unique_kelompok_member'),
+        ]
+
+    def __str__(self):
+        return f"{self.kelompok} - {self.operator}"
\ No newline at end of file
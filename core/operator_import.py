@@ -0,0 +1,111 @@
+"""
+Operator roster import used by OperatorBulkCreateView.
+
+Rows of "name, NIP" are streamed from any iterable of CSV lines and upserted on
+NIP in one transaction: new operators are written with bulk_create, renamed
+ones with bulk_update. Rows without a NIP are matched on the name instead, so
+re-importing the same roster never duplicates anybody.
+"""
+import csv
+
+from django.db import transaction
+
+from .cache import directory_cache
+from .models import Operator
+
+IMPORT_BATCH_SIZE = 500
+
+
+class OperatorImportReport:
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.unchanged = []
+        self.errors = []
+
+    def summary(self):
+        return {
+            'created': len(self.created),
+            'updated': len(self.updated),
+            'unchanged': len(self.unchanged),
+            'errors': len(self.errors),
+        }
+
+
+def read_operator_rows(lines):
+    """Yield (row_number, name, NIP, error), skipping blank rows and a "name,nip" header."""
+    for row_number, row in enumerate(csv.reader(lines, skipinitialspace=True), start=1):
+        if not row or all(cell.strip() == '' for cell in row):
+            continue
+        if row_number == 1 and [cell.strip().lower() for cell in row[:2]] == ['name', 'nip']:
+            continue
+        if len(row) < 2:
+            yield row_number, None, None, f"Row {row_number}: Expected name and NIP, got {row}"
+            continue
+
+        name, nip = row[0].strip(), row[1].replace(' ', '')
+        if not name:
+            yield row_number, None, None, f"Row {row_number}: Name is required"
+        elif len(nip) > Operator._meta.get_field('NIP').max_length or (nip and not nip.isdigit()):
+            yield row_number, None, None, f"Row {row_number}: Invalid NIP '{nip}'"
+        else:
+            yield row_number, name, nip, None
+
+
+def _operator_key(name, nip):
+    return ('nip', nip) if nip else ('name', name)
+
+
+def _write_batch(batch, report):
+    nips = {nip for _, _, nip in batch if nip}
+    names = {name for _, name, nip in batch if not nip}
+    existing = {}
+    # Oldest row wins if the roster was already imported twice
+    for operator in Operator.objects.filter(NIP__in=nips).order_by('-pk'):
+        existing[_operator_key(operator.name, operator.NIP)] = operator
+    for operator in Operator.objects.filter(NIP='', name__in=names).order_by('-pk'):
+        existing[_operator_key(operator.name, '')] = operator
+
+    to_create, to_update = [], []
+    for _, name, nip in batch:
+        current = existing.get(_operator_key(name, nip))
+        if current is None:
+            to_create.append(Operator(name=name, NIP=nip))
+            report.created.append(name)
+        elif current.name != name:
+            current.name = name
+            to_update.append(current)
+            report.updated.append(name)
+        else:
+            report.unchanged.append(name)
+
+    Operator.objects.bulk_create(to_create)
+    Operator.objects.bulk_update(to_update, ['name'])
+
+
+def import_operators(lines, batch_size=IMPORT_BATCH_SIZE):
+    """Upsert operators from CSV `lines` in a single transaction and return an OperatorImportReport."""
+    report = OperatorImportReport()
+    seen = {}
+
+    with transaction.atomic():
+        batch = []
+        for row_number, name, nip, error in read_operator_rows(lines):
+            if error:
+                report.errors.append(error)
+                continue
+            key = _operator_key(name, nip)
+            if key in seen:
+                report.errors.append(f"Row {row_number}: Duplicate of row {seen[key]}")
+                continue
+            seen[key] = row_number
+            batch.append((row_number, name, nip))
+            if len(batch) >= batch_size:
+                _write_batch(batch, report)
+                batch = []
+        if batch:
+            _write_batch(batch, report)
+
+    # bulk_create/bulk_update don't send the signals that keep the directory cache fresh
+    directory_cache.invalidate()
+    return report
@@ -0,0 +1,213 @@
+"""
+Query-count profiling and N+1 detection.
+
+QueryRecorder collects the SQL run on every database connection while it is
+active and groups it by shape: the statement with its literals and parameter
+lists collapsed, so `WHERE id = 3` and `WHERE id = 7` count as the same query.
+A shape repeated within one request is usually a lookup made in a loop (an
+N+1) that select_related, prefetch_related or a single filtered query would
+replace.
+
+QueryProfilerMiddleware records every request in development (DEBUG, or
+QUERY_PROFILING = True), adds an X-Query-Count header and logs a warning with
+the repeated shapes. It removes itself from the chain otherwise.
+
+QUERY_BUDGETS declares how many queries each view may run against the seeded
+test data; QueryBudgetMixin.assertQueryBudget fails a test that exceeds it and
+prints the queries that ran. Every view of core, bast, qc, qcfm and cl_seiscomp
+has a budget, the tests check that none is missing.
+"""
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+# A shape run this many times in one request is reported as a likely N+1
+REPEAT_THRESHOLD = 3
+
+# Queries per request against the seeded test data (core.tests.QueryBudgetTests).
+# The counts must not grow with the number of records; raise a budget only
+# together with the view change that needs it. The test runs with cold caches:
+# lookups served from core.cache and the station directory cost the one query
+# that loads them, and none once they are cached.
+QUERY_BUDGETS = {
+    'home': 0,
+    'core:core': 0,
+    'core:operator_list': 1,
+    'core:operator_create': 0,
+    'core:operator_update': 1,
+    # One SELECT and DELETE per related model, whatever the number of records
+    'core:operator_delete_direct': 23,
+    'core:operator_bulk_create': 0,
+    'core:kelompok_list': 1,
+    'core:kelompok_create': 0,
+    'core:kelompok_update': 3,
+    'core:kelompok_delete_direct': 4,
+    'core:get_operator_list': 1,
+    'core:search_api': 1,
+
+    'bast:bastrecord_list': 0,
+    'bast:bast_all_records': 0,
+    'bast:bastrecord_create': 1,
+    'bast:bastrecord_update': 3,
+    'bast:bastrecord_list_api': 1,
+    'bast:fetch_data': 0,
+    'bast:get_nip': 1,
+    'bast:get_member_data': 1,
+    'bast:get_cs_data': 1,
+    'bast:export_to_excel': 2,
+    'bast:export_to_pdf': 1,
+    'bast:bastrecord_delete_direct': 3,
+    'bast:form_bootstrap': 1,
+    'bast:get_previous_members': 1,
+    'bast:get_previous_poco_exp': 1,
+    'bast:get_previous_samsung_exp': 1,
+    'bast:get_previous_pulsa_poco': 1,
+    'bast:export_bast_csv': 2,
+
+    'qc:qcrecord_list': 0,
+    'qc:qc_all_records': 0,
+    'qc:qcrecord_create': 1,
+    'qc:qcrecord_update': 2,
+    'qc:fetch_data': 0,
+    'qc:qcrecord_list_api': 1,
+    'qc:get_nip': 1,
+    'qc:export_to_excel': 2,
+    'qc:export_to_pdf': 1,
+    'qc:qcrecord_delete_direct': 3,
+    'qc:save_nip': 2,
+    'qc:errorstation_list': 1,
+    'qc:errorstation_add': 1,
+    'qc:errorstation_edit': 2,
+    'qc:errorstation_delete': 1,
+    'qc:export_qc_csv': 3,
+
+    'qcfm:qcfmrecord_list': 0,
+    'qcfm:qcfm_all_records': 0,
+    'qcfm:qcfmrecord_create': 1,
+    'qcfm:qcfmrecord_update': 2,
+    'qcfm:fetch_data': 0,
+    'qcfm:get_nip': 1,
+    'qcfm:qcfmrecord_list_api': 1,
+    'qcfm:export_to_excel': 2,
+    'qcfm:export_qcfm_csv': 3,
+    'qcfm:export_to_pdf': 1,
+    'qcfm:qcfmrecord_delete_direct': 3,
+
+    'cl_seiscomp:cs_list': 1,
+    'cl_seiscomp:cs_all_records': 0,
+    'cl_seiscomp:station_list': 1,
+    'cl_seiscomp:sl_create': 0,
+    'cl_seiscomp:sl_update': 1,
+    'cl_seiscomp:sl_delete': 2,
+    'cl_seiscomp:sl_bulk_create': 0,
+    'cl_seiscomp:cs_create': 1,
+    'cl_seiscomp:cs_update': 2,
+    # The cascade to station issues and image jobs, then the rollup refresh of the record's date
+    'cl_seiscomp:cs_delete': 13,
+    'cl_seiscomp:csrecord_list_api': 1,
+    'cl_seiscomp:export_to_excel': 2,
+    'cl_seiscomp:export_to_pdf': 1,
+    'cl_seiscomp:export_cs_to_csv': 3,
+    'cl_seiscomp:fetch_gaps_blanks': 0,
+    'cl_seiscomp:stats': 5,
+    'cl_seiscomp:stats_timeseries_api': 4,
+}
+
+BUDGETED_NAMESPACES = ('core', 'bast', 'qc', 'qcfm', 'cl_seiscomp')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:\s*(?:%s|\?|\d+(?:\.\d+)?|\'\?\')\s*,?)+\)', re.I)
+
+
+def query_shape(sql):
+    """`sql` with literals replaced by ? and IN (...) lists collapsed."""
+    shape = _IN_LIST.sub('IN (...)', sql)
+    shape = _STRING.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    return shape.replace('%s', '?')
+
+
+def profiling_enabled():
+    enabled = getattr(settings, 'QUERY_PROFILING', None)
+    return settings.DEBUG if enabled is None else enabled
+
+
+class QueryRecorder:
+    """
+    Context manager recording the queries run on all database connections:
+    `queries` is a list of {'alias', 'sql', 'seconds', 'many'} in execution order.
+    """
+
+    def __init__(self, using=None):
+        self.using = using
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        aliases = [self.using] if self.using else list(connections)
+        for alias in aliases:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._wrapper(alias)))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def _wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append({
+                    'alias': alias, 'sql': sql, 'seconds': time.perf_counter() - start, 'many': many,
+                })
+        return record
+
+    def __len__(self):
+        return len(self.queries)
+
+    def shapes(self):
+        """{shape: count} in order of first execution."""
+        counts = {}
+        for query in self.queries:
+            shape = query_shape(query['sql'])
+            counts[shape] = counts.get(shape, 0) + 1
+        return counts
+
+    def repeated_shapes(self, threshold=REPEAT_THRESHOLD):
+        return {shape: count for shape, count in self.shapes().items() if count >= threshold}
+
+    def report(self):
+        lines = [f'{len(self.queries)} queries, {sum(q["seconds"] for q in self.queries) * 1000:.1f} ms:']
+        lines += [f'{i}. {query["sql"]}' for i, query in enumerate(self.queries, 1)]
+        repeated = self.repeated_shapes()
+        if repeated:
+            lines.append('Repeated query shapes:')
+            lines += [f'{count}x {shape}' for shape, count in repeated.items()]
+        return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """TestCase mixin for checking a request against its entry in QUERY_BUDGETS."""
+
+    def assertQueryBudget(self, view_name, budget=None):
+        return _BudgetContext(self, view_name, QUERY_BUDGETS[view_name] if budget is None else budget)
+
+
+class _BudgetContext(QueryRecorder):
+    def __init__(self, test_case, view_name, budget):
+        super().__init__()
+        self.test_case = test_case
+        self.view_name = view_name
+        self.budget = budget
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self) > self.budget:
+            self.test_case.fail(f'{self.view_name} ran {len(self)} queries, its budget is {self.budget}.\n'
+                                f'{self.report()}')
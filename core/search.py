@@ -0,0 +1,319 @@
+"""
+Full-text search across the record text fields of bast, qc, qcfm and cl_seiscomp.
+
+The index is a SQLite FTS5 virtual table holding one row per (record, field).
+It is kept in sync by post_save/post_delete signals (connected in
+CoreConfig.ready) and can be rebuilt with `python manage.py rebuild_search_index`.
+Deleted records are removed in one batch when the transaction commits (see
+core.db.defer_to_commit), so deleting an operator doesn't cost a query per record.
+"""
+import logging
+import time
+
+from django.apps import apps
+from django.db import connection, connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+from .db import defer_to_commit
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'core_record_search'
+
+# Records per DELETE when removing a batch, below SQLite's variable limit
+REMOVE_BATCH_SIZE = 500
+
+# source name -> model label, record id field and the text fields to index
+SEARCH_SOURCES = {
+    'bast': {
+        'model': 'bast.BastRecordModel',
+        'id_field': 'bast_id',
+        'fields': ['events', 'notes'],
+    },
+    'qc': {
+        'model': 'qc.QcRecord',
+        'id_field': 'qc_id',
+        'fields': ['qc'],
+    },
+    'qcfm': {
+        'model': 'qcfm.QcFmRecord',
+        'id_field': 'qcfm_id',
+        'fields': ['qcfm'],
+    },
+    'cl_seiscomp': {
+        'model': 'cl_seiscomp.CsRecordModel',
+        'id_field': 'cs_id',
+        'fields': ['gaps', 'blanks', 'spikes'],
+    },
+}
+
+_fts5_available = None
+
+
+def fts5_available():
+    """Return True if the default database is SQLite with FTS5 compiled in."""
+    global _fts5_available
+    if connection.vendor != 'sqlite':
+        return False
+    if _fts5_available is None:
+        import sqlite3
+        try:
+            probe = sqlite3.connect(':memory:')
+            probe.execute('CREATE VIRTUAL TABLE probe USING fts5(body)')
+            probe.close()
+            _fts5_available = True
+        except sqlite3.OperationalError:
+            logger.warning('SQLite FTS5 is not available, record search falls back to LIKE queries')
+            _fts5_available = False
+    return _fts5_available
+
+
+def ensure_search_table(cursor):
+    # Once per connection; `migrate` creates the table (see create_search_table)
+    db = cursor.db
+    if getattr(db, 'search_table_ready', False):
+        return
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+        'source UNINDEXED, record_pk UNINDEXED, record_id UNINDEXED, '
+        'date UNINDEXED, shift UNINDEXED, field UNINDEXED, body, '
+        "tokenize = 'unicode61')"
+    )
+    # A table created inside a transaction is gone again if it rolls back
+    if not db.in_atomic_block:
+        db.search_table_ready = True
+
+
+def create_search_table(using='default', **kwargs):
+    if connections[using].vendor != 'sqlite' or not fts5_available():
+        return
+    with connections[using].cursor() as cursor:
+        ensure_search_table(cursor)
+
+
+def _source_for_model(model):
+    label = model._meta.label
+    for source, config in SEARCH_SOURCES.items():
+        if config['model'] == label:
+            return source, config
+    return None, None
+
+
+def _index_rows(source, config, record):
+    record_id = getattr(record, config['id_field'])
+    date = record.date.isoformat() if record.date else ''
+    for field in config['fields']:
+        body = getattr(record, field) or ''
+        if body.strip():
+            yield (source, record.pk, record_id, date, record.shift or '', field, body)
+
+
+def index_record(record):
+    source, config = _source_for_model(type(record))
+    if source is None or not fts5_available():
+        return
+    with connection.cursor() as cursor:
+        ensure_search_table(cursor)
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE source = %s AND record_pk = %s', [source, record.pk])
+        _insert_rows(cursor, list(_index_rows(source, config, record)))
+
+
+def remove_records(pks_by_source):
+    """Remove {source: [pk, ...]} from the index, every source in the same DELETE."""
+    if not fts5_available():
+        return
+    items = [(source, pk) for source, pks in pks_by_source.items() for pk in pks]
+    with connection.cursor() as cursor:
+        ensure_search_table(cursor)
+        for start in range(0, len(items), REMOVE_BATCH_SIZE):
+            batch = {}
+            for source, pk in items[start:start + REMOVE_BATCH_SIZE]:
+                batch.setdefault(source, []).append(pk)
+            conditions = [f'(source = %s AND record_pk IN ({", ".join(["%s"] * len(pks))}))' for pks in batch.values()]
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE {" OR ".join(conditions)}',
+                           [param for source, pks in batch.items() for param in (source, *pks)])
+
+
+def rename_record_ids(model, renamed):
+    """Update the stored record ids after a bulk rename. `renamed` is a list of (pk, new_id)."""
+    source, _ = _source_for_model(model)
+    if source is None or not fts5_available() or not renamed:
+        return
+    with connection.cursor() as cursor:
+        ensure_search_table(cursor)
+        cursor.executemany(
+            f'UPDATE {SEARCH_TABLE} SET record_id = %s WHERE source = %s AND record_pk = %s',
+            [(new_id, source, pk) for pk, new_id in renamed],
+        )
+
+
+def rebuild_search_index(batch_size=500):
+    """Drop and repopulate the whole index. Returns the number of rows indexed per source."""
+    if not fts5_available():
+        return {}
+    counts = {}
+    with connection.cursor() as cursor:
+        # A table that existed before is back after a commit and after a rollback
+        ready = getattr(connection, 'search_table_ready', False)
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+        connection.search_table_ready = False
+        ensure_search_table(cursor)
+        connection.search_table_ready = ready or not connection.in_atomic_block
+        for source, config in SEARCH_SOURCES.items():
+            model = apps.get_model(config['model'])
+            only = ['pk', 'date', 'shift', config['id_field']] + config['fields']
+            rows = []
+            counts[source] = 0
+            for record in model.objects.only(*only).iterator(chunk_size=batch_size):
+                rows.extend(_index_rows(source, config, record))
+                if len(rows) >= batch_size:
+                    counts[source] += _insert_rows(cursor, rows)
+                    rows = []
+            counts[source] += _insert_rows(cursor, rows)
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    return counts
+
+
+def _insert_rows(cursor, rows):
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (source, record_pk, record_id, date, shift, field, body) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+            rows,
+        )
+    return len(rows)
+
+
+def build_match_query(query):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every term is quoted so user input can't inject FTS5 operators, terms are
+    ANDed together and the last term is matched as a prefix.
+    """
+    terms = [term.replace('"', '""') for term in query.split() if term.strip('"')]
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_records(query, sources=None, field=None, limit=50):
+    """
+    Return ranked hits for `query` as a list of dicts.
+
+    Args:
+        query (str): Free text, e.g. "M6 Banda Sea" or a station code.
+        sources (list): Restrict to these sources (keys of SEARCH_SOURCES).
+        field (str): Restrict to one indexed field, e.g. 'blanks'.
+        limit (int): Maximum number of hits.
+    """
+    sources = [s for s in (sources or SEARCH_SOURCES) if s in SEARCH_SOURCES]
+    if not query.strip() or not sources:
+        return []
+    if not fts5_available():
+        return _search_records_like(query, sources, field, limit)
+
+    match = build_match_query(query)
+    if not match:
+        return []
+    where = [f'{SEARCH_TABLE} MATCH %s', f"source IN ({', '.join(['%s'] * len(sources))})"]
+    params = [match] + sources
+    if field:
+        where.append('field = %s')
+        params.append(field)
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        ensure_search_table(cursor)
+        cursor.execute(
+            f"SELECT source, record_pk, record_id, date, shift, field, "
+            f"snippet({SEARCH_TABLE}, 6, '[', ']', '...', 12), bm25({SEARCH_TABLE}) "
+            f"FROM {SEARCH_TABLE} WHERE {' AND '.join(where)} "
+            f"ORDER BY rank, date DESC LIMIT %s",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'source': source,
+            'pk': int(record_pk),
+            'record_id': record_id,
+            'date': date,
+            'shift': shift,
+            'field': field_name,
+            'snippet': snippet,
+            'score': round(-score, 4),
+        }
+        for source, record_pk, record_id, date, shift, field_name, snippet, score in rows
+    ]
+
+
+def _search_records_like(query, sources, field, limit):
+    """Slow fallback for databases without FTS5, one icontains query per source."""
+    from django.db.models import Q
+
+    hits = []
+    for source in sources:
+        config = SEARCH_SOURCES[source]
+        fields = [f for f in config['fields'] if field in (None, f)]
+        if not fields:
+            continue
+        condition = Q()
+        for term in query.split():
+            term_condition = Q()
+            for f in fields:
+                term_condition |= Q(**{f'{f}__icontains': term})
+            condition &= term_condition
+        model = apps.get_model(config['model'])
+        for record in model.objects.filter(condition).order_by('-date')[:limit]:
+            for source_, pk, record_id, date, shift, field_name, body in _index_rows(source, config, record):
+                if field_name in fields:
+                    hits.append({
+                        'source': source_, 'pk': pk, 'record_id': record_id, 'date': date,
+                        'shift': shift, 'field': field_name, 'snippet': body[:120], 'score': 0,
+                    })
+    hits.sort(key=lambda hit: hit['date'], reverse=True)
+    return hits[:limit]
+
+
+def _handle_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        index_record(instance)
+    except Exception as e:
+        # Never let a search index problem block saving a record
+        logger.error(f"Failed to index {sender.__name__} {instance.pk}: {e}")
+
+
+def _handle_delete(sender, instance, **kwargs):
+    source, _ = _source_for_model(sender)
+    if source is not None:
+        defer_to_commit(_remove_deleted, (source, instance.pk))
+
+
+def _remove_deleted(items):
+    pks_by_source = {}
+    for source, pk in items:
+        pks_by_source.setdefault(source, []).append(pk)
+    try:
+        remove_records(pks_by_source)
+    except Exception as e:
+        logger.error(f"Failed to remove {len(items)} deleted records from search index: {e}")
+
+
+def connect_signals():
+    for config in SEARCH_SOURCES.values():
+        model = apps.get_model(config['model'])
+        post_save.connect(_handle_save, sender=model, dispatch_uid=f'search_index_save_{model._meta.label}')
+        post_delete.connect(_handle_delete, sender=model, dispatch_uid=f'search_index_delete_{model._meta.label}')
+    post_migrate.connect(create_search_table, sender=apps.get_app_config('core'), dispatch_uid='search_index_table')
+
+
+def timed_search(query, **kwargs):
+    start = time.perf_counter()
+    hits = search_records(query, **kwargs)
+    return hits, round((time.perf_counter() - start) * 1000, 2)
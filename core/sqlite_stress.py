@@ -0,0 +1,184 @@
+"""
+Concurrency stress test for the SQLite settings.
+
+Simulates gunicorn workers sharing one database file. Every worker is a new
+process running Django against a scratch database (EBAST_DB_PATH), so it goes
+through the same connection setup as the app: the connection_created PRAGMAs
+of core.db and the transaction mode of DATABASES OPTIONS. Writer processes
+save CS records the way the form does (the unique check, then the save with its
+signals: station issues, daily rollups, search index, all in one transaction)
+while reader processes page through the record list and scan a month of
+records, as the list views and exports do. Each run reports committed saves,
+"database is locked" errors and reads per second, so Django's defaults can be
+compared with SQLITE_PRAGMAS and transaction_mode.
+"""
+import datetime
+import multiprocessing
+import os
+import random
+import shutil
+import time
+import traceback
+
+# Django's own defaults: rollback journal, 5 second timeout, deferred transactions
+BASELINE = {'pragmas': {}, 'transaction_mode': None}
+
+# Seconds a worker process may take to start Django before the run is abandoned
+STARTUP_TIMEOUT = 60
+
+
+def tuned_profile(pragmas, transaction_mode='IMMEDIATE'):
+    return {'pragmas': pragmas, 'transaction_mode': transaction_mode}
+
+
+def _setup_django(path, profile):
+    """Point this (new) process at the scratch database and start Django with `profile`."""
+    directory = os.path.dirname(path)
+    os.environ.update(
+        DJANGO_SETTINGS_MODULE='ebast.settings',
+        DEBUG='False',
+        EBAST_DB_PATH=path,
+        EBAST_CACHE_DIR=os.path.join(directory, 'cache'),
+        EBAST_METRICS_DB=os.path.join(directory, 'metrics.sqlite3'),
+    )
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    # Before the first query, the connection reads both when it opens
+    settings.SQLITE_PRAGMAS = profile['pragmas']
+    connection.settings_dict['OPTIONS'] = dict(connection.settings_dict['OPTIONS'],
+                                               transaction_mode=profile['transaction_mode'])
+
+
+def _seed(path, rows, stations, seed):
+    from django.core.management import call_command
+
+    _setup_django(path, BASELINE)
+    from cl_seiscomp.models import CsRecordModel, StationListModel
+    from core.models import Operator
+
+    rng = random.Random(seed)
+    call_command('migrate', run_syncdb=True, verbosity=0, interactive=False)
+    operator = Operator.objects.create(name='Stress Operator', NIP='0')
+    codes = [f'ST{i:03d}' for i in range(stations)]
+    StationListModel.objects.bulk_create([
+        StationListModel(network='IA', code=code, province='P', location='L', digitizer_type='T', UPT='U')
+        for code in codes
+    ])
+    start = datetime.date(2020, 1, 1)
+    CsRecordModel.objects.bulk_create([
+        CsRecordModel(cs_id=f'CS-{i}', date=start + datetime.timedelta(days=i // 4), operator=operator,
+                      gaps='\n'.join(rng.sample(codes, 3)), blanks=rng.choice(codes))
+        for i in range(rows)
+    ], batch_size=1000)
+
+
+def create_database(path, rows=20000, stations=100, seed=0):
+    """Create and seed a scratch database with the app's schema, in its own process."""
+    process = multiprocessing.get_context('spawn').Process(target=_seed, args=(path, rows, stations, seed))
+    process.start()
+    process.join()
+    if process.exitcode:
+        raise RuntimeError(f'Seeding {path} failed, exit code {process.exitcode}.')
+
+
+def _is_lock_error(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def _write(rng, worker, deadline):
+    from django.db import OperationalError, transaction
+    from cl_seiscomp.models import CsRecordModel, StationListModel
+
+    codes = list(StationListModel.objects.values_list('code', flat=True))
+    operator_id = CsRecordModel.objects.values_list('operator_id', flat=True).first()
+    commits = errors = 0
+    while time.monotonic() < deadline:
+        cs_id = f'W{worker}-{commits + errors}'
+        try:
+            with transaction.atomic():
+                # The form's unique check reads before the save writes
+                if not CsRecordModel.objects.filter(cs_id=cs_id).exists():
+                    date = CsRecordModel.objects.order_by('-date').values_list('date', flat=True).first()
+                    CsRecordModel(cs_id=cs_id, date=date, operator_id=operator_id,
+                                  gaps='\n'.join(rng.sample(codes, 3))).save()
+            commits += 1
+        except OperationalError as e:
+            if not _is_lock_error(e):
+                raise
+            errors += 1
+        time.sleep(rng.uniform(0, 0.005))
+    return {'commits': commits, 'errors': errors, 'reads': 0}
+
+
+def _read(rng, worker, deadline):
+    from django.db import OperationalError
+    from cl_seiscomp.models import CsRecordModel
+
+    reads = errors = 0
+    while time.monotonic() < deadline:
+        try:
+            offset = rng.randrange(0, 5000)
+            # A list page plus an export-sized scan, autocommit like the views
+            list(CsRecordModel.objects.select_related('operator').order_by('-date', '-id')[offset:offset + 100])
+            latest = CsRecordModel.objects.order_by('-date').values_list('date', flat=True).first()
+            list(CsRecordModel.objects.filter(date__gte=latest - datetime.timedelta(days=30))
+                 .values_list('date', 'gaps'))
+            reads += 1
+        except OperationalError as e:
+            if not _is_lock_error(e):
+                raise
+            errors += 1
+    return {'commits': 0, 'errors': errors, 'reads': reads}
+
+
+def _worker(role, path, profile, duration, seed, barrier, results):
+    try:
+        _setup_django(path, profile)
+        barrier.wait(STARTUP_TIMEOUT)
+        work = _write if role == 'writer' else _read
+        results.put(work(random.Random(seed), seed, time.monotonic() + duration))
+    except BaseException:
+        barrier.abort()
+        results.put({'failed': traceback.format_exc()})
+
+
+def run_stress(path, profile, writers=3, readers=3, duration=5.0):
+    """Run writer and reader processes against `path` and return the summed counts."""
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(writers + readers)
+    results = context.Queue()
+    roles = ['writer'] * writers + ['reader'] * readers
+    processes = [context.Process(target=_worker, args=(role, path, profile, duration, i, barrier, results))
+                 for i, role in enumerate(roles)]
+    for process in processes:
+        process.start()
+    try:
+        counts = [results.get(timeout=STARTUP_TIMEOUT + duration) for _ in processes]
+    finally:
+        for process in processes:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+    failed = [result['failed'] for result in counts if 'failed' in result]
+    if failed:
+        raise RuntimeError(f'A stress worker failed:\n{failed[0]}')
+
+    totals = {key: sum(result[key] for result in counts) for key in ('commits', 'errors', 'reads')}
+    totals['reads_per_second'] = round(totals['reads'] / duration, 1)
+    totals['commits_per_second'] = round(totals['commits'] / duration, 1)
+    return totals
+
+
+def compare(directory, pragmas, transaction_mode='IMMEDIATE', writers=3, readers=3, duration=5.0, rows=20000):
+    """Run the same workload on copies of one seeded database with the baseline and tuned settings."""
+    seeded = os.path.join(directory, 'seeded.sqlite3')
+    create_database(seeded, rows=rows)
+    results = {}
+    for name, profile in (('baseline', BASELINE), ('tuned', tuned_profile(pragmas, transaction_mode))):
+        path = os.path.join(directory, f'{name}.sqlite3')
+        shutil.copyfile(seeded, path)
+        results[name] = run_stress(path, profile, writers=writers, readers=readers, duration=duration)
+    return results
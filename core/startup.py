@@ -0,0 +1,84 @@
+"""
+Worker boot benchmark.
+
+Boots Django in a fresh interpreter the way a gunicorn worker does (settings,
+app registry, WSGI handler and URLconf) under `python -X importtime` and
+reports the total import time, the slowest top-level imports, the resident
+memory after boot and which heavy libraries got loaded along the way.
+
+pandas, plotly, numpy, scipy, matplotlib, openpyxl and httpx are imported by
+the code paths that use them, so none of them should be loaded at boot. The
+startup test fails when one creeps back in. The time and memory budgets below
+depend on the machine and its load, so only `manage.py startup_benchmark`
+reports them (and fails on them with --check).
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'matplotlib', 'plotly', 'openpyxl', 'httpx')
+
+# Generous ceilings, about twice what a worker takes today
+STARTUP_IMPORT_BUDGET_MS = 800
+STARTUP_RSS_BUDGET_MB = 90
+
+BOOT_SCRIPT = '''
+import json, sys
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+
+rss_kb = None
+try:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'rss_kb': rss_kb, 'modules': sorted(sys.modules)}))
+'''
+
+
+def parse_importtime(output):
+    """
+    Parse `-X importtime` output into (total_us, top_level) where top_level is
+    [(module, cumulative_us), ...] for the imports made directly by the script.
+    """
+    total_us = 0
+    top_level = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        # Nested imports are indented by two spaces per level
+        if not name[1:].startswith(' '):
+            top_level.append((name.strip(), int(cumulative_us)))
+    return total_us, top_level
+
+
+def measure_startup(python=None, top=10):
+    """Boot a worker in a subprocess and return its import time, RSS and loaded heavy modules."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'ebast.settings'))
+    result = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    total_us, top_level = parse_importtime(result.stderr)
+    boot = json.loads(result.stdout.strip().splitlines()[-1])
+    loaded = set(boot['modules'])
+    return {
+        'import_ms': round(total_us / 1000, 1),
+        'rss_mb': round(boot['rss_kb'] / 1024, 1) if boot['rss_kb'] else None,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in loaded],
+        'slowest_imports': [
+            {'module': name, 'ms': round(us / 1000, 1)}
+            for name, us in sorted(top_level, key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
@@ -0,0 +1,122 @@
+// Shared page behaviour: date pickers, tooltips and the modals in base.html
+// Flatpickr configuration
+function initializeDatePickers() {
+    // Date picker
+    document.querySelectorAll('.date-picker').forEach(function(el) {
+        flatpickr(el, {
+            dateFormat: "Y-m-d",
+            allowInput: true,
+            locale: 'id'
+        });
+    });
+
+    // Datetime picker
+    document.querySelectorAll('.datetime-picker').forEach(function(el) {
+        flatpickr(el, {
+            enableTime: true,
+            dateFormat: "Y-m-d H:i:S",
+            time_24hr: true,
+            allowInput: true,
+            defaultHour: 0,
+            defaultMinute: 0,
+            defaultSeconds: 0,
+            locale: 'id'
+        });
+    });
+}
+
+/**
+ * Setup click handler for calendar icon of a given input
+ * @param {string} inputId - The ID of the input element
+ * @param {string} [pickerClass='date-picker'] - The class to add to the input (date-picker or datetime-picker)
+ */
+ function setupCalendarIcon(inputId, pickerClass = 'date-picker') {
+    const input = typeof inputId === 'string' ? document.getElementById(inputId) : inputId;
+    if (!input) return;
+
+    // Add the appropriate picker class
+    if (pickerClass) {
+        input.classList.add(pickerClass);
+    }
+
+    // Find the calendar icon and add click handler
+    const wrapper = input.closest('.input-group');
+    if (!wrapper) return;
+
+    const icon = wrapper.querySelector('.input-group-text');
+    if (!icon) return;
+
+    icon.addEventListener('click', () => {
+        if (input._flatpickr) {
+            input._flatpickr.open();
+        }
+    });
+}
+
+// Make calendar icons clickable to trigger date/datetime picker
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize flatpickr
+    initializeDatePickers();
+
+    // Initialize Bootstrap tooltips
+    var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
+    var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+        return new bootstrap.Tooltip(tooltipTriggerEl);
+    });
+
+    // Add click event listeners to all calendar icons
+    document.querySelectorAll('.input-group-text .fa-calendar-alt').forEach(icon => {
+        const inputGroupText = icon.closest('.input-group-text');
+        if (inputGroupText) {
+            // Change cursor to pointer on hover for better UX
+            inputGroupText.style.cursor = 'pointer';
+
+            inputGroupText.addEventListener('click', function (e) {
+                // Find the closest input group and get the input element
+                const inputGroup = this.closest('.input-group');
+                if (inputGroup) {
+                    const input = inputGroup.querySelector('input');
+                    if (input) {
+                        input.focus();
+                        // flatpickr instances are attached to their input
+                        if (input._flatpickr) {
+                            input._flatpickr.open();
+                        }
+                    }
+                }
+            });
+        }
+    });
+
+    // Other existing DOMContentLoaded code
+    // Get the modal elements
+    var deleteModal = new bootstrap.Modal(document.getElementById('deleteConfirmationModal'));
+    var deleteForm = document.getElementById('deleteForm');
+    var errorModal = new bootstrap.Modal(document.getElementById('errorModal'));
+    var successModal = new bootstrap.Modal(document.getElementById('successModal'));
+
+    // Show delete modal when delete button is clicked
+    document.querySelectorAll('.delete-btn').forEach(function(button) {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            if (deleteForm) {
+                deleteForm.action = this.dataset.deleteUrl;
+            }
+            deleteModal.show();
+        });
+    });
+
+    // Handle delete modal hide
+    deleteModal._element.addEventListener('hide.bs.modal', function() {
+        if (deleteForm) {
+            deleteForm.action = '';
+        }
+    });
+
+    // Handle delete confirmation
+    document.getElementById('confirmDeleteButton').addEventListener('click', function() {
+        if (deleteForm) {
+            deleteForm.submit();
+        }
+    });
+});
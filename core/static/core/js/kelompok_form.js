@@ -1,4 +1,8 @@
 // Kelompok form operations
+// Member ids of the kelompok being edited, rendered by the template with json_script
+const existingMembersData = document.getElementById('existing-members-data');
+const existingMemberIds = existingMembersData ? JSON.parse(existingMembersData.textContent) : [];
+
 document.addEventListener('DOMContentLoaded', function() {
     const oprInput = document.getElementById('oprInput');
     const suggestionsBox = document.getElementById('suggestions');
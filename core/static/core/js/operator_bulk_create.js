@@ -0,0 +1,23 @@
+// Example starter JavaScript for disabling form submissions if there are invalid fields
+(function () {
+    'use strict';
+    window.addEventListener('load', function () {
+        var forms = document.getElementsByClassName('needs-validation');
+        var validation = Array.prototype.filter.call(forms, function (form) {
+            form.addEventListener('submit', function (event) {
+                var fileInput = document.getElementById('file');
+                var textArea = document.getElementById('csv_data');
+                if (!fileInput.value && !textArea.value.trim()) {
+                    event.preventDefault();
+                    event.stopPropagation();
+                    fileInput.setCustomValidity('Please upload a CSV file or provide CSV data.');
+                    textArea.setCustomValidity('Please upload a CSV file or provide CSV data.');
+                } else {
+                    fileInput.setCustomValidity('');
+                    textArea.setCustomValidity('');
+                }
+                form.classList.add('was-validated');
+            }, false);
+        });
+    }, false);
+})();
@@ -0,0 +1,226 @@
+document.addEventListener("DOMContentLoaded", function() {
+    // Initialize tooltips (assuming Bootstrap 5)
+    var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
+    var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+      return new bootstrap.Tooltip(tooltipTriggerEl)
+    });
+
+    // Delete confirmation
+    const deleteForms = document.querySelectorAll('.delete-form');
+    deleteForms.forEach(form => {
+        form.addEventListener('submit', function(event) {
+            const confirmed = confirm('Are you sure you want to delete this item?');
+            if (!confirmed) {
+                event.preventDefault(); // Stop form submission
+            }
+        });
+    });
+
+    // --- Pagination, Filtering, Sorting Logic ---
+    let currentPage = 1;
+    let recordsPerPage = parseInt(document.getElementById("recordsPerPageTop").value);
+    const table = document.getElementById("operatorTable");
+    const tbody = document.getElementById("operatorTableBody");
+    const originalRows = Array.from(tbody.querySelectorAll("tr:not(:has(td[colspan='4']))")); // Store original data rows, exclude empty message row
+    let currentRows = [...originalRows]; // Rows currently being displayed/filtered/sorted
+    let totalPages = Math.ceil(currentRows.length / recordsPerPage);
+    let sortDirection = {}; // Keep track of sort direction for each column {0: 'asc', 1: 'desc', ...}
+
+    const pageInfoSpan = document.getElementById("pageInfo");
+    const prevPageButton = document.getElementById("prevPage");
+    const nextPageButton = document.getElementById("nextPage");
+    const recordsPerPageSelect = document.getElementById("recordsPerPageTop");
+    const searchFilterInput = document.getElementById("searchFilter");
+    const tableInfoDiv = document.getElementById("tableInfo");
+
+    function displayPage(page) {
+        currentPage = page;
+        const start = (page - 1) * recordsPerPage;
+        const end = start + recordsPerPage;
+
+        // Hide all rows first (important for filtering/sorting)
+        originalRows.forEach(row => row.style.display = 'none');
+
+        // Show only rows for the current page from the *current* set (filtered/sorted)
+        const pageRows = currentRows.slice(start, end);
+        pageRows.forEach(row => row.style.display = ''); // Use default display (usually 'table-row')
+
+        // Update pagination controls
+        totalPages = Math.ceil(currentRows.length / recordsPerPage); // Recalculate in case of filtering
+        if (totalPages === 0) totalPages = 1; // Avoid Page X of 0
+        pageInfoSpan.textContent = `Page ${currentPage} of ${totalPages}`;
+        prevPageButton.parentElement.classList.toggle('disabled', currentPage === 1);
+        nextPageButton.parentElement.classList.toggle('disabled', currentPage === totalPages || totalPages === 0);
+
+        // Update table info
+        const startRecord = currentRows.length > 0 ? start + 1 : 0;
+        const endRecord = Math.min(end, currentRows.length);
+        tableInfoDiv.textContent = `Showing ${startRecord} to ${endRecord} of ${currentRows.length} entries`;
+
+        // Ensure tbody has the correct rows displayed
+        // This approach avoids clearing and re-appending constantly
+        // We just toggle the display style
+
+         // Handle empty table state dynamically
+         handleEmptyTable();
+    }
+
+     function handleEmptyTable() {
+        const emptyRow = tbody.querySelector('.empty-row');
+        const hasDataRows = currentRows.length > 0;
+
+        if (!hasDataRows && !emptyRow) {
+            // Add empty message if no data rows and message doesn't exist
+            const tr = document.createElement('tr');
+            tr.classList.add('empty-row');
+            // Adjust colspan to match the number of columns in the header
+            tr.innerHTML = `<td colspan="4" class="text-center text-muted py-3">No matching records found.</td>`;
+            tbody.appendChild(tr);
+        } else if (hasDataRows && emptyRow) {
+            // Remove empty message if data rows exist and message exists
+            emptyRow.remove();
+        }
+
+        // Update footer info for empty state
+        if (!hasDataRows) {
+             pageInfoSpan.textContent = `Page 0 of 0`;
+             tableInfoDiv.textContent = `Showing 0 to 0 of 0 entries`;
+             prevPageButton.parentElement.classList.add('disabled');
+             nextPageButton.parentElement.classList.add('disabled');
+        } else if (originalRows.length === 0 && !emptyRow) {
+             // Handle case where table was initially empty (keep Django's message)
+             const initialEmptyRow = tbody.querySelector("td[colspan='4']");
+             if (initialEmptyRow) {
+                 pageInfoSpan.textContent = `Page 0 of 0`;
+                 tableInfoDiv.textContent = `Showing 0 to 0 of 0 entries`;
+                 prevPageButton.parentElement.classList.add('disabled');
+                 nextPageButton.parentElement.classList.add('disabled');
+             }
+        }
+    }
+
+
+    function updateRecordsPerPage() {
+        recordsPerPage = parseInt(this.value);
+        totalPages = Math.ceil(currentRows.length / recordsPerPage);
+        if (totalPages === 0) totalPages = 1;
+        currentPage = 1; // Reset to first page
+        displayPage(currentPage);
+    }
+
+    function filterTable() {
+        const filter = searchFilterInput.value.toLowerCase();
+        currentRows = originalRows.filter(row => {
+            const cells = row.getElementsByTagName("td");
+            // Check Name (index 0), NIP (index 1), Nickname (index 2)
+            return (cells[0] && cells[0].textContent.toLowerCase().includes(filter)) ||
+                   (cells[1] && cells[1].textContent.toLowerCase().includes(filter)) ||
+                   (cells[2] && cells[2].textContent.toLowerCase().includes(filter));
+        });
+        totalPages = Math.ceil(currentRows.length / recordsPerPage);
+         if (totalPages === 0) totalPages = 1;
+        currentPage = 1; // Reset to first page after filtering
+        // Re-apply the last sort before displaying
+        applySort();
+        displayPage(currentPage);
+    }
+
+    function sortTable(n) {
+        const currentDir = sortDirection[n] || 'asc'; // Default to asc if not sorted before
+        const newDir = currentDir === 'asc' ? 'desc' : 'asc';
+        sortDirection = { [n]: newDir }; // Store new direction for this column only
+
+        applySort(); // Apply the sort based on currentRows and sortDirection
+        currentPage = 1; // Reset to first page after sorting
+        displayPage(currentPage);
+        setArrow(n, newDir);
+    }
+
+    function applySort() {
+        const columnIndex = Object.keys(sortDirection)[0]; // Get the index of the column to sort by
+        if (columnIndex === undefined) return; // No sort applied yet
+
+        const dir = sortDirection[columnIndex];
+        const n = parseInt(columnIndex);
+
+        currentRows.sort((a, b) => {
+            const xCell = a.getElementsByTagName("TD")[n];
+            const yCell = b.getElementsByTagName("TD")[n];
+            // Handle potential missing cells gracefully (though unlikely in this structure)
+            const x = xCell ? xCell.textContent.toLowerCase() : '';
+            const y = yCell ? yCell.textContent.toLowerCase() : '';
+
+            // Basic localeCompare for string sorting
+            let comparison = x.localeCompare(y);
+
+            // If NIP column (index 1), try numeric sort first
+            if (n === 1) {
+                const numX = parseFloat(x);
+                const numY = parseFloat(y);
+                if (!isNaN(numX) && !isNaN(numY)) {
+                    comparison = numX - numY;
+                }
+            }
+
+            return dir === "asc" ? comparison : -comparison; // Reverse comparison for desc
+        });
+
+        // Re-append sorted rows to tbody to ensure DOM order matches the sorted array
+        // This is necessary because displayPage only shows/hides, doesn't reorder
+        const emptyRow = tbody.querySelector('.empty-row'); // Preserve empty row if present
+        tbody.innerHTML = ''; // Clear tbody content
+        if (emptyRow) tbody.appendChild(emptyRow); // Re-add empty row if it existed
+
+        currentRows.forEach(row => tbody.appendChild(row));
+        // After re-appending, call displayPage to apply pagination slicing and visibility
+        // Use the *current* currentPage, don't reset it here
+        displayPage(currentPage);
+    }
+
+
+    function resetArrows() {
+        document.getElementById("nameSortArrow").innerHTML = "";
+        document.getElementById("nipSortArrow").innerHTML = "";
+        document.getElementById("nicknameSortArrow").innerHTML = "";
+    }
+
+    function setArrow(n, dir) {
+        resetArrows(); // Clear previous arrows
+        const arrow = dir === "asc" ? '<i class="fas fa-sort-up ms-1"></i>' : '<i class="fas fa-sort-down ms-1"></i>';
+        if (n === 0) {
+            document.getElementById("nameSortArrow").innerHTML = arrow;
+        } else if (n === 1) {
+            document.getElementById("nipSortArrow").innerHTML = arrow;
+        } else if (n === 2) {
+            document.getElementById("nicknameSortArrow").innerHTML = arrow;
+        }
+    }
+
+    // --- Event Listeners ---
+    recordsPerPageSelect.addEventListener("change", updateRecordsPerPage);
+    searchFilterInput.addEventListener("input", filterTable); // Use 'input' for more responsive filtering
+
+    prevPageButton.addEventListener("click", function() {
+        if (currentPage > 1) {
+            displayPage(currentPage - 1);
+        }
+    });
+
+    nextPageButton.addEventListener("click", function() {
+        if (currentPage < totalPages) {
+             displayPage(currentPage + 1);
+        }
+    });
+
+    // --- Initial Setup ---
+    // Assign sortTable to global scope because it's used in `onclick` attributes in the HTML
+     window.sortTable = sortTable;
+
+    // No initial sort arrow shown, arrows appear on first click
+    // resetArrows(); // Ensure arrows are clear initially
+
+    totalPages = Math.ceil(currentRows.length / recordsPerPage); // Recalculate initial totalPages
+    if (totalPages === 0) totalPages = 1;
+    displayPage(currentPage); // Initial display
+
+});
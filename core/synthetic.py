@@ -0,0 +1,286 @@
+"""
+Synthetic data for benchmarks.
+
+Generates operators, groups, stations and one BAST/QC/QC FM/CS record per shift
+per day, written with bulk_create so model save() side effects are skipped.
+Never call these against the production database; the benchmark commands run
+them inside a throwaway test database and `seed_synthetic` refuses a database
+that already has operators.
+
+index3_text() and qc_focal_text() produce the upstream event lists the
+fetch_data views read, in the layout clean_index3 and clean_fm_data parse, and
+aftershock_times() an Omori-Utsu aftershock sequence for the decay models.
+"""
+import datetime
+import json
+import random
+import string
+
+SHIFTS = (
+    ('Dini Hari', '1D', '02:00 - 08:30 WIB', '00:00 WIB'),
+    ('Pagi', '2P', '08:00 - 14:00 WIB', '06:00 WIB'),
+    ('Siang', '3S', '14:00 - 20:00 WIB', '12:00 WIB'),
+    ('Malam', '4M', '20:00 - 02:00 WIB', '18:00 WIB'),
+)
+
+REGIONS = (
+    'Banda Sea', 'Molucca Sea', 'Southern Sumatra, Indonesia', 'Java, Indonesia',
+    'Sulawesi, Indonesia', 'Flores Sea', 'Papua, Indonesia', 'Talaud Islands, Indonesia',
+    'Mindanao, Philippines', 'South of Java, Indonesia',
+)
+
+EVENT_HEADER = 'No,Date,OT (UTC),Lat,Long,D(Km),Mag,TypeMag,Region,MMI,Dis. PGN,Selisih PGN,Dis. PGR,Selisih PGR'
+QC_HEADER = 'Date,OT (UTC),Lat,Long,Mag,TypeMag,D(Km),Phase,RMS,Az. Gap,Region'
+QCFM_HEADER = 'Date,OT (UTC),Lat,Long,Mag,TypeMag,D(Km),S1,D1,R1,S2,D2,R2,Fit(%),CLVD(%)'
+
+INDEX3_COLUMNS = ('Event ID', 'Origin Time (GMT)', 'Lat', 'Lon', 'Depth', 'Mag', 'TypeMag', 'cntP', 'RMS', 'AZgap',
+                  'Remarks')
+QC_FOCAL_COLUMNS = ('Event ID', 'Datetime (UTC)', 'Lat', 'Long', 'D', 'Mag', 'Type M', 'S1', 'D1', 'R1', 'S2', 'D2',
+                    'R2', 'Fit(%)', 'CLVD(%)', 'Region')
+
+
+def station_codes(count, rng):
+    codes = set()
+    while len(codes) < count:
+        codes.add(''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.choice((3, 4)))))
+    return sorted(codes)
+
+
+def _event_rows(rng, day, count):
+    rows = []
+    for _ in range(count):
+        ot = datetime.time(rng.randrange(24), rng.randrange(60), rng.randrange(60))
+        rows.append({
+            'date': day.isoformat(),
+            'ot': ot.strftime('%H:%M:%S'),
+            'lat': f'{rng.uniform(-11, 6):.2f}',
+            'lon': f'{rng.uniform(94, 141):.2f}',
+            'depth': str(rng.randrange(5, 600)),
+            'mag': f'{rng.uniform(2.5, 6.8):.1f}',
+            'region': rng.choice(REGIONS),
+        })
+    return sorted(rows, key=lambda row: row['ot'])
+
+
+def bast_events(rng, day, count):
+    lines = [EVENT_HEADER]
+    for no, row in enumerate(_event_rows(rng, day, count), 1):
+        lines.append(
+            f"{no},{row['date']},{row['ot']},{row['lat']},{row['lon']},{row['depth']},{row['mag']},M,"
+            f"\"{row['region']}\",,,,,"
+        )
+    return '\n'.join(lines)
+
+
+def qc_events(rng, day, count):
+    lines = [QC_HEADER]
+    for row in _event_rows(rng, day, count):
+        lines.append(
+            f"{row['date']},{row['ot']},{row['lat']},{row['lon']},{row['mag']},M,{row['depth']},"
+            f"{rng.randrange(8, 120)},{rng.uniform(0.3, 1.5):.2f},{rng.randrange(30, 300)},\"{row['region']}\""
+        )
+    return '\n'.join(lines)
+
+
+def qcfm_events(rng, day, count):
+    lines = [QCFM_HEADER]
+    for row in _event_rows(rng, day, count):
+        planes = ','.join(str(rng.randrange(0, 360)) for _ in range(6))
+        lines.append(
+            f"{row['date']},{row['ot']},{row['lat']},{row['lon']},{row['mag']},Mw,{row['depth']},{planes},"
+            f"{rng.randrange(40, 95)},{rng.randrange(0, 40)}"
+        )
+    return '\n'.join(lines)
+
+
+def seed_records(years=1, operators=40, stations=550, end_date=None, seed=0, batch_size=1000):
+    """
+    Populate the current database with `years` of synthetic records ending at `end_date`.
+    Returns a dict of created row counts per model.
+    """
+    from core.models import Operator, Kelompok, KelompokMember
+    from bast.models import BastRecordModel
+    from qc.models import QcRecord
+    from qcfm.models import QcFmRecord
+    from cl_seiscomp.models import CsRecordModel, StationListModel
+
+    rng = random.Random(seed)
+    end_date = end_date or datetime.date.today()
+    start_date = end_date - datetime.timedelta(days=int(365 * years) - 1)
+
+    Operator.objects.bulk_create(
+        [Operator(name=f'Operator {i:03d}', NIP=f'{199001012015000000 + i}', nickname=f'op{i}') for i in range(operators)],
+        batch_size=batch_size,
+    )
+    operator_list = list(Operator.objects.order_by('pk'))
+    group_size = max(1, len(operator_list) // 6)
+    groups = [operator_list[i * group_size:(i + 1) * group_size] for i in range(6)]
+    kelompok_list = Kelompok.objects.bulk_create([Kelompok(name=i + 1) for i in range(6)])
+    KelompokMember.objects.bulk_create([
+        KelompokMember(kelompok=kelompok, operator=op, position=position)
+        for kelompok, members in zip(kelompok_list, groups) for position, op in enumerate(members)
+    ], batch_size=batch_size)
+
+    codes = station_codes(stations, rng)
+    StationListModel.objects.bulk_create([
+        StationListModel(
+            network='IA', code=code, province=f'Province {i % 34}', location=f'Location {code}',
+            digitizer_type=rng.choice(('Q330', 'Centaur', 'Taurus')), UPT=f'UPT {i % 12}',
+            longitude=round(rng.uniform(94, 141), 4), latitude=round(rng.uniform(-11, 6), 4),
+        )
+        for i, code in enumerate(codes)
+    ], batch_size=batch_size)
+
+    bast, qc, qcfm, cs = [], [], [], []
+    counts = {'operators': operators, 'stations': stations, 'bast': 0, 'qc': 0, 'qcfm': 0, 'cs': 0}
+
+    def flush(force=False):
+        for model, rows, key in ((BastRecordModel, bast, 'bast'), (QcRecord, qc, 'qc'),
+                                 (QcFmRecord, qcfm, 'qcfm'), (CsRecordModel, cs, 'cs')):
+            if rows and (force or len(rows) >= batch_size):
+                model.objects.bulk_create(rows, batch_size=batch_size)
+                counts[key] += len(rows)
+                rows.clear()
+
+    day = start_date
+    while day <= end_date:
+        for slot, (shift, suffix, waktu, jam_cs) in enumerate(SHIFTS):
+            kelompok = (day.toordinal() * 4 + slot) % 6 + 1
+            members = groups[kelompok - 1] or operator_list
+            operator = rng.choice(members)
+            member_json = json.dumps([
+                {'nama': op.name, 'keterangan': rng.choice(('Hadir', 'Hadir', 'Hadir', 'Cuti', 'Sakit'))}
+                for op in members
+            ])
+            gaps = rng.sample(codes, rng.randrange(0, 25))
+            spikes = rng.sample(codes, rng.randrange(0, 8))
+            blanks = rng.sample(codes, rng.randrange(0, 15))
+            event_count = rng.randrange(3, 30)
+            date_str = day.isoformat()
+
+            bast.append(BastRecordModel(
+                date=day, bast_id=f'BAST-{date_str}-{suffix}', waktu_pelaksanaan=waktu, shift=shift,
+                kelompok=str(kelompok), kel_berikut=str(kelompok % 6 + 1), events=bast_events(rng, day, event_count),
+                spv=operator, NIP=operator.NIP, event_indonesia=event_count, event_luar=rng.randrange(0, 5),
+                event_dirasakan=rng.randrange(0, 3), event_dikirim=rng.randrange(0, 2), member=member_json,
+                count_gaps=len(gaps), count_spikes=len(spikes), count_blanks=len(blanks), waktu_cs=jam_cs,
+                pulsa_poco=rng.randrange(0, 200) * 1000, notes=rng.choice(('', '', 'Listrik padam 10 menit')),
+            ))
+            qc.append(QcRecord(
+                date=day, qc_id=f'QC-{date_str}-{suffix}', shift=shift, kelompok=str(kelompok),
+                jam_pelaksanaan=datetime.time(slot * 6, 0), qc_prev=qc_events(rng, day, event_count // 2),
+                qc=qc_events(rng, day, event_count), operator=operator, NIP=operator.NIP,
+                event_indonesia=event_count, event_luar=rng.randrange(0, 5), kel_sebelum=str((kelompok - 2) % 6 + 1),
+            ))
+            qcfm.append(QcFmRecord(
+                date=day, qcfm_id=f'QCFM-{date_str}-{suffix}', shift=shift, kelompok=str(kelompok),
+                jam_pelaksanaan=datetime.time(slot * 6, 0), qcfm_prev=qcfm_events(rng, day, 2),
+                qcfm=qcfm_events(rng, day, rng.randrange(1, 5)), operator=operator, NIP=operator.NIP,
+                kel_sebelum=str((kelompok - 2) % 6 + 1),
+            ))
+            cs.append(CsRecordModel(
+                date=day, cs_id=f'CS-{date_str}-{suffix}', shift=shift, jam_pelaksanaan=jam_cs,
+                kelompok=kelompok, operator=operator, gaps='\n'.join(gaps), spikes='\n'.join(spikes),
+                blanks='\n'.join(blanks), slmon=rng.randrange(0, 20), count_gaps=len(gaps),
+                count_spikes=len(spikes), count_blanks=len(blanks),
+            ))
+        flush()
+        day += datetime.timedelta(days=1)
+    flush(force=True)
+
+    # bulk_create skips the signals that keep the lookup caches fresh
+    from core.cache import directory_cache
+    from cl_seiscomp.station_directory import station_directory
+    directory_cache.invalidate()
+    station_directory.invalidate()
+    return counts
+
+
+
+def build_derived_tables(batch_size=1000):
+    """
+    Fill what the record signals would have maintained: the CS station issues and
+    daily rollups and the search index. Returns the number of station issues.
+    """
+    from cl_seiscomp.models import CsRecordModel, StationIssue
+    from cl_seiscomp.stats import rebuild_daily_stats
+    from core.search import rebuild_search_index
+
+    issues = []
+    created = 0
+    for record in CsRecordModel.objects.only('pk', 'date', 'gaps', 'spikes', 'blanks').iterator(chunk_size=batch_size):
+        issues.extend(record.get_station_issues())
+        if len(issues) >= batch_size:
+            StationIssue.objects.bulk_create(issues, batch_size=batch_size)
+            created += len(issues)
+            issues = []
+    StationIssue.objects.bulk_create(issues, batch_size=batch_size)
+    rebuild_daily_stats()
+    rebuild_search_index()
+    return created + len(issues)
+
+def _upstream_events(rng, start, end, per_day):
+    """(origin time, event id) pairs between the `start` and `end` datetimes, newest first like upstream."""
+    seconds = int((end - start).total_seconds())
+    count = max(1, round(per_day * seconds / 86400))
+    times = sorted((start + datetime.timedelta(seconds=rng.randrange(seconds)) for _ in range(count)), reverse=True)
+    return [(ot, f"bmg{ot.strftime('%Y%m%d%H%M%S')}{i % 10}") for i, ot in enumerate(times)]
+
+
+def index3_text(start, end, per_day=40, seed=0):
+    """Synthetic index3.txt with about `per_day` events per day between `start` and `end`."""
+    rng = random.Random(seed)
+    lines = ['Gempabumi Terkini', '-' * 120, ' | '.join(INDEX3_COLUMNS), '-' * 120]
+    for ot, event_id in _upstream_events(rng, start, end, per_day):
+        lines.append(' | '.join((
+            event_id, ot.strftime('%Y-%m-%d %H:%M:%S'), f'{rng.uniform(-11, 6):.2f}', f'{rng.uniform(94, 141):.2f}',
+            str(rng.randrange(5, 600)), f'{rng.uniform(2.5, 6.8):.1f}', rng.choice(('M', 'MLv', 'mb', 'Mw')),
+            str(rng.randrange(8, 120)), f'{rng.uniform(0.3, 1.5):.2f}', str(rng.randrange(30, 300)),
+            rng.choice(REGIONS),
+        )))
+    return '\n'.join(lines)
+
+
+def qc_focal_text(start, end, per_day=4, seed=0):
+    """Synthetic qc_focal.txt with about `per_day` focal mechanisms per day between `start` and `end`."""
+    rng = random.Random(seed)
+    lines = [' | '.join(QC_FOCAL_COLUMNS)]
+    for ot, event_id in _upstream_events(rng, start, end, per_day):
+        planes = [str(rng.randrange(0, 360)) for _ in range(6)]
+        lines.append(' | '.join((
+            event_id, ot.strftime('%Y-%m-%d %H:%M:%S'), f'{rng.uniform(-11, 6):.2f}', f'{rng.uniform(94, 141):.2f}',
+            str(rng.randrange(5, 600)), f'{rng.uniform(4.0, 6.8):.1f}', 'Mw', *planes,
+            str(rng.randrange(40, 95)), str(rng.randrange(0, 40)), rng.choice(REGIONS),
+        )))
+    return '\n'.join(lines)
+
+
+def write_upstream_files(directory, start, end, seed=0):
+    """Write index3.txt and qc_focal.txt to `directory` and return their paths."""
+    import os
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name, text in (('index3.txt', index3_text(start, end, seed=seed)),
+                       ('qc_focal.txt', qc_focal_text(start, end, seed=seed))):
+        paths[name] = os.path.join(directory, name)
+        with open(paths[name], 'w', encoding='utf-8') as f:
+            f.write(text)
+    return paths
+
+
+def aftershock_times(count=2000, days=60, mainshock=None, c=0.05, p=1.1, seed=0):
+    """
+    `count` aftershock datetimes over `days` after `mainshock`, drawn from the
+    modified Omori law n(t) = K / (t + c)^p, sorted.
+    """
+    rng = random.Random(seed)
+    mainshock = mainshock or datetime.datetime(2024, 1, 1)
+    # Inverse of the normalised cumulative count over [0, days]
+    q = 1 - p
+    low, high = c ** q, (days + c) ** q
+    times = []
+    for _ in range(count):
+        t = (low + rng.random() * (high - low)) ** (1 / q) - c
+        times.append(mainshock + datetime.timedelta(days=t))
+    return sorted(times)
@@ -0,0 +1,53 @@
+"""
+Test runner that keeps the suite away from the files a deployment writes: the
+shared cache directory and the metrics store live in a scratch directory for
+the length of the run.
+
+ProcessCachesMixin empties the process-wide caches (core.cache, the station
+directory) before every test of the classes that use it. A TestCase rolls its
+rows back without sending signals, so a copy loaded in one test would
+otherwise show its rows to the next.
+"""
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.scratch_dir = tempfile.mkdtemp(prefix='ebast-tests-')
+        caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+        for alias, config in caches.items():
+            if config['BACKEND'].endswith('FileBasedCache'):
+                config['LOCATION'] = f'{self.scratch_dir}/cache-{alias}'
+        self.scratch_settings = override_settings(CACHES=caches, METRICS_DB=f'{self.scratch_dir}/metrics.sqlite3')
+        self.scratch_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        from .metrics import registry
+
+        # The test requests would otherwise reach the real store when the process exits
+        registry.clear()
+        self.scratch_settings.disable()
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
+
+
+class ProcessCachesMixin:
+    """TestCase mixin that starts every test with empty process-wide caches."""
+
+    def setUp(self):
+        super().setUp()
+        reset_process_caches()
+
+
+def reset_process_caches():
+    from cl_seiscomp.station_directory import station_directory
+    from .cache import directory_cache
+
+    directory_cache.clear_local()
+    station_directory.clear_local()
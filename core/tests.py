@@ -1,13 +1,17 @@
-from django.test import TestCase
+from django.test import LiveServerTestCase, TestCase, override_settings
 from django.urls import reverse
 from .models import Operator, Kelompok
+from .querycount import QueryBudgetMixin, QUERY_BUDGETS
+from .test_runner import ProcessCachesMixin
 
-class KelompokUpdateViewTests(TestCase):
+class KelompokUpdateViewTests(ProcessCachesMixin, TestCase):
     def setUp(self):
         """Set up test data"""
+        super().setUp()
         self.operator1 = Operator.objects.create(name="Test Operator 1", NIP="1234567890123456")
         self.operator2 = Operator.objects.create(name="Test Operator 2", NIP="2345678901234567")
-        self.kelompok = Kelompok.objects.create(name=1, member=f"{self.operator1.pk},{self.operator2.pk}")
+        self.kelompok = Kelompok.objects.create(name=1)
+        self.kelompok.set_members([self.operator1.pk, self.operator2.pk])
 
     def test_update_view_passes_existing_members(self):
         """Test that the update view passes existing_members to the template context"""
@@ -24,9 +28,12 @@ class KelompokUpdateViewTests(TestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, 'existingMemberIds')
-        self.assertContains(response, f"'{self.operator1.pk}'")
-        self.assertContains(response, f"'{self.operator2.pk}'")
+        self.assertContains(
+            response,
+            f'<script id="existing-members-data" type="application/json">'
+            f'["{self.operator1.pk}", "{self.operator2.pk}"]</script>',
+            html=False,
+        )
 
     def test_create_view_has_empty_existing_members(self):
         """Test that the create view has empty existing_members"""
@@ -34,4 +41,684 @@ class KelompokUpdateViewTests(TestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, 'existingMemberIds = []')
+        # kelompok_form.js falls back to no members when the data element is missing
+        self.assertNotContains(response, 'existing-members-data')
+
+    def test_update_view_saves_member_order(self):
+        """Test that posted member ids are stored in the given order"""
+        url = reverse('core:kelompok_update', kwargs={'pk': self.kelompok.pk})
+        response = self.client.post(url, {'name': 1, 'member': f"{self.operator2.pk},{self.operator1.pk}"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.kelompok.member_ids(), [self.operator2.pk, self.operator1.pk])
+
+    def test_member_api_is_served_from_cache(self):
+        """Test that the BAST member lookup returns names in group order and is cached until the group changes"""
+        url = reverse('bast:get_member_data', kwargs={'kelompok': 1})
+        self.assertEqual(self.client.get(url).json(), {'member_data': ["Test Operator 1", "Test Operator 2"]})
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json(), {'member_data': ["Test Operator 1", "Test Operator 2"]})
+
+        self.kelompok.set_members([self.operator2.pk, self.operator1.pk])
+        self.assertEqual(self.client.get(url).json(), {'member_data': ["Test Operator 2", "Test Operator 1"]})
+        self.assertEqual(self.client.get(reverse('bast:get_member_data', kwargs={'kelompok': 5})).status_code, 404)
+
+    def test_backfill_moves_legacy_member_ids(self):
+        """Test that the backfill command converts the comma-separated member field"""
+        from django.core.management import call_command
+        import io
+
+        legacy = Kelompok.objects.create(name=2, member=f"{self.operator2.pk}, {self.operator1.pk},9999")
+        call_command('backfill_kelompok_members', stdout=io.StringIO())
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.member_ids(), [self.operator2.pk, self.operator1.pk])
+        self.assertEqual(legacy.member, '')
+
+
+class SearchApiTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        from bast.models import BastRecordModel
+        from cl_seiscomp.models import CsRecordModel, StationListModel
+
+        self.operator = Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+        StationListModel.objects.create(network='IA', code='XYZ', province='P', location='L', digitizer_type='T', UPT='U')
+        self.bast = BastRecordModel.objects.create(
+            bast_id='bast-2025-05-01-2P', spv=self.operator,
+            events='No,Date,Region\n1,2025-05-01,M6 Banda Sea', notes='')
+        self.cs = CsRecordModel.objects.create(cs_id='cs-2025-05-01-2P', operator=self.operator, blanks='xyz')
+
+    def test_search_finds_bast_event(self):
+        response = self.client.get(reverse('core:search_api'), {'q': 'banda sea'})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([(r['source'], r['record_id'], r['field']) for r in results],
+                         [('bast', 'bast-2025-05-01-2P', 'events')])
+
+    def test_search_field_filter_and_index_sync(self):
+        url = reverse('core:search_api')
+        response = self.client.get(url, {'q': 'XYZ', 'field': 'blanks'})
+        self.assertEqual([r['record_id'] for r in response.json()['results']], ['cs-2025-05-01-2P'])
+
+        # Removed from the index when the delete commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cs.delete()
+        response = self.client.get(url, {'q': 'XYZ', 'field': 'blanks'})
+        self.assertEqual(response.json()['results'], [])
+
+    def test_cascade_removes_every_source_at_once(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .search import SEARCH_TABLE, search_records
+
+        self.assertEqual(len(search_records('banda')) + len(search_records('xyz')), 2)
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            self.operator.delete()
+        self.assertEqual(search_records('banda') + search_records('xyz'), [])
+        # One DELETE for both sources, and the table is only created once per connection
+        statements = [query['sql'] for query in queries.captured_queries if SEARCH_TABLE in query['sql']]
+        self.assertEqual(len(statements), 1, statements)
+
+    def test_search_requires_query(self):
+        response = self.client.get(reverse('core:search_api'))
+        self.assertEqual(response.status_code, 400)
+
+
+class OperatorBulkCreateViewTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('core:operator_bulk_create')
+        self.roster = (
+            'name,nip\n'
+            '"ADE ANDIKA SAPUTRA, S.Tr.Geof",199607082016011001\n'
+            '"AGUNG MULYO UTOMO, S.Si",198007172006041007\n'
+            '"AKMAL FIRMANSYAH, S.Tr.Geof.",\n'
+        )
+
+    def test_reimport_does_not_duplicate(self):
+        response = self.client.post(self.url, {'csv_data': self.roster}, follow=True)
+        self.assertContains(response, '3 operators added')
+        self.assertEqual(Operator.objects.count(), 3)
+        self.assertFalse(Operator.objects.filter(name='name').exists())
+
+        self.client.post(self.url, {'csv_data': self.roster.replace('S.Si', 'S.Si, M.Sc')})
+        self.assertEqual(Operator.objects.count(), 3)
+        self.assertEqual(Operator.objects.get(NIP='198007172006041007').name, 'AGUNG MULYO UTOMO, S.Si, M.Sc')
+
+    def test_import_reports_created_and_updated(self):
+        from .operator_import import import_operators
+
+        Operator.objects.create(name='Old Name', NIP='199607082016011001')
+        with self.assertNumQueries(6):
+            # savepoint, SELECT by NIP, SELECT by name, INSERT, UPDATE, release;
+            # the directory cache version bump goes to the cache files
+            report = import_operators(self.roster.splitlines())
+        self.assertEqual(report.summary(), {'created': 2, 'updated': 1, 'unchanged': 0, 'errors': 0})
+
+        report = import_operators(['"Someone",12AB', '"ADE ANDIKA SAPUTRA, S.Tr.Geof",199607082016011001',
+                                   '"ADE ANDIKA SAPUTRA, S.Tr.Geof",199607082016011001'])
+        self.assertEqual(report.summary(), {'created': 0, 'updated': 0, 'unchanged': 1, 'errors': 2})
+
+    def test_rejects_non_csv_upload(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile('roster.txt', b'"A",1', content_type='text/plain')
+        self.assertEqual(self.client.post(self.url, {'file': upload}).status_code, 400)
+
+
+class IdMigrationTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        from bast.models import BastRecordModel
+        from cl_seiscomp.models import CsRecordModel, StationListModel
+
+        self.operator = Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+        station = StationListModel.objects.create(network='IA', code='XYZ', province='P', location='L', digitizer_type='T', UPT='U')
+        self.bast = BastRecordModel.objects.create(bast_id='BAST-2025-05-01-P', spv=self.operator,
+                                                   events='No,Region\n1,Banda Sea')
+        BastRecordModel.objects.create(bast_id='BAST-2025-05-01-2S', spv=self.operator)
+        # Both formats of the same id exist, the old one can't be renamed
+        BastRecordModel.objects.create(bast_id='BAST-2025-05-02-M', spv=self.operator)
+        BastRecordModel.objects.create(bast_id='BAST-2025-05-02-4M', spv=self.operator)
+        self.cs = CsRecordModel.objects.create(cs_id='CS-2025-05-01-P', operator=self.operator, gaps='XYZ')
+        # Once the station is gone a save() would drop XYZ from the gaps again
+        station.delete()
+
+    def test_command_renames_without_save(self):
+        import io
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command('update_bast_id_format', '--dry-run', stdout=out)
+        self.assertIn('Dry run: 2 records would be updated', out.getvalue())
+        self.bast.refresh_from_db()
+        self.assertEqual(self.bast.bast_id, 'BAST-2025-05-01-P')
+
+        out = io.StringIO()
+        call_command('update_bast_id_format', '--batch-size', '2', stdout=out)
+        self.assertIn('Could not rename bast_id BAST-2025-05-02-M', out.getvalue())
+        self.bast.refresh_from_db()
+        self.cs.refresh_from_db()
+        self.assertEqual(self.bast.bast_id, 'BAST-2025-05-01-2P')
+        self.assertEqual((self.cs.cs_id, self.cs.gaps), ('CS-2025-05-01-2P', 'XYZ'))
+
+        response = self.client.get(reverse('core:search_api'), {'q': 'banda'})
+        self.assertEqual([r['record_id'] for r in response.json()['results']], ['BAST-2025-05-01-2P'])
+
+
+class SqliteTuningTests(TestCase):
+    def test_pragmas_applied_to_file_connections(self):
+        import os
+        import tempfile
+        from django.db import connections
+
+        connection = connections['default']
+        with tempfile.TemporaryDirectory() as tmp:
+            wrapper = type(connection)(dict(connection.settings_dict, NAME=os.path.join(tmp, 'db.sqlite3')), 'stress')
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                    cursor.execute('PRAGMA busy_timeout')
+                    self.assertEqual(cursor.fetchone()[0], 5000)
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            finally:
+                wrapper.close()
+
+    def test_tuning_removes_the_lock_errors_of_the_defaults(self):
+        import tempfile
+        from django.conf import settings
+        from .db import sqlite_pragmas
+        from .sqlite_stress import compare
+
+        with tempfile.TemporaryDirectory() as tmp:
+            results = compare(tmp, sqlite_pragmas(), settings.DATABASES['default']['OPTIONS']['transaction_mode'],
+                              writers=3, readers=2, duration=1.5, rows=2000)
+        # Deferred transactions that read before they write deadlock on the lock upgrade
+        self.assertGreater(results['baseline']['errors'], 0)
+        self.assertEqual(results['tuned']['errors'], 0)
+        self.assertGreater(results['tuned']['commits'], 0)
+        self.assertGreater(results['tuned']['reads'], 0)
+
+
+class DirectoryCacheTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        from .cache import directory_cache
+
+        self.cache = directory_cache
+        self.cache.invalidate()
+        self.operator = Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+
+    def test_operator_list_is_read_through_and_invalidated_on_save(self):
+        from .cache import operator_list
+
+        before = self.cache.stats()
+        self.assertEqual(operator_list(), [{'pk': self.operator.pk, 'name': 'Test Operator'}])
+        with self.assertNumQueries(0):
+            operator_list()
+        after = self.cache.stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['local_hits'] - before['local_hits'], 1)
+        self.assertGreater(after['hit_rate'], 0)
+
+        Operator.objects.create(name="Second Operator", NIP="2345678901234567")
+        self.assertEqual([operator['name'] for operator in operator_list()], ['Test Operator', 'Second Operator'])
+
+    def test_shared_layer_serves_other_workers(self):
+        from .cache import operator_nip
+
+        self.assertEqual(operator_nip(self.operator.pk), '1234567890123456')
+        # A worker with an empty LRU reads the version and the value from the cache files, no queries at all
+        self.cache.clear_local()
+        shared_hits = self.cache.stats()['shared_hits']
+        with self.assertNumQueries(0):
+            self.assertEqual(operator_nip(self.operator.pk), '1234567890123456')
+        self.assertEqual(self.cache.stats()['shared_hits'], shared_hits + 1)
+
+        # An invalidation in another worker orphans the shared entries
+        self.cache.clear_local()
+        Operator.objects.filter(pk=self.operator.pk).update(NIP='999')
+        self.cache.invalidate()
+        self.assertEqual(operator_nip(self.operator.pk), '999')
+
+    def test_get_nip_is_shared_by_all_forms(self):
+        for namespace in ('bast', 'qc', 'qcfm'):
+            url = reverse(f'{namespace}:get_nip', kwargs={'operator_id': self.operator.pk})
+            self.assertEqual(self.client.get(url).json(), {'nip': '1234567890123456'})
+        missing = reverse('qc:get_nip', kwargs={'operator_id': self.operator.pk + 100})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_operator_choices_skip_the_operator_table(self):
+        from qc.forms import QcRecordForm
+
+        QcRecordForm()
+        with self.assertNumQueries(0):
+            choices = list(QcRecordForm().fields['operator'].choices)
+        self.assertEqual(choices, [('', '---------'), (self.operator.pk, 'Test Operator')])
+
+
+class StartupBenchmarkTests(TestCase):
+    def test_parse_importtime(self):
+        from .startup import parse_importtime
+
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        100 | _io\n'
+            'import time:        50 |         50 |   json.decoder\n'
+            'import time:       200 |        250 | json\n'
+        )
+        self.assertEqual(parse_importtime(output), (350, [('_io', 100), ('json', 250)]))
+
+    def test_worker_boot_stays_light(self):
+        from .startup import measure_startup
+
+        # Timings vary with the machine, startup_benchmark reports them against the budgets
+        result = measure_startup()
+        self.assertEqual(result['heavy_modules'], [], f'Heavy libraries imported at boot: {result}')
+        self.assertGreater(result['import_ms'], 0)
+
+
+class StaticFilesTests(TestCase):
+    def test_plain_names_without_manifest(self):
+        from django.templatetags.static import static
+
+        self.assertEqual(static('core/js/base.js'), '/static/core/js/base.js')
+
+    def test_pages_load_no_cdn_assets(self):
+        response = self.client.get(reverse('core:operator_list'))
+        self.assertContains(response, '/static/core/vendor/bootstrap-5.3.8/js/bootstrap.bundle.min.js')
+        for host in ('cdn.jsdelivr.net', 'cdnjs.cloudflare.com', 'unpkg.com', 'npmcdn.com', 'cdn.plot.ly'):
+            self.assertNotContains(response, host)
+
+    def test_middleware_serves_files_asynchronously(self):
+        import os
+        import tempfile
+        from asgiref.sync import async_to_sync, iscoroutinefunction
+        from django.test import override_settings
+        from .middleware import StaticFilesMiddleware
+
+        async def get_response(request):
+            return None
+
+        async def consume(response):
+            return b''.join([chunk async for chunk in response])
+
+        self.assertTrue(iscoroutinefunction(StaticFilesMiddleware(get_response)))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'core'))
+            with open(os.path.join(tmp, 'core', 'app.js'), 'w') as f:
+                f.write('console.log("ok");\n' * 5000)
+            with override_settings(STATIC_ROOT=tmp):
+                response = async_to_sync(self.async_client.get)('/static/core/app.js')
+                body = async_to_sync(consume)(response)
+                head = async_to_sync(self.async_client.head)('/static/core/app.js')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, b'console.log("ok");\n' * 5000)
+        self.assertEqual(head.status_code, 200)
+
+    def test_whitenoise_internals_are_unchanged(self):
+        # StaticFilesMiddleware relies on these, a whitenoise upgrade that changes them must fail here
+        import inspect
+        from django.http import FileResponse
+        from whitenoise.middleware import WhiteNoiseFileResponse, WhiteNoiseMiddleware
+
+        middleware = WhiteNoiseMiddleware(lambda request: None)
+        self.assertIsInstance(middleware.files, dict)
+        self.assertIsInstance(middleware.autorefresh, bool)
+        self.assertEqual(list(inspect.signature(middleware.find_file).parameters), ['url'])
+        self.assertEqual(list(inspect.signature(middleware.serve).parameters), ['static_file', 'request'])
+        self.assertTrue(issubclass(WhiteNoiseFileResponse, FileResponse))
+
+
+class MetricsTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        import tempfile
+        from django.test import override_settings
+        from .metrics import registry
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db = f'{tmp.name}/metrics.sqlite3'
+        settings_override = override_settings(METRICS_DB=self.db)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.registry = registry
+        self.registry.clear()
+
+    def test_requests_recorded_per_view(self):
+        import re
+
+        Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+        self.client.get(reverse('core:operator_list'))
+        self.client.get(reverse('core:operator_list'))
+        self.client.get('/no-such-page/')
+
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('# TYPE ebast_http_request_duration_seconds histogram', body)
+        self.assertIn('ebast_http_requests_total{view="core:operator_list",method="GET",status="200"} 2', body)
+        self.assertIn('ebast_http_requests_total{view="<unresolved>",method="GET",status="404"} 1', body)
+        self.assertIn('ebast_http_request_duration_seconds_bucket{view="core:operator_list",le="+Inf"} 2', body)
+        self.assertIn('ebast_http_request_duration_seconds_count{view="core:operator_list"} 2', body)
+        self.assertIn('ebast_http_response_size_bytes_count{view="core:operator_list"} 2', body)
+        queries = re.search(r'^ebast_db_queries_total\{view="core:operator_list"\} (\d+)$', body, re.M)
+        self.assertGreater(int(queries.group(1)), 0)
+
+    def test_workers_add_up_in_shared_store(self):
+        import re
+        from .metrics import MetricsRegistry, read_store, render
+
+        workers = [MetricsRegistry(), MetricsRegistry()]
+        for worker, duration in zip(workers, (0.02, 3.0)):
+            worker.observe_request('bast:export_to_pdf', 'GET', 200, duration, 5000, 4, 0.01)
+            worker.flush(self.db)
+
+        body = render(read_store(self.db))
+        self.assertIn('ebast_http_requests_total{view="bast:export_to_pdf",method="GET",status="200"} 2', body)
+        self.assertIn('ebast_http_request_duration_seconds_bucket{view="bast:export_to_pdf",le="0.025"} 1', body)
+        self.assertIn('ebast_http_request_duration_seconds_bucket{view="bast:export_to_pdf",le="5"} 2', body)
+        self.assertIn('ebast_db_queries_total{view="bast:export_to_pdf"} 8', body)
+        buckets = re.findall(r'^ebast_http_request_duration_seconds_bucket\{view="bast:export_to_pdf",le="([^"]+)"\}',
+                             body, re.M)
+        self.assertEqual(buckets[-1], '+Inf')
+        self.assertEqual([float(b) for b in buckets[:-1]], sorted(float(b) for b in buckets[:-1]))
+
+    def test_metrics_restricted_to_allowed_addresses_and_staff(self):
+        from django.contrib.auth.models import User
+
+        url = reverse('metrics')
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.9']):
+            self.assertEqual(self.client.get(url).status_code, 403)
+            self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.9').status_code, 200)
+            # Behind Nginx on the unix socket the address comes from X-Real-IP
+            self.assertEqual(self.client.get(url, REMOTE_ADDR='', HTTP_X_REAL_IP='10.0.0.9').status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_X_REAL_IP='10.0.0.9').status_code, 403)
+
+            self.client.force_login(User.objects.create_user('admin', is_staff=True))
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_queries_counted_under_asgi(self):
+        import re
+        from asgiref.sync import async_to_sync
+
+        Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+        async_to_sync(self.async_client.get)(reverse('core:operator_list'))
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('ebast_http_requests_total{view="core:operator_list",method="GET",status="200"} 1', body)
+        # The view runs in a worker thread, its queries still count for the request
+        queries = re.search(r'^ebast_db_queries_total\{view="core:operator_list"\} (\d+)$', body, re.M)
+        self.assertGreater(int(queries.group(1)), 0)
+
+
+class QueryBudgetTests(QueryBudgetMixin, ProcessCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from bast.models import BastRecordModel
+        from cl_seiscomp.models import CsRecordModel, StationListModel
+        from qc.models import QcRecord, ErrorStation
+        from qcfm.models import QcFmRecord
+        from .synthetic import seed_records
+
+        # Enough rows per list that a lookup per row would blow any budget
+        seed_records(years=0.05, operators=12, stations=30)
+        for code in ('AAI', 'BBJI', 'CISI'):
+            ErrorStation.objects.create(kode_stasiun=code, lokasi=f'Lokasi {code}', deskripsi_error='Gaps')
+        cls.operator = Operator.objects.order_by('pk').last()
+        cls.kelompok = Kelompok.objects.order_by('pk').first()
+        cls.bast = BastRecordModel.objects.order_by('pk').first()
+        cls.qc = QcRecord.objects.order_by('pk').first()
+        cls.qcfm = QcFmRecord.objects.order_by('pk').first()
+        cls.cs = CsRecordModel.objects.order_by('pk').first()
+        cls.station = StationListModel.objects.order_by('pk').first()
+        cls.error_station = ErrorStation.objects.order_by('pk').first()
+
+    def view_requests(self):
+        """(view name, method, URL kwargs, data) for every budgeted view."""
+        import json
+
+        window = {'start_datetime': '2025-03-12 00:00:00', 'end_datetime': '2025-03-13 00:00:00'}
+        requests = [
+            ('home', 'get', {}, None),
+            ('core:core', 'get', {}, None),
+            ('core:operator_list', 'get', {}, None),
+            ('core:operator_create', 'get', {}, None),
+            ('core:operator_update', 'get', {'pk': self.operator.pk}, None),
+            ('core:operator_bulk_create', 'get', {}, None),
+            ('core:kelompok_list', 'get', {}, None),
+            ('core:kelompok_create', 'get', {}, None),
+            ('core:kelompok_update', 'get', {'pk': self.kelompok.pk}, None),
+            ('core:get_operator_list', 'get', {}, None),
+            ('core:search_api', 'get', {}, {'q': 'Banda'}),
+            ('qc:save_nip', 'post', {}, json.dumps({'operator_id': self.operator.pk, 'nip': '1987'})),
+        ]
+        for namespace, record, prefix in (('bast', self.bast, 'bastrecord'), ('qc', self.qc, 'qcrecord'),
+                                          ('qcfm', self.qcfm, 'qcfmrecord')):
+            all_records = 'bast_all_records' if namespace == 'bast' else f'{namespace}_all_records'
+            requests += [
+                (f'{namespace}:{prefix}_list', 'get', {}, None),
+                (f'{namespace}:{all_records}', 'get', {}, None),
+                (f'{namespace}:{prefix}_create', 'get', {}, None),
+                (f'{namespace}:{prefix}_update', 'get', {'pk': record.pk}, None),
+                (f'{namespace}:{prefix}_list_api', 'get', {'counts': 20}, None),
+                (f'{namespace}:fetch_data', 'get', window, None),
+                (f'{namespace}:get_nip', 'get', {'operator_id': self.operator.pk}, None),
+                (f'{namespace}:export_to_excel', 'get', {'record_id': record.pk}, None),
+                # Converting to PDF needs LibreOffice; the missing record stops before it
+                (f'{namespace}:export_to_pdf', 'get', {'record_id': 0}, None),
+            ]
+        requests += [
+            ('bast:get_member_data', 'get', {'kelompok': self.kelompok.name}, None),
+            ('bast:get_cs_data', 'get', {'cs_id': self.cs.cs_id}, None),
+            ('bast:form_bootstrap', 'get', {}, None),
+            ('bast:get_previous_members', 'get', {}, None),
+            ('bast:get_previous_poco_exp', 'get', {}, None),
+            ('bast:get_previous_samsung_exp', 'get', {}, None),
+            ('bast:get_previous_pulsa_poco', 'get', {}, None),
+            ('bast:export_bast_csv', 'get', {}, None),
+            ('qc:errorstation_list', 'get', {}, None),
+            ('qc:errorstation_add', 'get', {}, None),
+            ('qc:errorstation_edit', 'get', {'pk': self.error_station.pk}, None),
+            ('qc:errorstation_delete', 'get', {'pk': self.error_station.pk}, None),
+            ('qc:export_qc_csv', 'get', {}, None),
+            ('qcfm:export_qcfm_csv', 'get', {}, None),
+            ('cl_seiscomp:cs_list', 'get', {}, None),
+            ('cl_seiscomp:cs_all_records', 'get', {}, None),
+            ('cl_seiscomp:station_list', 'get', {}, None),
+            ('cl_seiscomp:sl_create', 'get', {}, None),
+            ('cl_seiscomp:sl_update', 'get', {'pk': self.station.pk}, None),
+            ('cl_seiscomp:sl_bulk_create', 'get', {}, None),
+            ('cl_seiscomp:cs_create', 'get', {}, None),
+            ('cl_seiscomp:cs_update', 'get', {'pk': self.cs.pk}, None),
+            ('cl_seiscomp:csrecord_list_api', 'get', {'counts': 20}, None),
+            ('cl_seiscomp:export_to_excel', 'get', {'record_id': self.cs.pk}, None),
+            ('cl_seiscomp:export_to_pdf', 'get', {'record_id': 0}, None),
+            ('cl_seiscomp:export_cs_to_csv', 'get', {}, None),
+            ('cl_seiscomp:fetch_gaps_blanks', 'get', {}, None),
+            ('cl_seiscomp:stats', 'get', {}, None),
+            ('cl_seiscomp:stats_timeseries_api', 'get', {}, None),
+        ]
+        # Deletes last, they cascade to the records above
+        requests += [
+            ('bast:bastrecord_delete_direct', 'post', {'pk': self.bast.pk}, None),
+            ('qc:qcrecord_delete_direct', 'post', {'pk': self.qc.pk}, None),
+            ('qcfm:qcfmrecord_delete_direct', 'post', {'pk': self.qcfm.pk}, None),
+            ('cl_seiscomp:cs_delete', 'post', {'pk': self.cs.pk}, None),
+            ('cl_seiscomp:sl_delete', 'post', {'pk': self.station.pk}, None),
+            ('core:kelompok_delete_direct', 'post', {'pk': self.kelompok.pk}, None),
+            ('core:operator_delete_direct', 'post', {'pk': self.operator.pk}, None),
+        ]
+        return requests
+
+    def test_every_view_has_a_budget(self):
+        from django.urls import get_resolver
+        from .querycount import QUERY_BUDGETS, BUDGETED_NAMESPACES
+
+        resolver = get_resolver()
+        names = {'home'}
+        for namespace in BUDGETED_NAMESPACES:
+            _, sub_resolver = resolver.namespace_dict[namespace]
+            names |= {f'{namespace}:{name}' for name in sub_resolver.reverse_dict if isinstance(name, str)}
+        self.assertEqual(sorted(names - set(QUERY_BUDGETS)), [], 'Views without a query budget')
+        self.assertEqual(sorted(set(QUERY_BUDGETS) - names), [], 'Budgets of views that no longer exist')
+        self.assertEqual(sorted(name for name, *_ in self.view_requests()), sorted(QUERY_BUDGETS))
+
+    @override_settings(UPSTREAM_BASE_URL='http://127.0.0.1:9', UPSTREAM_CONNECT_TIMEOUT=1)
+    def test_views_stay_within_query_budgets(self):
+        import logging
+        from django.core.cache import caches
+        from cl_seiscomp.station_directory import station_directory
+        from .cache import directory_cache
+
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        for view_name, method, kwargs, data in self.view_requests():
+            # Cold caches, so every view is measured the same way whatever ran before it
+            directory_cache.clear_local()
+            caches['default'].clear()
+            station_directory.invalidate()
+            with self.subTest(view=view_name):
+                url = reverse(view_name, kwargs=kwargs)
+                # The work deferred to commit counts for the request that caused it
+                with self.assertQueryBudget(view_name), self.captureOnCommitCallbacks(execute=True):
+                    if method == 'post':
+                        response = self.client.post(url, data, content_type='application/json')
+                    else:
+                        response = self.client.get(url, data)
+                if 'fetch_data' in view_name:
+                    self.assertEqual(response.status_code, 502)
+                else:
+                    self.assertLess(response.status_code, 500)
+
+
+class QueryProfilerTests(ProcessCachesMixin, TestCase):
+    def test_query_shape_collapses_literals(self):
+        from .querycount import query_shape
+
+        self.assertEqual(
+            query_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            query_shape("SELECT * FROM t WHERE id IN (%s) AND name = 'y' LIMIT 1"),
+        )
+
+    def test_recorder_flags_lookups_in_a_loop(self):
+        from .querycount import QueryRecorder
+
+        operators = [Operator.objects.create(name=f"Operator {i}", NIP=str(i)) for i in range(3)]
+        with QueryRecorder() as recorder:
+            for operator in operators:
+                Operator.objects.get(pk=operator.pk)
+            list(Operator.objects.all())
+        self.assertEqual(len(recorder), 4)
+        self.assertEqual(list(recorder.repeated_shapes().values()), [3])
+        self.assertIn('Repeated query shapes:', recorder.report())
+
+    @override_settings(QUERY_PROFILING=True)
+    def test_middleware_reports_query_count(self):
+        Operator.objects.create(name="Test Operator", NIP="1234567890123456")
+        response = self.client.get(reverse('core:operator_list'))
+        self.assertEqual(response['X-Query-Count'], str(QUERY_BUDGETS['core:operator_list']))
+
+    def test_middleware_off_by_default_in_tests(self):
+        response = self.client.get(reverse('core:operator_list'))
+        self.assertFalse(response.has_header('X-Query-Count'))
+
+
+class SyntheticDataTests(ProcessCachesMixin, TestCase):
+    def test_seed_synthetic_fills_an_empty_database(self):
+        import io
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from bast.views import clean_index3
+        from cl_seiscomp.models import CsDailySlotStat, CsRecordModel
+        from qcfm.views import clean_fm_data
+
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command('seed_synthetic', '--years', '0.02', '--operators', '6', '--stations', '30',
+                         '--end-date', '2025-03-12', '--upstream-dir', tmp, stdout=io.StringIO())
+            with open(os.path.join(tmp, 'index3.txt'), 'rb') as f:
+                events = clean_index3(f.read(), '2025-03-12 00:00:00', '2025-03-12 23:59:59')
+            with open(os.path.join(tmp, 'qc_focal.txt'), 'rb') as f:
+                mechanisms = clean_fm_data(f.read(), '2025-03-01 00:00:00', '2025-03-13 00:00:00')
+
+        self.assertEqual(CsRecordModel.objects.count(), 7 * 4)
+        self.assertEqual(CsDailySlotStat.objects.count(), 7 * 4)
+        self.assertGreater(len(events), 10)
+        self.assertGreater(len(mechanisms), 10)
+        with self.assertRaises(CommandError):
+            call_command('seed_synthetic', '--years', '0.02', stdout=io.StringIO())
+
+
+class BenchmarkTests(TestCase):
+    def test_suite_runs_against_synthetic_data(self):
+        from .benchmarks import collect_benchmarks, compare, run_benchmarks
+        from .synthetic import build_derived_tables, seed_records
+
+        seed_records(years=0.02, operators=6, stations=30)
+        build_derived_tables()
+        results = run_benchmarks(collect_benchmarks(), repeat=1,
+                                 names=['clean', 'list_api (20)', 'decay', 'linregress'])
+        self.assertEqual(len(results), 14)
+        for name, timings in results.items():
+            self.assertGreater(timings.get('median_ms', 0), 0, f'{name}: {timings}')
+        self.assertEqual([row[3] for row in compare(results, results)], [1.0] * 14)
+
+
+
+class LoadTestTests(TestCase):
+    def test_percentile_interpolates_between_ranks(self):
+        from .loadtest import percentile
+
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50.5)
+        self.assertAlmostEqual(percentile(values, 99), 99.01)
+        self.assertEqual(percentile([3], 95), 3)
+        self.assertIsNone(percentile([], 50))
+
+    def test_stand_in_serves_upstream_files_and_injects_failures(self):
+        import httpx
+        from .loadtest import UpstreamStandIn
+
+        with UpstreamStandIn() as stand_in:
+            self.assertIn(b'Gempabumi Terkini', httpx.get(f'{stand_in.url}/index3.txt').content)
+            # One minute at 20 Hz is 1200 samples, 112 per 512 byte record
+            response = httpx.get(f'{stand_in.url}/fdsnws/dataselect/1/query', params={
+                'net': 'IA', 'sta': 'AAI', 'loc': '--', 'cha': 'BHZ',
+                'starttime': '2025-03-12T00:00:00', 'endtime': '2025-03-12T00:01:00',
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.content), 11 * 512)
+            self.assertEqual(response.content[8:13], b'AAI  ')
+
+        with UpstreamStandIn(failure_rate=1) as stand_in:
+            self.assertEqual(httpx.get(f'{stand_in.url}/qc_focal.txt').status_code, 503)
+            self.assertEqual(stand_in.stats()['failed'], {'/qc_focal.txt': 1})
+
+
+class LoadTestFlowTests(LiveServerTestCase):
+    def test_operator_flows_save_and_export_records(self):
+        from bast.models import BastRecordModel
+        from qc.models import QcRecord
+        from qcfm.models import QcFmRecord
+        from .loadtest import FLOWS, UpstreamStandIn, VirtualOperator, summarize
+        from .synthetic import seed_records
+
+        seed_records(years=0.02, operators=6, stations=30)
+        operators = list(Operator.objects.values('pk', 'name'))
+        with UpstreamStandIn() as stand_in, override_settings(UPSTREAM_BASE_URL=stand_in.url):
+            user = VirtualOperator(0, 1, self.live_server_url, operators, export='excel')
+            for app in FLOWS:
+                self.assertTrue(user.flow(app), [sample for sample in user.samples if not sample[2]])
+                user.iteration += 1
+
+        self.assertTrue(BastRecordModel.objects.filter(bast_id__startswith='BAST-2100-01-01').exists())
+        self.assertTrue(QcRecord.objects.filter(qc_id__startswith='QC-2100-01-02').exists())
+        self.assertTrue(QcFmRecord.objects.filter(qcfm_id__startswith='QCFM-2100-01-03').exists())
+        report = summarize([user], 1.0)
+        self.assertEqual(report['requests']['error_rate'], 0)
+        self.assertIn('qcfm export excel', report['by_request'])
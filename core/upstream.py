@@ -0,0 +1,89 @@
+"""
+Async access to the upstream event lists (index3.txt and qc_focal.txt).
+
+The fetch_data views of bast, qc and qcfm are async, so waiting on a slow
+upstream parks a coroutine instead of a whole worker. Under the uvicorn worker
+profile (deployment/ebast-asgi.service.txt) each process serves many fetches at
+once; under the sync gunicorn workers the views keep working, Django runs each
+one in its own event loop.
+
+Requests are bounded by UPSTREAM_TIMEOUT. Parsing the text with pandas is CPU
+bound and runs in a worker thread so it doesn't stall the event loop. httpx is
+imported on first use, like pandas, to keep it out of worker boot.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_BASE_URL = 'http://202.90.198.41'
+# Seconds for the whole request and for opening the connection
+UPSTREAM_TIMEOUT = 10
+UPSTREAM_CONNECT_TIMEOUT = 5
+
+
+class UpstreamError(Exception):
+    def __init__(self, message, status=502):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def upstream_url(name):
+    base_url = getattr(settings, 'UPSTREAM_BASE_URL', UPSTREAM_BASE_URL)
+    return f"{base_url.rstrip('/')}/{name}"
+
+
+def upstream_timeout():
+    import httpx
+
+    return httpx.Timeout(
+        getattr(settings, 'UPSTREAM_TIMEOUT', UPSTREAM_TIMEOUT),
+        connect=getattr(settings, 'UPSTREAM_CONNECT_TIMEOUT', UPSTREAM_CONNECT_TIMEOUT),
+    )
+
+
+async def fetch_upstream(name):
+    """Return the body of the upstream file `name`, raising UpstreamError on timeouts and bad responses."""
+    import httpx
+
+    url = upstream_url(name)
+    try:
+        async with httpx.AsyncClient(timeout=upstream_timeout()) as client:
+            response = await client.get(url)
+    except httpx.TimeoutException:
+        logger.warning('Timed out fetching %s', url)
+        raise UpstreamError('Upstream timed out', status=504)
+    except httpx.HTTPError as e:
+        logger.warning('Fetching %s failed: %s', url, e)
+        raise UpstreamError('Failed to fetch data')
+
+    if response.status_code != 200:
+        logger.warning('Fetching %s returned HTTP %s', url, response.status_code)
+        raise UpstreamError('Failed to fetch data')
+    return response.content
+
+
+async def fetch_table(name, parse, start_datetime, end_datetime, numbered=False):
+    """
+    Fetch upstream file `name`, cut it to the time window with `parse` and return
+    the {'csv', 'table_data'} JsonResponse the record forms expect. With `numbered`,
+    table rows get a leading 'No' column (the CSV doesn't).
+    """
+    try:
+        content = await fetch_upstream(name)
+    except UpstreamError as e:
+        return JsonResponse({'error': e.message}, status=e.status)
+
+    def build_payload():
+        data = parse(content, start_datetime, end_datetime)
+        csv_data = data.to_csv(index=False)
+        if numbered:
+            data.insert(0, 'No', range(1, len(data) + 1))
+        return {'csv': csv_data, 'table_data': data.to_dict(orient='records')}
+
+    payload = await sync_to_async(build_payload, thread_sensitive=False)()
+    return JsonResponse(payload)
@@ -4,8 +4,13 @@ from django.urls import reverse_lazy
 from .forms import OperatorForm, KelompokForm
 from django.views import View
 from django.shortcuts import render, redirect
-from django.http import HttpResponse, JsonResponse
-import csv
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+import codecs
+from django.contrib import messages
+from .operator_import import import_operators
+from .search import timed_search, SEARCH_SOURCES
+from .cache import operator_list, operator_nip
+from . import metrics as request_metrics
 
 class HomeView(TemplateView):
     template_name = 'core/homepage.html'
@@ -49,22 +54,68 @@ class OperatorBulkCreateView(View):
         if csv_file:
             if not csv_file.name.endswith('.csv'):
                 return HttpResponse('File is not CSV type', status=400)
-            file_data = csv_file.read().decode('utf-8')
+            lines = codecs.iterdecode(csv_file, 'utf-8')
         elif csv_data:
-            file_data = csv_data
+            lines = csv_data.splitlines()
         else:
             return HttpResponse('No CSV file or data provided', status=400)
 
-        reader = csv.reader(file_data.splitlines())
-        for row in reader:
-            if len(row) >= 2:
-                Operator.objects.create(name=row[0], NIP=row[1])
+        try:
+            report = import_operators(lines)
+        except UnicodeDecodeError:
+            return HttpResponse('CSV file must be UTF-8 encoded', status=400)
+
+        if report.created:
+            messages.success(request, f'{len(report.created)} operators added')
+        if report.updated:
+            messages.success(request, f'{len(report.updated)} operators updated')
+        if report.unchanged:
+            messages.info(request, f'{len(report.unchanged)} operators already up to date')
+        for error in report.errors[:5]:
+            messages.error(request, error)
+        if len(report.errors) > 5:
+            messages.warning(request, f'... and {len(report.errors) - 5} more errors')
 
         return redirect('core:operator_list')
 
 def get_operator_list(request):
-    operators = Operator.objects.values('pk', 'name')
-    return JsonResponse({'operators': list(operators)})
+    return JsonResponse({'operators': operator_list()})
+
+def get_nip(request, operator_id):
+    nip = operator_nip(operator_id)
+    if nip is None:
+        return JsonResponse({'error': 'Operator not found'}, status=404)
+    return JsonResponse({'nip': nip})
+
+def search_api(request):
+    """
+    Ranked full-text search over BAST events/notes, QC, QC FM and CS station lists.
+    Query parameters: q (required), source (repeatable), field, limit.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'Query parameter q is required'}, status=400)
+
+    sources = request.GET.getlist('source') or None
+    if sources and any(source not in SEARCH_SOURCES for source in sources):
+        return JsonResponse({'error': f'Unknown source, expected one of {list(SEARCH_SOURCES)}'}, status=400)
+
+    try:
+        limit = min(int(request.GET.get('limit', 50)), 500)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+    hits, took_ms = timed_search(query, sources=sources, field=request.GET.get('field') or None, limit=limit)
+    return JsonResponse({'query': query, 'count': len(hits), 'took_ms': took_ms, 'results': hits})
+
+def metrics(request):
+    """Request metrics of all workers in the Prometheus text format."""
+    if not request_metrics.metrics_allowed(request):
+        return HttpResponseForbidden()
+    # This worker's latest observations are included right away, the others' within METRICS_FLUSH_INTERVAL
+    request_metrics.registry.flush()
+    body = request_metrics.render(request_metrics.read_store(request_metrics.metrics_db()))
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
 
 class KelompokListView(ListView):
     model = Kelompok
@@ -85,7 +136,7 @@ class KelompokUpdateView(UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['existing_members'] = self.object.member.split(',')
+        context['existing_members'] = [str(pk) for pk in self.object.member_ids()]
         return context
 
 class KelompokDeleteDirectView(View):
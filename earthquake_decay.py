@@ -1,13 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
-from scipy.stats import linregress
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import datetime as dt
 import matplotlib.dates as mdates
 from PIL import Image, ImageTk
 import warnings
+# The fitting engine is shared with the web app
+from earthquake_decay.calculation import UTSU_C, fit_models, model_fit
 
 # Suppress RunTimeWarning from division by zero or log of zero in models
 warnings.filterwarnings("ignore", category=RuntimeWarning)
@@ -137,29 +138,21 @@ class EarthquakeDecayApp:
             "utsu": (self.cb_utsu_var.get(), self.run_utsu, "Utsu"),
         }
 
+        # One batched fit for all the selected models
+        fits = fit_models(rentang_count, frekuensi, [key for key, (is_selected, _, _) in model_map.items() if is_selected])
+
         any_model_run = False
         for key, (is_selected, model_func, model_name) in model_map.items():
             if is_selected:
                 try:
                     any_model_run = True
-                    model_func(rentang_count, frekuensi, rentang_centers, jam2hari, periode)
+                    model_func(fits, rentang_count, frekuensi, rentang_centers, jam2hari, periode)
                 except Exception as e:
                     messagebox.showerror("Model Error", f"Could not generate {model_name} model.\nTrend may be too fluctuating or data is insufficient.\n\nDetails: {e}")
         
         if not any_model_run:
             messagebox.showinfo("No Models Selected", "Please select at least one model to process.")
 
-    def _regression(self, x, y):
-        """Wrapper for scipy's linear regression."""
-        # Filter out invalid values for log or division
-        valid_indices = np.where((np.isfinite(x)) & (np.isfinite(y)))[0]
-        if len(valid_indices) < 2:
-            raise ValueError("Not enough valid data points for regression.")
-            
-        x_clean, y_clean = x[valid_indices], y[valid_indices]
-        slope, intercept, r_value, _, _ = linregress(x_clean, y_clean)
-        return r_value, slope, intercept
-    
     def plot_graph(self, rentang, frekuensi, tt_graph, nt, t1_days, r, title_str):
         """Generic plotting function for all models."""
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -196,10 +189,8 @@ class EarthquakeDecayApp:
         plt.tight_layout(rect=[0, 0, 1, 0.96])
         plt.show()
 
-    def run_omori(self, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
-        y = 1 / frekuensi
-        x = rentang_count
-        r, B, A = self._regression(x, y)
+    def run_omori(self, fits, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
+        r, B, A = model_fit(fits, "omori")
         a = 1 / B
         b = A * a
         t1 = (a - b) # in units of periode
@@ -210,10 +201,8 @@ class EarthquakeDecayApp:
         tt_graph = np.linspace(rentang_plot[0], rentang_plot[0] + t1_days, len(tt))
         self.plot_graph(rentang_plot, frekuensi, tt_graph, nt, t1_days, r, "Earthquake Decay Forecast - OMORI Model")
 
-    def run_mogi1(self, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
-        y = np.log10(frekuensi)
-        x = np.log10(rentang_count)
-        r, B, A = self._regression(x, y)
+    def run_mogi1(self, fits, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
+        r, B, A = model_fit(fits, "mogi1")
         a = 10**A
         b = -B
         t1 = 10**(np.log10(a) / b) # in units of periode
@@ -224,10 +213,8 @@ class EarthquakeDecayApp:
         tt_graph = np.linspace(rentang_plot[0], rentang_plot[0] + t1_days, len(tt))
         self.plot_graph(rentang_plot, frekuensi, tt_graph, nt, t1_days, r, "Earthquake Decay Forecast - MOGI I Model")
         
-    def run_mogi2(self, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
-        y = np.log(frekuensi)
-        x = rentang_count
-        r, B, A = self._regression(x, y)
+    def run_mogi2(self, fits, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
+        r, B, A = model_fit(fits, "mogi2")
         a = np.exp(A)
         b = -B
         t1 = np.log(a) / b # in units of periode
@@ -238,11 +225,9 @@ class EarthquakeDecayApp:
         tt_graph = np.linspace(rentang_plot[0], rentang_plot[0] + t1_days, len(tt))
         self.plot_graph(rentang_plot, frekuensi, tt_graph, nt, t1_days, r, "Earthquake Decay Forecast - MOGI II Model")
         
-    def run_utsu(self, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
-        c = 0.01 # small constant from original code
-        y = np.log10(frekuensi)
-        x = np.log10(rentang_count + c)
-        r, B, A = self._regression(x, y)
+    def run_utsu(self, fits, rentang_count, frekuensi, rentang_plot, jam2hari, periode):
+        c = UTSU_C
+        r, B, A = model_fit(fits, "utsu")
         a = 10**A
         b = -B
         t1 = 10**(np.log10(a) / b) - c # in units of periode
@@ -3,20 +3,90 @@
 # Place calculation functions here for import/use in Django views.
 
 import numpy as np
-from scipy.stats import linregress
 import matplotlib.dates as mdates
 import datetime as dt
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-def regression(x, y):
-    valid_indices = np.where((np.isfinite(x)) & (np.isfinite(y)))[0]
-    if len(valid_indices) < 2:
-        raise ValueError("Not enough valid data points for regression.")
-    x_clean, y_clean = x[valid_indices], y[valid_indices]
-    slope, intercept, r_value, _, _ = linregress(x_clean, y_clean)
-    return r_value, slope, intercept
+MODELS = ("omori", "mogi1", "mogi2", "utsu")
+
+# Offset added to the time axis of the Utsu model
+UTSU_C = 0.01
+
+# (interval, unit) pairs tried by sweep_intervals, 1 hour to 5 days
+SWEEP_INTERVALS = (
+    (1, "Hours"), (2, "Hours"), (3, "Hours"), (6, "Hours"), (12, "Hours"),
+    (1, "Days"), (2, "Days"), (3, "Days"), (4, "Days"), (5, "Days"),
+)
+
+# A fit through fewer bins than this isn't ranked, its r means little
+MIN_SWEEP_BINS = 5
+
+def model_designs(rentang_count, frekuensi, models=MODELS):
+    """
+    The transformed (x, y) of every model as two (len(models), bins) arrays:
+    Omori fits 1/n against t, Mogi I log10 n against log10 t, Mogi II ln n
+    against t and Utsu log10 n against log10 (t + c). Empty bins give
+    non-finite values, which fit_models leaves out.
+    """
+    t = np.asarray(rentang_count, dtype=float)
+    n = np.asarray(frekuensi, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        designs = {
+            "omori": (t, 1 / n),
+            "mogi1": (np.log10(t), np.log10(n)),
+            "mogi2": (t, np.log(n)),
+            "utsu": (np.log10(t + UTSU_C), np.log10(n)),
+        }
+    x = np.stack([designs[model][0] for model in models])
+    y = np.stack([designs[model][1] for model in models])
+    return x, y
+
+def fit_models(rentang_count, frekuensi, models=MODELS):
+    """
+    Least-squares line through the design of every model in `models`, solved
+    for all of them at once. Returns {model: (r, slope, intercept)}, with a
+    ValueError in place of the tuple for a model without enough finite points.
+    The results match scipy.stats.linregress on the finite points of each design.
+    """
+    if not models:
+        return {}
+    x, y = model_designs(rentang_count, frekuensi, models)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x = np.where(finite, x, 0.0)
+    y = np.where(finite, y, 0.0)
+    count = finite.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = x.sum(axis=1) / count
+        y_mean = y.sum(axis=1) / count
+        dx = np.where(finite, x - x_mean[:, None], 0.0)
+        dy = np.where(finite, y - y_mean[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        # linregress reports r = 0 for a flat line
+        r = np.where(sxx * syy == 0, 0.0, np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0))
+
+    fits = {}
+    for i, model in enumerate(models):
+        if count[i] < 2:
+            fits[model] = ValueError("Not enough valid data points for regression.")
+        elif sxx[i] == 0:
+            fits[model] = ValueError("Cannot calculate a linear regression if all x values are identical.")
+        else:
+            fits[model] = (float(r[i]), float(slope[i]), float(intercept[i]))
+    return fits
+
+def model_fit(fits, model):
+    """(r, slope, intercept) of `model` from fit_models, raising its ValueError if it has none."""
+    fit = fits[model]
+    if isinstance(fit, Exception):
+        raise fit
+    return fit
 
 def bin_event_times(datetimes, interval=1.0, unit="Days"):
     """
@@ -31,8 +101,15 @@ def bin_event_times(datetimes, interval=1.0, unit="Days"):
         rentang_centers: np.ndarray, bin centers as matplotlib datenums
         jam2hari: float, conversion factor
     """
-    datnum = mdates.date2num(datetimes)
-    datnum.sort()
+    datnum = np.sort(mdates.date2num(datetimes))
+    return bin_sorted_times(datnum, interval, unit)
+
+def bin_edges(datnum, interval=1.0, unit="Days"):
+    """
+    Bin edges of bin_sorted_times as matplotlib datenums, with the hours-to-days
+    factor. Every binning, single or swept, takes its edges from here so they
+    agree to the last bit, events on an edge included.
+    """
     if unit == "Hours":
         jam2hari = 1 / 24
         period_in_days = interval / 24
@@ -40,17 +117,26 @@ def bin_event_times(datetimes, interval=1.0, unit="Days"):
         jam2hari = 1
         period_in_days = interval
     start_time, end_time = datnum[0], datnum[-1]
-    bins = np.arange(start_time, end_time + period_in_days, period_in_days)
-    frekuensi, rentang_edges = np.histogram(datnum, bins=bins)
+    return np.arange(start_time, end_time + period_in_days, period_in_days), jam2hari
+
+def bin_sorted_times(datnum, interval=1.0, unit="Days"):
+    """
+    bin_event_times on already sorted matplotlib datenums. Counts come from
+    binary searches of the bin edges, O(bins log events), so one sorted array
+    serves any number of binnings. Same bins and counts as np.histogram: the
+    last bin includes its right edge.
+    """
+    rentang_edges, jam2hari = bin_edges(datnum, interval, unit)
+    below = np.searchsorted(datnum, rentang_edges, side="left")
+    below[-1] = np.searchsorted(datnum, rentang_edges[-1], side="right")
+    frekuensi = np.diff(below)
     rentang_centers = (rentang_edges[:-1] + rentang_edges[1:]) / 2
     rentang_count = np.arange(1, len(frekuensi) + 1) * interval
     return rentang_count, frekuensi, rentang_centers, jam2hari
 
-def omori_model(rentang_count, frekuensi):
+def omori_model(rentang_count, frekuensi, fits=None):
     """Omori model calculation."""
-    y = 1 / frekuensi
-    x = rentang_count
-    r, B, A = regression(x, y)
+    r, B, A = model_fit(fits or fit_models(rentang_count, frekuensi, ["omori"]), "omori")
     a = 1 / B
     b = A * a
     t1 = (a - b)
@@ -60,11 +146,9 @@ def omori_model(rentang_count, frekuensi):
         "r": r, "a": a, "b": b, "t1": t1, "tt": tt, "nt": nt
     }
 
-def mogi1_model(rentang_count, frekuensi):
+def mogi1_model(rentang_count, frekuensi, fits=None):
     """Mogi I model calculation."""
-    y = np.log10(frekuensi)
-    x = np.log10(rentang_count)
-    r, B, A = regression(x, y)
+    r, B, A = model_fit(fits or fit_models(rentang_count, frekuensi, ["mogi1"]), "mogi1")
     a = 10 ** A
     b = -B
     t1 = 10 ** (np.log10(a) / b)
@@ -74,11 +158,9 @@ def mogi1_model(rentang_count, frekuensi):
         "r": r, "a": a, "b": b, "t1": t1, "tt": tt, "nt": nt
     }
 
-def mogi2_model(rentang_count, frekuensi):
+def mogi2_model(rentang_count, frekuensi, fits=None):
     """Mogi II model calculation."""
-    y = np.log(frekuensi)
-    x = rentang_count
-    r, B, A = regression(x, y)
+    r, B, A = model_fit(fits or fit_models(rentang_count, frekuensi, ["mogi2"]), "mogi2")
     a = np.exp(A)
     b = -B
     t1 = np.log(a) / b
@@ -88,12 +170,10 @@ def mogi2_model(rentang_count, frekuensi):
         "r": r, "a": a, "b": b, "t1": t1, "tt": tt, "nt": nt
     }
 
-def utsu_model(rentang_count, frekuensi):
+def utsu_model(rentang_count, frekuensi, fits=None):
     """Utsu model calculation."""
-    c = 0.01
-    y = np.log10(frekuensi)
-    x = np.log10(rentang_count + c)
-    r, B, A = regression(x, y)
+    c = UTSU_C
+    r, B, A = model_fit(fits or fit_models(rentang_count, frekuensi, ["utsu"]), "utsu")
     a = 10 ** A
     b = -B
     t1 = 10 ** (np.log10(a) / b) - c
@@ -103,7 +183,9 @@ def utsu_model(rentang_count, frekuensi):
         "r": r, "a": a, "b": b, "t1": t1, "tt": tt, "nt": nt
     }
 
-def run_earthquake_decay_models(datetimes, interval=1.0, unit="Days", models=None):
+MODEL_FUNCTIONS = {"omori": omori_model, "mogi1": mogi1_model, "mogi2": mogi2_model, "utsu": utsu_model}
+
+def run_earthquake_decay_models(datetimes, interval=1.0, unit="Days", models=None, sweep=None, workers=1):
     """
     Run selected earthquake decay models on event datetimes.
     Args:
@@ -111,23 +193,92 @@ def run_earthquake_decay_models(datetimes, interval=1.0, unit="Days", models=Non
         interval (float): Bin interval.
         unit (str): 'Days' or 'Hours'.
         models (list): List of models to run ("omori", "mogi1", "mogi2", "utsu").
+        sweep (list): Optional (interval, unit) pairs to rank, see sweep_intervals.
+        workers (int): Processes for the sweep, see sweep_intervals.
     Returns:
-        dict: Results for each model, plus binning info.
+        dict: Results for each model, plus binning info and, with `sweep`, the ranked sweep table.
     """
     if models is None:
-        models = ["omori", "mogi1", "mogi2", "utsu"]
-    rentang_count, frekuensi, rentang_centers, jam2hari = bin_event_times(datetimes, interval, unit)
+        models = list(MODELS)
+    datnum = np.sort(mdates.date2num(datetimes))
+    rentang_count, frekuensi, rentang_centers, jam2hari = bin_sorted_times(datnum, interval, unit)
     results = {"bin_centers": rentang_centers, "frequencies": frekuensi, "rentang_count": rentang_count}
+    # One batched fit for all the selected models
+    fits = fit_models(rentang_count, frekuensi, [model for model in MODELS if model in models])
     for model in models:
+        if model not in MODEL_FUNCTIONS:
+            continue
         try:
-            if model == "omori":
-                results["omori"] = omori_model(rentang_count, frekuensi)
-            elif model == "mogi1":
-                results["mogi1"] = mogi1_model(rentang_count, frekuensi)
-            elif model == "mogi2":
-                results["mogi2"] = mogi2_model(rentang_count, frekuensi)
-            elif model == "utsu":
-                results["utsu"] = utsu_model(rentang_count, frekuensi)
+            results[model] = MODEL_FUNCTIONS[model](rentang_count, frekuensi, fits)
         except Exception as e:
             results[model] = {"error": str(e)}
+    if sweep:
+        results["sweep"] = sweep_intervals(datnum, sweep, models, workers=workers)
     return results
+
+def sweep_counts(datnum, intervals):
+    """
+    frekuensi of bin_sorted_times at every (interval, unit) in `intervals`,
+    from the same bin_edges. The edges of all the binnings go through one
+    binary search of the events, then each binning takes its slice of it.
+    """
+    edges = [bin_edges(datnum, interval, unit)[0] for interval, unit in intervals]
+    if not edges:
+        return []
+    below = np.searchsorted(datnum, np.concatenate(edges), side="left")
+    counts = []
+    offset = 0
+    for rentang_edges in edges:
+        part = below[offset:offset + len(rentang_edges)]
+        # The last bin includes its right edge, as in np.histogram
+        part[-1] = np.searchsorted(datnum, rentang_edges[-1], side="right")
+        counts.append(np.diff(part))
+        offset += len(rentang_edges)
+    return counts
+
+def _sweep_interval(interval, unit, frekuensi, models):
+    """Fit quality of every model at one binning of the sweep."""
+    jam2hari = 1 / 24 if unit == "Hours" else 1
+    rentang_count = np.arange(1, len(frekuensi) + 1) * interval
+    fits = fit_models(rentang_count, frekuensi, models) if len(frekuensi) >= MIN_SWEEP_BINS else {}
+    rows = []
+    for model in models:
+        row = {"model": model, "interval": interval, "unit": unit, "bins": len(frekuensi)}
+        try:
+            if not fits:
+                raise ValueError(f"Fewer than {MIN_SWEEP_BINS} bins.")
+            result = MODEL_FUNCTIONS[model](rentang_count, frekuensi, fits)
+            t1_days = float(result["t1"]) * jam2hari
+            if not np.isfinite(t1_days):
+                raise ValueError("The fitted curve never decays.")
+            row.update(r=result["r"], r_squared=result["r"] ** 2, t1_days=t1_days)
+        except Exception as e:
+            row["error"] = str(e)
+        rows.append(row)
+    return rows
+
+def sweep_intervals(datetimes, intervals=SWEEP_INTERVALS, models=None, workers=1):
+    """
+    Fit the models at every (interval, unit) in `intervals` and rank the fits.
+    `datetimes` may be event datetimes or already sorted datenums; every
+    binning comes from one count of the events (see sweep_counts). The fits
+    run in this process by default; `workers` > 1 spreads the intervals over
+    a process pool, for scripts only: the web views must not fork their worker.
+    Returns rows of {"model", "interval", "unit", "bins", "r", "r_squared",
+    "t1_days"}, best r² first, followed by the rows with an "error" instead.
+    """
+    models = [model for model in MODELS if models is None or model in models]
+    datnum = np.asarray(datetimes) if isinstance(datetimes, np.ndarray) else np.sort(mdates.date2num(datetimes))
+    jobs = [(interval, unit, frekuensi, models)
+            for (interval, unit), frekuensi in zip(intervals, sweep_counts(datnum, intervals))]
+
+    workers = min(len(jobs), workers or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tables = list(pool.map(_sweep_interval, *zip(*jobs)))
+    else:
+        tables = [_sweep_interval(*job) for job in jobs]
+
+    rows = [row for table in tables for row in table]
+    ranked = sorted((row for row in rows if "error" not in row), key=lambda row: -row["r_squared"])
+    return ranked + [row for row in rows if "error" in row]
@@ -0,0 +1,70 @@
+const earthquakeDecayConfig = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+    const fileInput = document.getElementById('data_file');
+    const infoDiv = document.getElementById('event-count-info');
+    fileInput.addEventListener('change', function(e) {
+        infoDiv.textContent = '';
+        const file = e.target.files[0];
+        if (!file) return;
+        const reader = new FileReader();
+        reader.onload = function(evt) {
+            const text = evt.target.result;
+            // Count non-empty lines (skip header if present)
+            let lines = text.split(/\r?\n/).filter(l => l.trim().length > 0);
+            // If first line looks like a header, skip it
+            if (lines.length && /[a-zA-Z]/.test(lines[0])) lines = lines.slice(1);
+            infoDiv.innerHTML = `<strong>${lines.length}</strong> earthquake events detected in file.`;
+        };
+        reader.readAsText(file);
+    });
+});
+
+// Rendered after an analysis: the histogram, the decay model plot and the results table
+if (earthquakeDecayConfig.histogramData) {
+    const histogramData = JSON.parse(earthquakeDecayConfig.histogramData);
+    Plotly.newPlot('plotly-histogram', histogramData.traces, {
+        title: {
+            text: '<b>Event Data Histogram</b>',
+            font: { size: 28, family: 'inherit', weight: 'bold' }
+        },
+        xaxis: { title: { text: histogramData.xaxis_title } },
+        yaxis: { title: { text: histogramData.yaxis_title } },
+        margin: { t: 60 }
+    }, {responsive: true});
+}
+
+if (earthquakeDecayConfig.plotData) {
+    const plotData = JSON.parse(earthquakeDecayConfig.plotData);
+    const layout = {
+        title: {
+            text: '<b>Earthquake Decay Model Results</b>',
+            font: { size: 28, family: 'inherit', weight: 'bold' }
+        },
+        xaxis: { title: { text: plotData.xaxis_title } },
+        yaxis: { title: { text: plotData.yaxis_title } },
+        legend: { orientation: 'h', y: -0.2 },
+    };
+
+    Plotly.newPlot('plotly-graph', plotData.traces, layout, {responsive: true});
+
+    // Add decay results to the table if available
+    const resultsData = document.getElementById('decay-results-data');
+    if (resultsData) {
+        const results = JSON.parse(resultsData.textContent);
+        const tbody = document.getElementById('decay-results');
+
+        Object.entries(results).forEach(([model, data]) => {
+            if (data) {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>${model}</td>
+                    <td>${data.t_days}</td>
+                    <td>${data.end_date}</td>
+                    <td>${data.r_squared}</td>
+                `;
+                tbody.appendChild(row);
+            }
+        });
+    }
+}
@@ -1,3 +1,121 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Add tests for earthquake_decay app here
+
+class FitModelsTests(SimpleTestCase):
+    def test_batched_fit_matches_linregress(self):
+        import numpy as np
+        from scipy.stats import linregress
+        from .calculation import MODELS, fit_models, model_designs
+
+        rng = np.random.default_rng(0)
+        rentang_count = np.arange(1, 41) * 0.5
+        # Empty bins make 1/n and log n infinite, those points are left out of every fit
+        frekuensi = rng.integers(0, 30, size=40)
+        frekuensi[:3] = 0
+        fits = fit_models(rentang_count, frekuensi)
+        x, y = model_designs(rentang_count, frekuensi)
+        for model, model_x, model_y in zip(MODELS, x, y):
+            finite = np.isfinite(model_x) & np.isfinite(model_y)
+            expected = linregress(model_x[finite], model_y[finite])
+            np.testing.assert_allclose(fits[model], (expected.rvalue, expected.slope, expected.intercept),
+                                       rtol=1e-10, err_msg=model)
+
+    def test_models_without_enough_points_get_an_error(self):
+        import datetime
+        from .calculation import fit_models, model_fit, run_earthquake_decay_models
+
+        fits = fit_models([1.0, 2.0, 3.0], [5, 0, 0], ['omori', 'mogi2'])
+        with self.assertRaisesMessage(ValueError, 'Not enough valid data points'):
+            model_fit(fits, 'omori')
+        self.assertEqual(fit_models([1.0, 2.0], [3, 4], []), {})
+
+        start = datetime.datetime(2025, 3, 12)
+        results = run_earthquake_decay_models([start, start + datetime.timedelta(hours=1)], 1.0, 'Days',
+                                              ['omori', 'utsu'])
+        self.assertIn('error', results['omori'])
+        self.assertIn('error', results['utsu'])
+
+    def test_decay_models_fit_an_aftershock_sequence(self):
+        from core.synthetic import aftershock_times
+        from .calculation import MODELS, run_earthquake_decay_models
+
+        results = run_earthquake_decay_models(aftershock_times(), 1.0, 'Days')
+        for model in MODELS:
+            self.assertNotIn('error', results[model], model)
+            self.assertGreater(abs(results[model]['r']), 0.5, model)
+
+
+class IntervalSweepTests(SimpleTestCase):
+    def test_sorted_binning_matches_histogram(self):
+        import numpy as np
+        from matplotlib import dates as mdates
+        from core.synthetic import aftershock_times
+        from .calculation import bin_event_times, bin_sorted_times
+
+        datnum = np.sort(mdates.date2num(aftershock_times(count=500)))
+        for interval, unit in ((1, 'Hours'), (7, 'Hours'), (0.5, 'Days'), (5, 'Days')):
+            period = interval / 24 if unit == 'Hours' else interval
+            expected, _ = np.histogram(datnum, bins=np.arange(datnum[0], datnum[-1] + period, period))
+            np.testing.assert_array_equal(bin_sorted_times(datnum, interval, unit)[1], expected)
+        self.assertEqual(bin_event_times(aftershock_times(count=500), 1, 'Days')[1].sum(), 500)
+
+    def test_sweep_counts_match_each_binning(self):
+        import numpy as np
+        from matplotlib import dates as mdates
+        from core.synthetic import aftershock_times
+        from .calculation import SWEEP_INTERVALS, bin_sorted_times, sweep_counts
+
+        datnum = np.sort(mdates.date2num(aftershock_times(count=500)))
+        for intervals in (SWEEP_INTERVALS, [(1.5, 'Hours'), (0.5, 'Days'), (7, 'Hours')]):
+            for (interval, unit), counts in zip(intervals, sweep_counts(datnum, intervals)):
+                np.testing.assert_array_equal(counts, bin_sorted_times(datnum, interval, unit)[1])
+        self.assertEqual(sweep_counts(datnum, []), [])
+
+    def test_sweep_matches_the_form_on_bin_edges(self):
+        import datetime
+        import numpy as np
+        from .calculation import SWEEP_INTERVALS, run_earthquake_decay_models, sweep_intervals
+
+        # Catalogs at whole hours put events exactly on the bin edges
+        rng = np.random.default_rng(0)
+        start = datetime.datetime(2025, 3, 12)
+        catalogs = [[start + datetime.timedelta(hours=i) for i in range(12)]]
+        catalogs += [[start + datetime.timedelta(hours=int(h)) for h in rng.integers(0, 24 * 20, size=60)]
+                     for _ in range(20)]
+        for events in catalogs:
+            rows = sweep_intervals(events, models=['omori'])
+            for interval, unit in SWEEP_INTERVALS:
+                results = run_earthquake_decay_models(events, interval, unit, ['omori'])
+                row = next(row for row in rows if (row['interval'], row['unit']) == (interval, unit))
+                self.assertEqual(row['bins'], len(results['frequencies']), (interval, unit))
+                if 'error' not in row:
+                    self.assertEqual(row['r'], results['omori']['r'], (interval, unit))
+
+    def test_sweep_ranks_every_model_and_interval(self):
+        from core.synthetic import aftershock_times
+        from .calculation import SWEEP_INTERVALS, run_earthquake_decay_models, sweep_intervals
+
+        events = aftershock_times(count=800)
+        rows = sweep_intervals(events, models=['omori', 'mogi1'])
+        self.assertEqual(len(rows), 2 * len(SWEEP_INTERVALS))
+        ranked = [row['r_squared'] for row in rows if 'error' not in row]
+        self.assertEqual(ranked, sorted(ranked, reverse=True))
+        self.assertTrue(all('error' in row for row in rows[len(ranked):]))
+        self.assertEqual(sweep_intervals(events, models=['omori', 'mogi1'], workers=2), rows)
+
+        results = run_earthquake_decay_models(events, 1.0, 'Days', ['utsu'], sweep=[(6, 'Hours'), (200, 'Days')])
+        self.assertEqual([(row['interval'], row['unit']) for row in results['sweep']], [(6, 'Hours'), (200, 'Days')])
+        self.assertIn('Fewer than', results['sweep'][1]['error'])
+
+    def test_view_shows_the_sweep_table(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.urls import reverse
+        from core.synthetic import aftershock_times
+
+        data = '\n'.join(t.strftime('%Y-%m-%d %H:%M:%S') for t in aftershock_times(count=300)).encode()
+        response = self.client.post(reverse('earthquake_decay:index'), {
+            'data_file': SimpleUploadedFile('events.txt', data), 'interval': '1', 'unit': 'Days',
+            'models': ['omori'], 'sweep': '1',
+        })
+        self.assertContains(response, 'Interval Sweep')
+        self.assertContains(response, '12 Hours')
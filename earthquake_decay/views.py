@@ -5,7 +5,6 @@ from django.http import HttpResponse
 import io
 import csv
 import json
-from . import calculation
 from django.views.decorators.csrf import csrf_exempt
 
 def parse_event_data(file):
@@ -34,6 +33,7 @@ def parse_event_data(file):
 
 def build_plotly_data(bin_centers, frequencies, model_results, selected_models):
     import plotly.utils
+    from . import calculation
     traces = [
         {
             'x': [str(calculation.mdates.num2date(x)) for x in bin_centers],
@@ -87,6 +87,22 @@ def build_histogram_data(datetimes):
         'yaxis_title': 'Number of Events',
     }, cls=plotly.utils.PlotlyJSONEncoder)
 
+def build_sweep_rows(sweep):
+    """The ranked interval sweep, formatted for the sweep table."""
+    rows = []
+    for rank, row in enumerate(sweep, 1):
+        rows.append({
+            'rank': rank if 'error' not in row else '-',
+            'model': row['model'].capitalize(),
+            'interval': f"{row['interval']:g} {row['unit']}",
+            'bins': row['bins'],
+            'r': f"{row['r']:.4f}" if 'r' in row else '-',
+            'r_squared': f"{row['r_squared']:.4f}" if 'r_squared' in row else '-',
+            't_days': f"{row['t1_days']:.0f}" if 't1_days' in row else '-',
+            'error': row.get('error', ''),
+        })
+    return rows
+
 
 def index(request):
     context = {}
@@ -95,6 +111,7 @@ def index(request):
         interval = float(request.POST.get('interval', 1))
         unit = request.POST.get('unit', 'Days')
         selected_models = request.POST.getlist('models')
+        sweep = bool(request.POST.get('sweep'))
         error = None
         datetimes = []
         if file:
@@ -106,7 +123,12 @@ def index(request):
             error = error or "No valid event data found. Please upload a .csv/.txt file with one datetime per row."
         if not error:
             try:
-                results = calculation.run_earthquake_decay_models(datetimes, interval=interval, unit=unit, models=selected_models)
+                # numpy, scipy and matplotlib are only loaded once a file is analysed
+                from . import calculation
+                results = calculation.run_earthquake_decay_models(
+                    datetimes, interval=interval, unit=unit, models=selected_models,
+                    sweep=calculation.SWEEP_INTERVALS if sweep else None,
+                )
                 context['plot_data'] = build_plotly_data(
                     results['bin_centers'], results['frequencies'], results, selected_models
                 )
@@ -133,6 +155,8 @@ def index(request):
                             'r_squared': f"{r_value:.4f}" if r_value is not None else '-',
                         }
                 context['decay_results'] = decay_results
+                if sweep:
+                    context['sweep_results'] = build_sweep_rows(results['sweep'])
 
             except Exception as e:
                 error = f"Calculation error: {e}"
@@ -24,7 +24,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-f2ys2)t9wlw6mq405kep*2sb#_b+sjc&o3ygx)i9nv$i3ovfdb'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# With DEBUG off, static URLs point at the hashed files written by collectstatic
+DEBUG = os.environ.get('DEBUG', 'True').lower() not in ('false', '0', 'no')
 
 ALLOWED_HOSTS = ['*']
 
@@ -49,6 +50,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.QueryProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,6 +81,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'ebast.wsgi.application'
 
+# Runs the tests against scratch files instead of the deployment's (see core.test_runner)
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -84,10 +91,43 @@ WSGI_APPLICATION = 'ebast.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # The load test (core.loadtest) points the app at a scratch database
+        'NAME': os.environ.get('EBAST_DB_PATH', BASE_DIR / 'db.sqlite3'),
+        # Keep connections open between requests of the same gunicorn worker.
+        # The ASGI profile sets EBAST_CONN_MAX_AGE=0, as Django advises for async servers.
+        'CONN_MAX_AGE': int(os.environ.get('EBAST_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock when a transaction starts, so concurrent saves
+            # wait on busy_timeout instead of failing with "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Shared by all gunicorn workers; core.cache keeps a per-process LRU in front of it.
+# Plain files rather than a table in db.sqlite3, so cache reads and writes never
+# run queries or take the database write lock.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('EBAST_CACHE_DIR', BASE_DIR / 'cache'),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
     }
 }
 
+# Applied to every new SQLite connection by core.db.configure_sqlite_connection
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'busy_timeout': 5000,
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -126,6 +166,18 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'static/'
 
+# collectstatic writes content-hashed copies of every file plus .gz (and .br
+# when Brotli is installed) versions; StaticFilesMiddleware serves the hashed
+# files with far-future, immutable cache headers (see core.storage)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.storage.StaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -135,4 +187,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media/'
 
-ADMIN_MEDIA_PREFIX = '/admin'
\ No newline at end of file
+ADMIN_MEDIA_PREFIX = '/admin'
+# Upstream event lists read by the fetch_data views (see core.upstream)
+UPSTREAM_BASE_URL = os.environ.get('EBAST_UPSTREAM_URL', 'http://202.90.198.41')
+UPSTREAM_TIMEOUT = 10
+UPSTREAM_CONNECT_TIMEOUT = 5
+
+# Per-view request metrics shared by all workers, served on /metrics (see core.metrics)
+METRICS_DB = os.environ.get('EBAST_METRICS_DB', BASE_DIR / 'metrics.sqlite3')
+METRICS_FLUSH_INTERVAL = 5
+# Who may read /metrics besides staff users: localhost for curl on the host, plus the
+# comma-separated addresses in EBAST_METRICS_ALLOWED_IPS, e.g. the Prometheus server
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1'] + [
+    address.strip() for address in os.environ.get('EBAST_METRICS_ALLOWED_IPS', '').split(',') if address.strip()
+]
+
+# Count the queries of every request and warn about likely N+1s, defaults to DEBUG (see core.querycount)
+QUERY_PROFILING = None
+
+# Thumbnail uploaded SLMON images on a background thread (see cl_seiscomp.images)
+SLMON_IMAGE_ASYNC = True
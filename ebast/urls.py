@@ -16,13 +16,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from core.views import HomeView, OperatorListView
+from core.views import HomeView, OperatorListView, metrics
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
+    path('metrics', metrics, name='metrics'),
     path('core/', include('core.urls')),
     path('admin/', admin.site.urls),
     path('qc/', include('qc.urls')),
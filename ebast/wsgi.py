@@ -8,11 +8,9 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 """
 
 import os
-from whitenoise import WhiteNoise
+
 from django.core.wsgi import get_wsgi_application
-from django.conf import settings
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ebast.settings')
 
 application = get_wsgi_application()
-application = WhiteNoise(application, root=settings.STATIC_ROOT)
\ No newline at end of file
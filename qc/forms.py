@@ -1,6 +1,7 @@
 from django import forms
 from .models import QcRecord, ErrorStation
-from cl_seiscomp.models import StationListModel
+from cl_seiscomp.station_directory import station_directory
+from core.cache import operator_choices
 
 class QcRecordForm(forms.ModelForm):
     qc_id = forms.CharField()
@@ -9,6 +10,11 @@ class QcRecordForm(forms.ModelForm):
         fields = '__all__'
         # fields = ['qc_prev', 'qc', 'operator', 'qc_id', 'kelompok', 'jam_pelaksanaan', 'NIP']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Operator options come from the directory cache instead of a query per render
+        self.fields['operator'].choices = operator_choices()
+
 class ErrorStationForm(forms.ModelForm):
     kode_stasiun = forms.ChoiceField(choices=[], label='Kode Stasiun')
     lokasi = forms.CharField(label='Lokasi', required=False)
@@ -20,12 +26,10 @@ class ErrorStationForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['kode_stasiun'].choices = [('', '--- Pilih Kode Stasiun ---')] + [
-            (s.code, s.code) for s in StationListModel.objects.all()
+            (s['code'], s['code']) for s in station_directory.stations('code')
         ]
         if self.instance and self.instance.kode_stasiun:
             # Optionally pre-fill lokasi if editing
-            try:
-                s = StationListModel.objects.get(code=self.instance.kode_stasiun)
-                self.fields['lokasi'].initial = f"{s.province} - {s.location} - {s.UPT}"
-            except StationListModel.DoesNotExist:
-                pass
+            s = station_directory.get(self.instance.kode_stasiun)
+            if s:
+                self.fields['lokasi'].initial = f"{s['province']} - {s['location']} - {s['UPT']}"
@@ -1,21 +1,121 @@
+import datetime
+import json
+from functools import reduce
+
 from django.core.management.base import BaseCommand
 from django.apps import apps
-from django.db.models import Count, CharField, IntegerField, TextField
+from django.db import transaction
+from django.db.models import (
+    Count, CharField, IntegerField, TextField, Case, When, Value, Q, F, OuterRef, Subquery, Window,
+)
 from django.db.models.fields import DateField, DateTimeField, TimeField
+from django.db.models.functions import Coalesce, RowNumber
+
+from core.cache import directory_cache
+
+# Derived tables are rebuilt from the records, repeated values there are expected
+SKIP_MODELS = {
+    'cl_seiscomp.StationListModel',
+    'cl_seiscomp.StationIssue',
+    'cl_seiscomp.CsDailySlotStat',
+    'cl_seiscomp.CsDailyStationStat',
+    'cl_seiscomp.CsStatsVersion',
+    'cl_seiscomp.SlmonImageJob',
+    'core.KelompokMember',
+}
+SKIP_APPS = {'admin', 'auth', 'contenttypes', 'sessions'}
+
+
+def referencing_fields(model):
+    """The foreign keys of other models that point at `model`."""
+    return [rel.field for rel in model._meta.related_objects if rel.one_to_many]
+
+
+def completeness(model):
+    """
+    Expression counting the filled-in fields of a row plus the rows of other
+    models that point at it, so a Kelompok counts its memberships and an
+    Operator its records.
+    """
+    terms = []
+    for fk in referencing_fields(model):
+        related = (fk.model.objects.filter(**{fk.attname: OuterRef('pk')}).order_by()
+                   .values(fk.attname).annotate(rows=Count('pk')).values('rows'))
+        terms.append(Coalesce(Subquery(related, output_field=IntegerField()), Value(0)))
+    for f in model._meta.concrete_fields:
+        if f.primary_key:
+            continue
+        empty = Q(**{f'{f.attname}__isnull': True})
+        if isinstance(f, (CharField, TextField)):
+            empty |= Q(**{f.attname: ''})
+        terms.append(Case(When(empty, then=Value(0)), default=Value(1), output_field=IntegerField()))
+    return reduce(lambda a, b: a + b, terms, Value(0, output_field=IntegerField()))
+
+
+def unique_field_sets(model):
+    """Field names of every unique constraint and unique_together of `model`."""
+    return ([tuple(constraint.fields) for constraint in model._meta.total_unique_constraints]
+            + [tuple(fields) for fields in model._meta.unique_together])
+
+
+def winner_ordering(model, keep):
+    """Window ordering that puts the record to keep first in each duplicate group."""
+    if keep == 'recent':
+        if any(f.name == 'date' for f in model._meta.concrete_fields):
+            return [F('date').desc(), F('pk').desc()]
+        return [F('pk').desc()]
+    if keep == 'complete':
+        return [F('filled').desc(), F('pk').asc()]
+    return [F('pk').asc()]
+
+
+def find_duplicates(model, field, keep='first'):
+    """
+    Return {value: [pk, ...]} for every value of `field` that appears more than once,
+    with the record to keep first, using a single query.
+    """
+    rows = model.objects.all()
+    if keep == 'complete':
+        rows = rows.annotate(filled=completeness(model))
+    rows = (
+        rows.annotate(
+            group_size=Window(Count('pk'), partition_by=[F(field)]),
+            position=Window(RowNumber(), partition_by=[F(field)], order_by=winner_ordering(model, keep)),
+        )
+        .filter(group_size__gt=1)
+        .order_by(field, 'position')
+        .values_list(field, 'pk')
+    )
+    groups = {}
+    for value, pk in rows:
+        groups.setdefault(value, []).append(pk)
+    return groups
+
 
 class Command(BaseCommand):
-    help = 'Find and display duplicate records for all models using the first user-input field. Optionally delete duplicates.'
+    help = ('Find and display duplicate records for all models using the first user-input field. Optionally delete '
+            'duplicates, moving the rows that point at them to the record kept.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-input', '--noinput', action='store_false', dest='interactive',
+                            help='Delete duplicates without prompting')
+        parser.add_argument('--dry-run', action='store_true', help='Only report duplicates, never delete')
+        parser.add_argument('--keep', choices=['first', 'recent', 'complete'], default='first',
+                            help='Record to keep per group: lowest pk (default), most recent date, or most fields filled in')
+        parser.add_argument('--report', help='Write a JSON report of the duplicates to this path')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows deleted per DELETE query')
 
     def handle(self, *args, **options):
-        skip_apps = {'admin', 'auth', 'contenttypes', 'sessions'}
+        report = {
+            'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'keep': options['keep'],
+            'dry_run': options['dry_run'],
+            'models': [],
+        }
         for model in apps.get_models():
             model_name = model.__name__
             app_label = model._meta.app_label
-            # Skip StationListModel in cl_seiscomp app
-            if app_label == 'cl_seiscomp' and model_name == 'StationListModel':
-                continue
-            # Skip Django built-in apps
-            if app_label in skip_apps:
+            if app_label in SKIP_APPS or model._meta.label in SKIP_MODELS:
                 continue
             # Find the first user-input field (CharField, IntegerField, or TextField), not pk, not date/time
             user_fields = [
@@ -26,31 +126,94 @@ class Command(BaseCommand):
             if not user_fields:
                 continue
             field = user_fields[0].name
-            duplicates = (
-                model.objects
-                .values(field)
-                .annotate(count=Count(field))
-                .filter(count__gt=1)
-            )
-            if duplicates:
-                self.stdout.write(self.style.WARNING(f'[{app_label}.{model_name}] Duplicate {field}:'))
-                for dup in duplicates:
-                    self.stdout.write(f"  {field}: {dup[field]} (Count: {dup['count']})")
-                    ids = list(model.objects.filter(**{field: dup[field]}).values_list('pk', flat=True))
-                    self.stdout.write(f"    PKs: {ids}")
-                # Prompt for deletion
-                confirm = input(f"Delete duplicates for [{app_label}.{model_name}] field '{field}'? (y/N): ").strip().lower()
-                if confirm == 'y':
-                    for dup in duplicates:
-                        records = list(model.objects.filter(**{field: dup[field]}).order_by('pk'))
-                        # Keep the first, delete the rest
-                        to_delete = records[1:]
-                        deleted_pks = [obj.pk for obj in to_delete]
-                        for obj in to_delete:
-                            obj.delete()
-                        if deleted_pks:
-                            self.stdout.write(self.style.ERROR(f"    Deleted PKs: {deleted_pks}"))
-                        else:
-                            self.stdout.write("    Nothing deleted (only one record present).")
-            else:
-                self.stdout.write(self.style.SUCCESS(f'[{app_label}.{model_name}] No duplicates found for field {field}.')) 
\ No newline at end of file
+
+            groups = find_duplicates(model, field, options['keep'])
+            if not groups:
+                self.stdout.write(self.style.SUCCESS(f'[{app_label}.{model_name}] No duplicates found for field {field}.'))
+                continue
+
+            self.stdout.write(self.style.WARNING(f'[{app_label}.{model_name}] Duplicate {field}:'))
+            for value, pks in groups.items():
+                self.stdout.write(f"  {field}: {value} (Count: {len(pks)})")
+                self.stdout.write(f"    Keep PK: {pks[0]}, duplicate PKs: {pks[1:]}")
+
+            deleted = []
+            if not options['dry_run'] and self.confirm(options, app_label, model_name, field):
+                deleted = self.delete(model, groups, options['batch_size'])
+                self.stdout.write(self.style.ERROR(f"    Deleted PKs: {deleted}"))
+
+            report['models'].append({
+                'model': model._meta.label,
+                'field': field,
+                'groups': [{'value': value, 'keep': pks[0], 'duplicates': pks[1:]} for value, pks in groups.items()],
+                'deleted': deleted,
+            })
+
+        if options['report']:
+            with open(options['report'], 'w') as f:
+                json.dump(report, f, indent=2, default=str)
+            self.stdout.write(f"Report written to {options['report']}")
+
+    def confirm(self, options, app_label, model_name, field):
+        if not options['interactive']:
+            return True
+        answer = input(f"Delete duplicates for [{app_label}.{model_name}] field '{field}'? (y/N): ")
+        return answer.strip().lower() == 'y'
+
+    def delete(self, model, groups, batch_size):
+        """
+        Delete the duplicates of every group. The rows of other models that
+        point at a duplicate are moved to the row kept first, so the delete
+        cascades nothing: a duplicate operator keeps its records and a
+        duplicate kelompok its members.
+        """
+        keep_of = {pk: pks[0] for pks in groups.values() for pk in pks[1:]}
+        losers = list(keep_of)
+        with transaction.atomic():
+            moved = sum(self.move_references(fk, keep_of, batch_size) for fk in referencing_fields(model))
+            for i in range(0, len(losers), batch_size):
+                model.objects.filter(pk__in=losers[i:i + batch_size]).delete()
+        if moved:
+            # queryset.update() sends no signals
+            directory_cache.invalidate()
+        return losers
+
+    def move_references(self, fk, keep_of, batch_size):
+        """Point the `fk` rows of the duplicates at the rows kept, return how many moved."""
+        related = fk.model
+        unique = [fields for fields in unique_field_sets(related) if fk.name in fields]
+        if not unique:
+            moved = 0
+            losers = list(keep_of)
+            for i in range(0, len(losers), batch_size):
+                batch = losers[i:i + batch_size]
+                moved += related.objects.filter(**{f'{fk.attname}__in': batch}).update(**{fk.attname: Case(
+                    *[When(**{fk.attname: pk}, then=Value(keep_of[pk])) for pk in batch],
+                    output_field=IntegerField(),
+                )})
+            return moved
+
+        # A moved row the kept row already has (same kelompok and operator) is a duplicate itself and goes
+        targets = set(keep_of) | set(keep_of.values())
+        names = sorted({name for fields in unique for name in fields})
+        rows = related.objects.filter(**{f'{fk.attname}__in': targets}).order_by('pk').values('pk', *names)
+        rows = sorted(rows, key=lambda row: (row[fk.name] in keep_of, row['pk']))
+        seen, moves, dropped = set(), {}, []
+        for row in rows:
+            keep = keep_of.get(row[fk.name], row[fk.name])
+            keys = {tuple(keep if name == fk.name else row[name] for name in fields) for fields in unique}
+            if keys & seen:
+                dropped.append(row['pk'])
+                continue
+            seen |= keys
+            if keep != row[fk.name]:
+                moves[row['pk']] = keep
+        for i in range(0, len(dropped), batch_size):
+            related.objects.filter(pk__in=dropped[i:i + batch_size]).delete()
+        pks = list(moves)
+        for i in range(0, len(pks), batch_size):
+            batch = pks[i:i + batch_size]
+            related.objects.filter(pk__in=batch).update(**{fk.attname: Case(
+                *[When(pk=pk, then=Value(moves[pk])) for pk in batch], output_field=IntegerField(),
+            )})
+        return len(moves) + len(dropped)
@@ -36,6 +36,13 @@ class QcRecord(models.Model):
     event_luar = models.IntegerField(default=0)
     kel_sebelum = models.CharField(max_length=1, choices=KELOMPOK, default='1')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='qc_date_idx'),
+            models.Index(fields=['shift', 'date'], name='qc_shift_date_idx'),
+            models.Index(fields=['operator', 'date'], name='qc_operator_date_idx'),
+        ]
+
     def __str__(self):
         return self.qc_id
 
@@ -0,0 +1,60 @@
+const stationList = JSON.parse(document.getElementById('station-list-data').textContent);
+const stationData = {};
+stationList.forEach(s => {
+    stationData[s.code] = `${s.province} - ${s.location} - ${s.UPT}`;
+});
+
+document.addEventListener('DOMContentLoaded', function() {
+    const kodeStasiunInput = document.getElementById('kodeStasiunInput');
+    const kodeStasiunHidden = document.getElementById('id_kode_stasiun');
+    const lokasiInput = document.getElementById('id_lokasi');
+    const suggestionsBox = document.getElementById('kodeStasiunSuggestions');
+
+    function showSuggestions(value) {
+        const val = value.toLowerCase();
+        suggestionsBox.innerHTML = '';
+        let matches;
+        if (!val) { // If input is empty
+            matches = stationList; // Prepare to show all stations
+        } else {
+            matches = stationList.filter(s => s.code.toLowerCase().includes(val));
+        }
+
+        if (matches.length === 0) {
+            suggestionsBox.classList.add('d-none');
+            return;
+        }
+        matches.forEach(s => {
+            const div = document.createElement('div');
+            div.className = 'suggestion-item';
+            div.textContent = s.code + " - " + (stationData[s.code] || '');
+            div.onclick = function() {
+                kodeStasiunInput.value = s.code;
+                kodeStasiunHidden.value = s.code;
+                lokasiInput.value = stationData[s.code] || '';
+                suggestionsBox.classList.add('d-none');
+            };
+            suggestionsBox.appendChild(div);
+        });
+        suggestionsBox.classList.remove('d-none');
+    }
+
+    kodeStasiunInput.addEventListener('input', function() {
+        showSuggestions(this.value);
+        kodeStasiunHidden.value = '';
+        lokasiInput.value = '';
+    });
+    kodeStasiunInput.addEventListener('focus', function() {
+        showSuggestions(this.value);
+    });
+    document.addEventListener('click', function(e) {
+        if (!suggestionsBox.contains(e.target) && e.target !== kodeStasiunInput) {
+            suggestionsBox.classList.add('d-none');
+        }
+    });
+    // Set initial value for update
+    if (kodeStasiunInput.value) {
+        kodeStasiunHidden.value = kodeStasiunInput.value;
+        lokasiInput.value = stationData[kodeStasiunInput.value] || lokasiInput.value;
+    }
+});
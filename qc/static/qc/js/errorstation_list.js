@@ -0,0 +1,12 @@
+document.addEventListener('DOMContentLoaded', function() {
+    var deleteModal = document.getElementById('deleteModal');
+    var deleteForm = document.getElementById('deleteForm');
+    var stationKode = document.getElementById('stationKode');
+    deleteModal.addEventListener('show.bs.modal', function (event) {
+        var button = event.relatedTarget;
+        var url = button.getAttribute('data-delete-url');
+        var kode = button.getAttribute('data-station');
+        deleteForm.action = url;
+        stationKode.textContent = kode;
+    });
+});
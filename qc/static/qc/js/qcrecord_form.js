@@ -0,0 +1,320 @@
+const qcrecordFormConfig = document.currentScript.dataset;
+
+// Other initialization code can go here
+
+// Helper for QC ID suffix
+function getQcSuffix(waktuDinasValue) {
+    switch (waktuDinasValue) {
+        case 'Dini Hari':
+            return '1D';
+        case 'Pagi':
+            return '2P';
+        case 'Siang':
+            return '3S';
+        case 'Malam':
+            return '4M';
+        default:
+            return '';
+    }
+}
+
+// change qc_id value based on date_input and waktu_dinas
+document.addEventListener('DOMContentLoaded', function () {
+    const dateInput = document.getElementById('id_date');
+    const waktuDinasSelect = document.getElementById('id_shift');
+    const qcIdInput = document.getElementById('id_qc_id');
+    qcIdInput.value = "QC-" + dateInput.value + "-" + getQcSuffix(waktuDinasSelect.value);
+
+    function updateQcId() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        qcIdInput.value = "QC-" + dateValue + "-" + getQcSuffix(waktuDinasValue);
+    }
+
+    dateInput.addEventListener('change', updateQcId);
+    waktuDinasSelect.addEventListener('change', updateQcId);
+});
+
+// Fetch data and fill qc_prev
+document.getElementById('fetch_qc_prev').addEventListener('click', function () {
+    const startDatetime = document.getElementById('datetime_qc_prev_start').value.replace('T', ' ');
+    const endDatetime = document.getElementById('datetime_qc_prev_end').value.replace('T', ' ');
+    const url = qcrecordFormConfig.fetchDataUrl
+        .replace('start_datetime', encodeURIComponent(startDatetime))
+        .replace('end_datetime', encodeURIComponent(endDatetime));
+
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            const qcPrevInput = document.querySelector('[name="qc_prev"]');
+            qcPrevInput.value = data.csv;
+
+            // Populate the table with fetched data
+            const tableBody = document.getElementById('fetched-data-table').querySelector('tbody');
+            tableBody.innerHTML = '';
+            data.table_data.forEach(row => {
+                const tr = document.createElement('tr');
+                Object.values(row).forEach(cell => {
+                    const td = document.createElement('td');
+                    td.textContent = cell;
+                    tr.appendChild(td);
+                });
+                tableBody.appendChild(tr);
+            });
+
+            // Simulate a click on the accordion button if not already expanded
+            const fetchedDataSection = document.getElementById('fetchedDataSection');
+            if (!fetchedDataSection.classList.contains('show')) {
+                const accordionButton = document.querySelector('[data-bs-target="#fetchedDataSection"]');
+                accordionButton.click();
+            }
+        })
+        .catch(error => console.error('Error fetching data:', error));
+});
+
+// Fetch data and fill qc
+document.getElementById('fetch_qc').addEventListener('click', function () {
+    const startDatetime = document.getElementById('datetime_qc_start').value.replace('T', ' ');
+    const endDatetime = document.getElementById('datetime_qc_end').value.replace('T', ' ');
+    const url = qcrecordFormConfig.fetchDataUrl
+        .replace('start_datetime', encodeURIComponent(startDatetime))
+        .replace('end_datetime', encodeURIComponent(endDatetime));
+
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            const qcInput = document.querySelector('[name="qc"]');
+            qcInput.value = data.csv;
+
+            // Populate the table with fetched data
+            const tableBody = document.getElementById('qc-data-table').querySelector('tbody');
+            tableBody.innerHTML = '';
+            data.table_data.forEach(row => {
+                const tr = document.createElement('tr');
+                Object.values(row).forEach(cell => {
+                    const td = document.createElement('td');
+                    td.textContent = cell;
+                    tr.appendChild(td);
+                });
+                tableBody.appendChild(tr);
+            });
+
+            // Simulate a click on the accordion button if not already expanded
+            const qcDataSection = document.getElementById('qcDataSection');
+            if (!qcDataSection.classList.contains('show')) {
+                const accordionButton = document.querySelector('[data-bs-target="#qcDataSection"]');
+                accordionButton.click();
+            }
+        })
+        .catch(error => console.error('Error fetching data:', error));
+});
+
+// set the datetime_qc_prev_start and datetime_qc_prev_end default value to be dependent on the waktu_dinas
+document.addEventListener('DOMContentLoaded', function () {
+    const dateInput = document.getElementById('id_date');
+    const waktuDinasSelect = document.getElementById('id_shift');
+    const datetimeQcPrevStart = document.getElementById('datetime_qc_prev_start');
+    const datetimeQcPrevEnd = document.getElementById('datetime_qc_prev_end');
+    const datetimeQcStart = document.getElementById('datetime_qc_start');
+    const datetimeQcEnd = document.getElementById('datetime_qc_end');
+
+    function updateDatetime() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        let startDatetime, endDatetime;
+
+        const prevDay = new Date(dateValue);
+        prevDay.setDate(prevDay.getDate() - 1);
+        const prevDayValue = prevDay.toISOString().split('T')[0];
+
+        switch (waktuDinasValue[0]) {
+            case 'P':
+                startDatetime = `${prevDayValue} 19:00:00`;
+                endDatetime = `${dateValue} 01:00:00`;
+                break;
+            case 'S':
+                startDatetime = `${dateValue} 01:00:00`;
+                endDatetime = `${dateValue} 07:00:00`;
+                break;
+            case 'M':
+                startDatetime = `${dateValue} 07:00:00`;
+                endDatetime = `${dateValue} 13:00:00`;
+                break;
+            case 'D':
+                startDatetime = `${prevDayValue} 13:00:00`;
+                endDatetime = `${prevDayValue} 19:00:00`;
+                break;
+        }
+
+        datetimeQcPrevStart.value = startDatetime;
+        datetimeQcPrevEnd.value = endDatetime;
+        datetimeQcStart.value = startDatetime;
+        datetimeQcEnd.value = endDatetime;
+    }
+
+    dateInput.addEventListener('change', updateDatetime);
+    waktuDinasSelect.addEventListener('change', updateDatetime);
+    updateDatetime()
+
+    function updateDatetimeQcPrevStart() {
+        const dateValue = dateInput.value;
+        const waktuDinasValue = waktuDinasSelect.value;
+        qcIdInput.value = dateValue + "-" + waktuDinasValue;
+    }
+});
+
+// Main DOMContentLoaded event listener
+document.addEventListener('DOMContentLoaded', function () {
+    // Set NIP's value based on the selected operator
+    const operatorSelect = document.getElementById('id_operator');
+    const nipInput = document.getElementById('id_NIP');
+    const nipContainer = document.getElementById('nip-container');
+
+    function updateNip() {
+        const selectedOperator = operatorSelect.value;
+
+        // Don't proceed if no operator is selected
+        if (!selectedOperator) {
+            nipInput.value = '';
+            nipContainer.classList.remove('col-md-4');
+            nipContainer.classList.add('col-md-6');
+            return;
+        }
+
+        fetch(`/qc/api/get_nip/${selectedOperator}/`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (data && data.nip) {
+                    nipInput.value = data.nip;
+
+                    nipContainer.classList.remove('col-md-4');
+                    nipContainer.classList.add('col-md-6');
+                } else {
+                    nipInput.value = '';
+                    nipContainer.classList.remove('col-md-6');
+                    nipContainer.classList.add('col-md-4');
+
+                    // Only show modal if an operator is actually selected
+                    if (selectedOperator) {
+                        const emptyNipModal = new bootstrap.Modal(document.getElementById('emptyNipModal'));
+                        const modalBody = document.getElementById('emptyNipModalBody');
+                        const selectedOperatorText = operatorSelect.options[operatorSelect.selectedIndex].text;
+
+                        modalBody.innerHTML = `
+                            <p>Operator <strong>${selectedOperatorText}</strong> belum memiliki NIP yang terdaftar.</p>
+                            <p>Silakan tambahkan NIP melalui halaman <a href="${qcrecordFormConfig.operatorListUrl}" class="alert-link">Manajemen Operator</a>.</p>
+                        `;
+                        emptyNipModal.show();
+                    }
+                }
+            })
+            .catch(error => {
+                console.error('Error fetching NIP:', error);
+                // Don't show error if no operator is selected
+                if (selectedOperator) {
+                    showErrorModal('Gagal mengambil data NIP: ' + (error.message || 'Terjadi kesalahan'));
+                }
+            });
+    }
+
+    operatorSelect.addEventListener('change', updateNip);
+    updateNip();
+});
+
+// --- Kelompok Sebelumnya logic ---
+document.addEventListener('DOMContentLoaded', function () {
+    // Adjust these IDs if needed
+    const shiftSelect = document.getElementById('id_shift');
+    const kelompokSelect = document.getElementById('id_kelompok');
+    const kelSebelumSelect = document.getElementById('id_kel_sebelum');
+
+    function updateKelSebelum() {
+        const shift = shiftSelect.value;
+        const kelompok = kelompokSelect.value;
+        let newValue = kelompok;
+        if (shift === 'Siang' || shift === 'Dini Hari') {
+            newValue = kelompok;
+        } else {
+            // Map kelompok to kel_sebelum based on pattern
+            const map = { '1': '4', '2': '5', '3': '1', '4': '2', '5': '3' };
+            newValue = map[kelompok] || kelompok;
+        }
+        // Set kelSebelumSelect value if option exists
+        for (let i = 0; i < kelSebelumSelect.options.length; i++) {
+            if (kelSebelumSelect.options[i].value === newValue) {
+                kelSebelumSelect.selectedIndex = i;
+                break;
+            }
+        }
+    }
+    if (shiftSelect && kelompokSelect && kelSebelumSelect) {
+        shiftSelect.addEventListener('change', updateKelSebelum);
+        kelompokSelect.addEventListener('change', updateKelSebelum);
+        // Call once on page load
+        updateKelSebelum();
+    }
+});
+
+// Show modal when NIP is empty
+document.addEventListener('DOMContentLoaded', function () {
+    const emptyNipModalElement = document.getElementById('emptyNipModal');
+    if (emptyNipModalElement) {
+        const emptyNipModal = new bootstrap.Modal(emptyNipModalElement);
+    }
+});
+
+// Handle form validation errors
+document.addEventListener('DOMContentLoaded', function () {
+    const formErrors = document.getElementById('form-errors');
+    if (formErrors && formErrors.dataset.errors === 'true') {
+        // Get the error modal element
+        const errorModalElement = document.getElementById('errorModal');
+        if (errorModalElement) {
+            // Initialize the Bootstrap 5 modal
+            const errorModal = new bootstrap.Modal(errorModalElement, {
+                backdrop: true, // Enable backdrop click to close
+                keyboard: true  // Enable ESC key to close
+            });
+
+            const errorContent = document.getElementById('errorModalContent');
+
+            if (errorContent) {
+                let errorHtml = '<p>Silakan perbaiki kesalahan berikut:</p><ul class="mb-0">';
+
+                // Get all error elements
+                const errorElements = formErrors.querySelectorAll('[data-field][data-error]');
+                if (errorElements.length > 0) {
+                    errorElements.forEach(el => {
+                        const fieldId = el.dataset.field;
+                        const errorMsg = el.dataset.error;
+                        const fieldLabel = document.querySelector(`label[for="${fieldId}"]`);
+                        const labelText = fieldLabel ? fieldLabel.textContent.trim().replace(':', '') : fieldId;
+                        errorHtml += `<li><strong>${labelText}:</strong> ${errorMsg}</li>`;
+                    });
+                } else {
+                    // Fallback if no specific field errors found
+                    errorHtml += '<li>Terjadi kesalahan saat memproses formulir.</li>';
+                }
+
+                errorHtml += '</ul>';
+                errorContent.innerHTML = errorHtml;
+
+                // Show the modal
+                errorModal.show();
+
+                // Manually handle close button click
+                const closeButtons = errorModalElement.querySelectorAll('[data-bs-dismiss="modal"]');
+                closeButtons.forEach(button => {
+                    button.addEventListener('click', function () {
+                        errorModal.hide();
+                    });
+                });
+            }
+        }
+    }
+});
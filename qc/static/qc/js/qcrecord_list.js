@@ -0,0 +1,335 @@
+const qcrecordListConfig = document.currentScript.dataset;
+
+document.addEventListener("DOMContentLoaded", function () {
+    // Initialize tooltips (assuming Bootstrap 5)
+    var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
+    var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+        // Ensure bootstrap is loaded, might need adjustment based on your base template
+        if (typeof bootstrap !== 'undefined') {
+            return new bootstrap.Tooltip(tooltipTriggerEl);
+        }
+    });
+
+    // Add event listeners for global search
+    var searchInput = document.getElementById('globalSearch');
+    var clearSearchBtn = document.getElementById('clearSearch');
+    var searchTimeout;
+
+    // Search on input with debounce
+    searchInput.addEventListener('input', function() {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(function() {
+            var searchValue = searchInput.value;
+            if (searchValue === '') {
+                table.clearFilter();
+            } else {
+                table.setFilter(function(data) {
+                    return table.options.globalSearch(data, searchValue);
+                });
+            }
+        }, 300);
+    });
+
+    // Clear search
+    clearSearchBtn.addEventListener('click', function() {
+        searchInput.value = '';
+        table.clearFilter();
+    });
+
+    // Search on Enter key
+    searchInput.addEventListener('keyup', function(e) {
+        if (e.key === 'Enter') {
+            clearTimeout(searchTimeout);
+            var searchValue = searchInput.value;
+            if (searchValue === '') {
+                table.clearFilter();
+            } else {
+                table.setFilter(function(data) {
+                    return table.options.globalSearch(data, searchValue);
+                });
+            }
+        } else if (e.key === 'Escape') {
+            searchInput.value = '';
+            table.clearFilter();
+        }
+    });
+
+    // Initialize all delete modals
+    const deleteModals = document.querySelectorAll('.modal');
+    deleteModals.forEach(modal => {
+        new bootstrap.Modal(modal);
+    });
+
+    // Handle delete form submission
+    const deleteButtons = document.querySelectorAll('.delete-button');
+    deleteButtons.forEach(button => {
+        button.addEventListener('click', function () {
+            const modal = bootstrap.Modal.getInstance(button.closest('.modal'));
+            if (modal) {
+                modal.show();
+            }
+        });
+    });
+
+    // Initialize Tabulator
+    var table = new Tabulator("#tabulator-table", {
+
+        // Disable header filters
+        headerFilterLiveFilter: false,
+        // Update deprecated configuration options
+        layout: "fitColumns", // Make table fill available space
+        responsiveLayout: false,
+        pagination: "remote",
+        paginationSize: 10,
+        movableColumns: true,
+        dataLoader: false,
+        addRowPos: "top",
+        history: true,
+        paginationCounter: "rows",
+        ajaxURL: qcrecordListConfig.qcrecordListApiUrl,
+        ajaxConfig: "GET",
+        ajaxRequesting: function(url, params) {
+            // Show loading state
+            document.getElementById('tabulator-table').classList.add('loading');
+        },
+        ajaxResponse: function(url, params, response) {
+            // Hide loading state
+            document.getElementById('tabulator-table').classList.remove('loading');
+            console.log('AJAX Response received. Record count:', response ? response.length : 0);
+            return response;
+        },
+        ajaxError: function(xhr, status, error) {
+            // Hide loading state on error
+            document.getElementById('tabulator-table').classList.remove('loading');
+            console.error('AJAX Error:', error);
+        },
+        ajaxContentType: "json",
+
+        // Function to perform global search
+        globalSearch: function(data, searchValue) {
+            // Check each property of the row
+            for (var key in data) {
+                // Skip internal Tabulator fields and functions
+                if (typeof data[key] === 'function' || key === 'id' || key === '_row' || key === 'table') {
+                    continue;
+                }
+
+                // Get the value and convert to string
+                var value = data[key];
+                if (value === null || value === undefined) {
+                    continue;
+                }
+
+                // Convert to string and check if it contains the search term
+                var stringValue = String(value).toLowerCase();
+                if (stringValue.includes(searchValue.toLowerCase())) {
+                    return true;
+                }
+            }
+            return false;
+        },
+
+        ajaxResponse: function (url, params, response) {
+            console.log('AJAX Response received. Record count:', response ? response.length : 0);
+            if (response && response.length > 0) {
+                console.log('First record:', response[0]);
+            }
+            document.getElementById('tabulator-table').classList.remove('loading');
+            return response;
+        },
+        ajaxError: function (xhr, status, error) {
+            console.error('AJAX Error:', status, error);
+            console.error('Response text:', xhr.responseText);
+            document.getElementById('tabulator-table').classList.remove('loading');
+            return [];
+        },
+        dataLoaded: function (data) {
+            console.log('Data loaded into Tabulator. Row count:', data.length);
+            if (data.length > 0) {
+                console.log('First row data:', data[0]);
+            }
+            updateStatusBar();
+        },
+        dataLoadError: function (error) {
+            console.error('Data load error:', error);
+        },
+        tableBuilt: function () {
+            const table = this;
+
+            // Pagination event handlers
+            document.getElementById('first-page').addEventListener('click', () => table.setPage(1));
+            document.getElementById('prev-page').addEventListener('click', () => table.previousPage());
+            document.getElementById('next-page').addEventListener('click', () => table.nextPage());
+            document.getElementById('last-page').addEventListener('click', () => table.setPage('last'));
+
+            // Page size change handler
+            document.getElementById('page-size').addEventListener('change', function () {
+                table.setPageSize(parseInt(this.value));
+                table.setPage(1);
+            });
+
+            // Update status when data changes
+            table.on([
+                'pageLoaded',
+                'pageSizeChanged',
+                'dataFiltered',
+                'dataSorted',
+            ], updateStatusBar);
+
+            // Initial status update
+            updateStatusBar();
+            const tableElement = document.querySelector('.tabulator-tableholder');
+            const scrollLeftBtn = document.getElementById('scroll-left');
+            const scrollRightBtn = document.getElementById('scroll-right');
+
+            // Update button states
+            const updateButtonStates = () => {
+                scrollLeftBtn.disabled = tableElement.scrollLeft === 0;
+                scrollRightBtn.disabled = tableElement.scrollLeft >= (tableElement.scrollWidth - tableElement.clientWidth - 5);
+            };
+
+            // Scroll left
+            scrollLeftBtn.addEventListener('click', () => {
+                tableElement.scrollBy({ left: -200, behavior: 'smooth' });
+                setTimeout(updateButtonStates, 300);
+            });
+
+            // Scroll right
+            scrollRightBtn.addEventListener('click', () => {
+                tableElement.scrollBy({ left: 200, behavior: 'smooth' });
+                setTimeout(updateButtonStates, 300);
+            });
+
+            // Update on scroll
+            tableElement.addEventListener('scroll', updateButtonStates);
+
+            // Initial state
+            updateButtonStates();
+        },
+        columns: [
+            {
+                title: "QC ID",
+                field: "qc_id",
+                hozAlign: "center",
+                headerHozAlign: "center",
+                formatter: function (cell, formatterParams, onRendered) {
+                    const value = cell.getValue();
+                    return value || '';
+                }
+            },
+            {
+                title: "Kelompok",
+                field: "kelompok",
+                headerHozAlign: "center",
+                hozAlign: "center",
+                width: 100,
+                formatter: function (cell) {
+                    return cell.getValue() || '';
+                }
+            },
+            {
+                title: "Kelompok Sebelumnya",
+                field: "kel_sebelum",
+                headerHozAlign: "center",
+                hozAlign: "center",
+                width: 100,
+                formatter: function (cell) {
+                    return cell.getValue() || '';
+                }
+            },
+            {
+                title: "Operator",
+                field: "operator",
+                headerHozAlign: "center",
+                formatter: function (cell) {
+                    return cell.getValue() || '';
+                }
+            },
+            {
+                title: "Actions",
+                headerHozAlign: "center",
+                formatter: function (cell, formatterParams, onRendered) {
+                    const row = cell.getRow();
+                    const data = row.getData();
+                    const id = data.id;
+
+                    // Get the template and clone it
+                    const template = document.getElementById('action-buttons-template');
+                    const clone = template.content.cloneNode(true);
+                    const container = clone.querySelector('.d-flex');
+
+                    // Set up the buttons
+                    const editBtn = container.querySelector('.action-edit');
+                    const deleteBtn = container.querySelector('.action-delete');
+                    const excelBtn = container.querySelector('.action-export-excel');
+                    const pdfBtn = container.querySelector('.action-export-pdf');
+
+                    // Set URLs
+                    editBtn.href = qcrecordListConfig.qcrecordUpdateUrl.replace('0', id);
+                    deleteBtn.dataset.deleteUrl = qcrecordListConfig.qcrecordDeleteDirectUrl.replace('0', id);
+                    excelBtn.href = qcrecordListConfig.exportToExcelUrl.replace('0', id);
+                    pdfBtn.href = qcrecordListConfig.exportToPdfUrl.replace('0', id);
+
+                    // Initialize tooltips
+                    const tooltipTriggerList = [].slice.call(container.querySelectorAll('[data-bs-toggle="tooltip"]'));
+                    tooltipTriggerList.map(function (tooltipTriggerEl) {
+                        return new bootstrap.Tooltip(tooltipTriggerEl);
+                    });
+
+                    // Return the cloned node
+                    return container;
+                },
+                headerSort: false
+            }
+        ],
+        ajaxRequesting: function (url, params) {
+            console.log('AJAX Request:', url, params);
+            // Show loading state
+            document.getElementById('tabulator-table').classList.add('loading');
+        },
+        ajaxResponse: function (url, params, response) {
+            console.log('AJAX Response:', url, response);
+            // Hide loading state
+            document.getElementById('tabulator-table').classList.remove('loading');
+            return response;
+        },
+        ajaxError: function (xhr, textStatus, errorThrown) {
+            console.error('AJAX Error:', textStatus, errorThrown);
+            document.getElementById('tabulator-table').classList.remove('loading');
+            return [];
+        }
+    });
+
+});
+
+// Handle delete confirmation modal
+document.addEventListener('DOMContentLoaded', function() {
+    // Create a single form for all delete actions
+    const deleteForm = document.createElement('form');
+    deleteForm.method = 'post';
+    deleteForm.style.display = 'none';
+    deleteForm.innerHTML = `<input type="hidden" name="csrfmiddlewaretoken" value="${qcrecordListConfig.csrfToken}">`;
+    document.body.appendChild(deleteForm);
+
+    let deleteUrl = '';
+
+    // When delete button is clicked, store the delete URL
+    document.addEventListener('click', function(e) {
+        if (e.target.closest('.action-delete')) {
+            e.preventDefault();
+            const button = e.target.closest('.action-delete');
+            deleteUrl = button.getAttribute('data-delete-url');
+        }
+    });
+
+    // When confirm delete is clicked, submit the form
+    const confirmDeleteBtn = document.getElementById('confirmDelete');
+    if (confirmDeleteBtn) {
+        confirmDeleteBtn.addEventListener('click', function() {
+            if (deleteUrl) {
+                deleteForm.action = deleteUrl;
+                deleteForm.submit();
+            }
+        });
+    }
+});
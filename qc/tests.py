@@ -1,3 +1,166 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Kelompok, Operator
+from core.test_runner import ProcessCachesMixin
+
+
+class FindDuplicatesAllTests(ProcessCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.operators = [Operator.objects.create(name=f'Operator {i}', NIP=str(i)) for i in range(3)]
+        self.first = Kelompok.objects.create(name=1)
+        self.complete = Kelompok.objects.create(name=1)
+        self.complete.set_members([self.operators[0].pk, self.operators[1].pk])
+        self.latest = Kelompok.objects.create(name=1)
+        self.latest.set_members([self.operators[1].pk])
+        self.unique = Kelompok.objects.create(name=2)
+
+    def run_command(self, *args):
+        out = io.StringIO()
+        call_command('find_duplicates_all', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_writes_report_without_deleting(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'duplicates.json')
+            self.run_command('--dry-run', '--report', path)
+            with open(path) as f:
+                report = json.load(f)
+
+        entry = next(m for m in report['models'] if m['model'] == 'core.Kelompok')
+        self.assertEqual(entry['groups'], [
+            {'value': 1, 'keep': self.first.pk, 'duplicates': [self.complete.pk, self.latest.pk]}])
+        self.assertEqual(entry['deleted'], [])
+        self.assertEqual(Kelompok.objects.count(), 4)
+
+    def test_no_input_keeps_most_complete(self):
+        self.run_command('--no-input', '--keep', 'complete')
+        self.assertEqual(set(Kelompok.objects.values_list('pk', flat=True)), {self.complete.pk, self.unique.pk})
+        self.assertEqual(Kelompok.objects.get(pk=self.complete.pk).member_ids(),
+                         [self.operators[0].pk, self.operators[1].pk])
+
+    def test_no_input_keeps_most_recent(self):
+        self.run_command('--no-input', '--keep', 'recent')
+        self.assertEqual(set(Kelompok.objects.values_list('pk', flat=True)), {self.latest.pk, self.unique.pk})
+        # The members of the deleted duplicates move to the group kept, once each
+        self.assertEqual(sorted(Kelompok.objects.get(pk=self.latest.pk).member_ids()),
+                         [self.operators[0].pk, self.operators[1].pk])
+
+    def test_duplicate_operator_keeps_its_records(self):
+        from cl_seiscomp.models import CsRecordModel
+        from qc.models import QcRecord
+
+        kept, duplicate = self.operators[2], Operator.objects.create(name='Operator 2', NIP='2')
+        self.unique.set_members([kept.pk, duplicate.pk])
+        QcRecord.objects.create(qc_id='QC-1', operator=duplicate)
+        CsRecordModel.objects.create(cs_id='CS-1', operator=duplicate)
+        self.run_command('--no-input')
+
+        self.assertFalse(Operator.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(QcRecord.objects.get().operator_id, kept.pk)
+        self.assertEqual(CsRecordModel.objects.get().operator_id, kept.pk)
+        self.assertEqual(Kelompok.objects.get(pk=self.unique.pk).member_ids(), [kept.pk])
+
+
+INDEX3 = (
+    "Gempabumi Terkini\n"
+    "-----------------\n"
+    "Event ID | Origin Time (GMT) | Lat | Lon | Depth | Mag | TypeMag | cntP | RMS | AZgap | Remarks\n"
+    "-----------------\n"
+    "bmg2024x | 2024-12-11 14:00:00 | -7.10 | 110.20 | 10 | 3.2 | M | 12 | 0.5 | 120 | Central Java\n"
+    "bmg2024y | 2024-12-11 20:00:00 | -8.30 | 115.10 | 25 | 4.0 | MLv | 20 | 0.7 | 90 | Bali\n"
+)
+
+
+class SlowUpstreamHandler(BaseHTTPRequestHandler):
+    delay = 0
+    # Set by a test: requests wait here until that many are in flight together
+    barrier = None
+
+    def do_GET(self):
+        handler = type(self)
+        with handler.lock:
+            handler.in_flight += 1
+            handler.peak = max(handler.peak, handler.in_flight)
+        try:
+            if self.barrier:
+                try:
+                    self.barrier.wait(5)
+                except threading.BrokenBarrierError:
+                    pass
+            time.sleep(self.delay)
+            self.respond()
+        finally:
+            with handler.lock:
+                handler.in_flight -= 1
+
+    def respond(self):
+        if self.path != '/index3.txt':
+            self.send_error(404)
+            return
+        body = INDEX3.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client timed out and hung up first
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchDataTests(TestCase):
+    def setUp(self):
+        self.handler = type('Handler', (SlowUpstreamHandler,), {'lock': threading.Lock(), 'in_flight': 0, 'peak': 0})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler, bind_and_activate=False)
+        # The default listen backlog of 5 would stall the concurrent test
+        self.server.request_queue_size = 32
+        self.server.server_bind()
+        self.server.server_activate()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.enterContext(override_settings(UPSTREAM_BASE_URL=f'http://127.0.0.1:{self.server.server_port}'))
+        self.url = reverse('qc:fetch_data', args=['2024-12-11 13:00:00', '2024-12-11 19:00:00'])
+
+    def test_fetch_returns_events_in_window(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(len(data['table_data']), 1)
+        self.assertEqual(data['table_data'][0]['No'], 1)
+        self.assertEqual(data['table_data'][0]['Region'], 'Central Java')
+        self.assertTrue(data['csv'].startswith('Date,OT (UTC),Lat,Long'))
+
+    @override_settings(UPSTREAM_TIMEOUT=0.2)
+    def test_slow_upstream_times_out(self):
+        self.handler.delay = 1
+        with self.assertLogs('core.upstream', 'WARNING'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json(), {'error': 'Upstream timed out'})
+
+    def test_missing_upstream_file(self):
+        with self.assertLogs('core.upstream', 'WARNING'):
+            response = self.client.get(reverse('qcfm:fetch_data', args=['2025-03-12 00:00:00', '2025-03-13 00:00:00']))
+        self.assertEqual(response.status_code, 502)
+
+    async def test_concurrent_fetches_wait_together(self):
+        # Every request waits for all eight: queued fetches would leave the first one alone at the barrier
+        self.handler.barrier = threading.Barrier(8)
+        responses = await asyncio.gather(*(self.async_client.get(self.url) for _ in range(8)))
+        self.assertEqual([response.status_code for response in responses], [200] * 8)
+        self.assertEqual(self.handler.peak, 8)
+        self.assertFalse(self.handler.barrier.broken)
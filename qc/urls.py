@@ -3,6 +3,7 @@ from django.http import HttpResponse
 from django.urls import path
 from .views import QcRecordListView, QcRecordCreateView, QcRecordUpdateView, fetch_data, export_to_excel, QcRecordDeleteDirectView, ErrorStationListView, ErrorStationCreateView, ErrorStationUpdateView, ErrorStationDeleteView
 from . import views
+from core import views as core_views
 
 app_name = 'qc'
 
@@ -13,7 +14,7 @@ urlpatterns = [
     path('update/<int:pk>/', QcRecordUpdateView.as_view(), name='qcrecord_update'),
     path('fetch-data/<str:start_datetime>/<str:end_datetime>/', fetch_data, name='fetch_data'),
     path('api/qcrecord-list/<int:counts>/', views.qcrecord_list_api, name='qcrecord_list_api'),
-    path('api/get_nip/<int:operator_id>/', views.get_nip, name='get_nip'),
+    path('api/get_nip/<int:operator_id>/', core_views.get_nip, name='get_nip'),
     path('api/export-to-excel/<int:record_id>/', views.export_to_excel, name='export_to_excel'),
     path('api/export-to-pdf/<int:record_id>/', views.export_to_pdf, name='export_to_pdf'),
     path('delete-direct/<int:pk>/', QcRecordDeleteDirectView.as_view(), name='qcrecord_delete_direct'),
@@ -4,18 +4,17 @@ from django.urls import reverse_lazy
 from .models import QcRecord, ErrorStation
 from .forms import QcRecordForm, ErrorStationForm
 from django.shortcuts import render
-import requests, openpyxl, datetime, os
-import pandas as pd
+import datetime, os
+from core.upstream import fetch_table
 from django.http import JsonResponse, HttpResponse
 from core.models import Operator
 from io import StringIO
-from openpyxl.utils.dataframe import dataframe_to_rows
 from django.views import View
 from django.shortcuts import redirect
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
-from cl_seiscomp.models import StationListModel
+from cl_seiscomp.station_directory import station_directory
 from django.forms.models import model_to_dict
 import logging
 
@@ -84,7 +83,7 @@ class ErrorStationCreateView(CreateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['station_list'] = list(StationListModel.objects.values('code', 'province', 'location', 'UPT'))
+        context['station_list'] = station_directory.stations('code', 'province', 'location', 'UPT')
         return context
 
 class ErrorStationUpdateView(UpdateView):
@@ -95,7 +94,7 @@ class ErrorStationUpdateView(UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['station_list'] = list(StationListModel.objects.values('code', 'province', 'location', 'UPT'))
+        context['station_list'] = station_directory.stations('code', 'province', 'location', 'UPT')
         return context
 
 class ErrorStationDeleteView(DeleteView):
@@ -105,6 +104,7 @@ class ErrorStationDeleteView(DeleteView):
 
 # Functions
 def clean_index3(data, start_datetime='2024-12-11 13:00:00', end_datetime='2024-12-11 19:00:00'):
+    import pandas as pd
     text = data.decode('utf-8')
 
     lines = text.split('\n')
@@ -142,25 +142,8 @@ def clean_index3(data, start_datetime='2024-12-11 13:00:00', end_datetime='2024-
     
     return df_selected
 
-def fetch_data(request, start_datetime='2024-12-11 13:00:00', end_datetime='2024-12-11 19:00:00'):
-    url = "http://202.90.198.41/index3.txt"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = clean_index3(response.content, start_datetime, end_datetime)
-        csv_data = data.to_csv(index=False)
-        table_data = data.insert(0, 'No', range(1, len(data) + 1))
-        table_data = data.to_dict(orient='records')
-        return JsonResponse({'csv': csv_data, 'table_data': table_data})
-    else:
-        return JsonResponse({'error': 'Failed to fetch data'}, status=500)
-
-def get_nip(request, operator_id):
-    try:
-        operator = Operator.objects.get(id=operator_id)
-        return JsonResponse({'nip': operator.NIP})
-    except Operator.DoesNotExist:
-        return JsonResponse({'error': 'Operator not found'}, status=404)
+async def fetch_data(request, start_datetime='2024-12-11 13:00:00', end_datetime='2024-12-11 19:00:00'):
+    return await fetch_table('index3.txt', clean_index3, start_datetime, end_datetime, numbered=True)
 
 @csrf_exempt
 def save_nip(request):
@@ -188,6 +171,10 @@ def populate_sheet_with_record(sheet, record):
     """
     Populates the given sheet with data from the record.
     """
+    import openpyxl
+    from openpyxl.utils.dataframe import dataframe_to_rows
+    import pandas as pd
+
     tanggal = format_date_indonesian(record.qc_id[3:-3])
     hari = get_hari_indonesia(record.qc_id[3:-3])
     sheet['G2'] = ': ' + tanggal
@@ -227,6 +214,7 @@ def populate_sheet_with_record(sheet, record):
     return rows_to_add, tanggal
 
 def export_to_excel(request, record_id):
+    import openpyxl
     try:
         record = QcRecord.objects.get(id=record_id)
     except QcRecord.DoesNotExist:
@@ -257,6 +245,7 @@ def export_to_excel(request, record_id):
     return response
 
 def export_to_pdf(request, record_id):
+    import openpyxl
     try:
         record = QcRecord.objects.get(id=record_id)
     except QcRecord.DoesNotExist:
@@ -385,7 +374,7 @@ def export_qc_to_csv(request):
         ])
         
         # Get all records ordered by qc_id
-        records = QcRecord.objects.all().order_by('qc_id')
+        records = QcRecord.objects.all().order_by('qc_id').select_related('operator')
         print(f"Found {records.count()} records to export")
         print(f"First record: {records.first()}")
         
@@ -1,8 +1,14 @@
 from django import forms
 from .models import QcFmRecord
+from core.cache import operator_choices
 
 class QcFmRecordForm(forms.ModelForm):
     qcfm_id = forms.CharField()
     class Meta:
         model = QcFmRecord
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Operator options come from the directory cache instead of a query per render
+        self.fields['operator'].choices = operator_choices()
@@ -34,5 +34,12 @@ class QcFmRecord(models.Model):
     NIP = models.CharField(max_length=18, default='0', blank=True, null=True)
     kel_sebelum = models.CharField(max_length=1, choices=KELOMPOK, default='1')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='qcfm_date_idx'),
+            models.Index(fields=['shift', 'date'], name='qcfm_shift_date_idx'),
+            models.Index(fields=['operator', 'date'], name='qcfm_operator_date_idx'),
+        ]
+
     def __str__(self):
         return self.qcfm_id
@@ -1,6 +1,7 @@
 from django.urls import path
 from .views import QcFmRecordListView, QcFmRecordCreateView, QcFmRecordUpdateView, fetch_data, export_to_excel, QcFmRecordDeleteDirectView
 from . import views
+from core import views as core_views
 
 app_name = 'qcfm'
 
@@ -10,7 +11,7 @@ urlpatterns = [
     path('create/', QcFmRecordCreateView.as_view(), name='qcfmrecord_create'),
     path('update/<int:pk>/', QcFmRecordUpdateView.as_view(), name='qcfmrecord_update'),
     path('fetch-data/<str:start_datetime>/<str:end_datetime>/', fetch_data, name='fetch_data'),
-    path('api/get_nip/<int:operator_id>/', views.get_nip, name='get_nip'),
+    path('api/get_nip/<int:operator_id>/', core_views.get_nip, name='get_nip'),
     path('api/qcfmrecord-list/<int:counts>/', views.qcfmrecord_list_api, name='qcfmrecord_list_api'),
     path('api/export-to-excel/<int:record_id>/', views.export_to_excel, name='export_to_excel'),
     path('api/export-csv/', views.export_qcfm_to_csv, name='export_qcfm_csv'),
@@ -3,12 +3,10 @@ from django.urls import reverse_lazy
 from .models import QcFmRecord
 from .forms import QcFmRecordForm
 from django.shortcuts import render
-import requests, openpyxl, datetime, os
-import pandas as pd
+import datetime, os
+from core.upstream import fetch_table
 from django.http import JsonResponse, HttpResponse
-from core.models import Operator
 from io import StringIO
-from openpyxl.utils.dataframe import dataframe_to_rows
 from django.views import View
 from django.shortcuts import redirect
 from django.forms.models import model_to_dict
@@ -69,6 +67,7 @@ class QcFmRecordDeleteDirectView(View):
 
 # Functions
 def clean_fm_data(data, start_datetime='2025-03-12 00:00:00', end_datetime='2025-03-13 00:00:00'):
+    import pandas as pd
     text = data.decode('utf-8')
 
     lines = text.split('\n')
@@ -106,27 +105,14 @@ def clean_fm_data(data, start_datetime='2025-03-12 00:00:00', end_datetime='2025
     
     return df_selected
 
-def fetch_data(request, start_datetime='2025-03-12 00:00:00', end_datetime='2025-03-13 00:00:00'):
-    url = "http://202.90.198.41/qc_focal.txt"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = clean_fm_data(response.content, start_datetime, end_datetime)
-        csv_data = data.to_csv(index=False)
-        table_data = data.insert(0, 'No', range(1, len(data) + 1))
-        table_data = data.to_dict(orient='records')
-        return JsonResponse({'csv': csv_data, 'table_data': table_data})
-    else:
-        return JsonResponse({'error': 'Failed to fetch data'}, status=500)
-
-def get_nip(request, operator_id):
-    try:
-        operator = Operator.objects.get(id=operator_id)
-        return JsonResponse({'nip': operator.NIP})
-    except Operator.DoesNotExist:
-        return JsonResponse({'error': 'Operator not found'}, status=404)
+async def fetch_data(request, start_datetime='2025-03-12 00:00:00', end_datetime='2025-03-13 00:00:00'):
+    return await fetch_table('qc_focal.txt', clean_fm_data, start_datetime, end_datetime, numbered=True)
 
 def prepare_workbook(record):
+    import openpyxl
+    from openpyxl.utils.dataframe import dataframe_to_rows
+    import pandas as pd
+
     file_path = os.path.join(os.path.dirname(__file__), 'static/qcfm/QC_FM.xlsx')
     workbook = openpyxl.load_workbook(file_path)
     sheet = workbook.active
@@ -306,7 +292,7 @@ def export_qcfm_to_csv(request):
         ])
         
         # Get all records ordered by qcfm_id
-        records = QcFmRecord.objects.all().order_by('qcfm_id')
+        records = QcFmRecord.objects.all().order_by('qcfm_id').select_related('operator')
         print(f"Found {records.count()} records to export")
         print(f"First record: {records.first()}")
         
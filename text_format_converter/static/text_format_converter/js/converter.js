@@ -0,0 +1,75 @@
+// replace the * in the input text to ** when the input changes, use vanilla js
+document.getElementById('input').addEventListener('input', function () {
+    let input = document.getElementById('input').value;
+
+    // Clean newlines that contain only spaces
+    input = input.replace(/^\s*[\r\n]/gm, '\n');
+
+    let telegram = input.replace(/\*/g, '**').replace(/\_/g, '__').replace('infobmkg.**', 'infobmkg.*');
+    document.getElementById('telegram').value = telegram;
+
+    // Change the input text format to HTML format
+    // Replace *bold* with <strong></strong>
+    let web = input.replace(/\*(.+?)\*/g, '<strong>$1</strong>');
+
+    // Add one new line after the second line
+    web = web.replace(/^((?:.*\n){1})/, '$1<br>');
+
+    // Make the first line center-aligned
+    web = web.replace(/^(.*?)(\n|$)/, '<p style="text-align: center;  margin-bottom: 0;">$1</p>');
+
+    // Make all paragraphs justify-aligned except the subtitle (bold text)
+    web = web.replace(/^(?!<strong>)(.+?)(\n|$)/gm, '<p style="text-align: justify; margin-bottom: 0;">$1</p>');
+
+    // Replace _italic_ with <em></em> (if you need italics)
+    web = web.replace(/\_(.+?)\_/g, '<em>$1</em>');
+
+    // Replace newline characters with <br> for line breaks
+    web = web.replace(/\n/g, '<br>');
+    document.getElementById('web').innerHTML = web;
+});
+
+// copy the text to clipboard
+function copyToClipboard(elementId) {
+    var copyText = document.getElementById(elementId);
+    if (elementId === 'web') {
+        var range = document.createRange();
+        range.selectNode(copyText);
+        window.getSelection().removeAllRanges();
+        window.getSelection().addRange(range);
+        document.execCommand("copy");
+        window.getSelection().removeAllRanges();
+    } else {
+        copyText.select();
+        document.execCommand("copy");
+    }
+    // Update toast message
+    var toastBody = document.getElementById('toastBody');
+    toastBody.innerText = elementId.charAt(0).toUpperCase() + elementId.slice(1) + ' text copied to clipboard!';
+    // Show toast notification
+    bootstrap.Toast.getOrCreateInstance(document.getElementById('copyToast')).show();
+}
+
+async function pasteFromClipboard(elementId) {
+    try {
+        const text = await navigator.clipboard.readText();
+        const element = document.getElementById(elementId);
+        if (element) {
+            element.value = text;
+            // Trigger the input event to update the other fields
+            const event = new Event('input', { bubbles: true });
+            element.dispatchEvent(event);
+
+            // Show success toast
+            const toastBody = document.getElementById('toastBody');
+            toastBody.innerText = 'Text pasted from clipboard!';
+            bootstrap.Toast.getOrCreateInstance(document.getElementById('copyToast')).show();
+        }
+    } catch (err) {
+        console.error('Failed to read clipboard:', err);
+        // Show error toast
+        const toastBody = document.getElementById('toastBody');
+        toastBody.innerText = 'Failed to paste from clipboard. Please check permissions.';
+        bootstrap.Toast.getOrCreateInstance(document.getElementById('copyToast')).show();
+    }
+}
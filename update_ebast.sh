@@ -2,4 +2,9 @@ mv db.sqlite3 ..
 git pull
 mv ../db.sqlite3 .
 python manage.py makemigrations && python manage.py migrate && python manage.py collectstatic --noinput
+# One-off backfills of the search index, station issues, kelompok members and CS rollups. They rebuild
+# whole tables and the app keeps them current afterwards, so they run on the first update only.
+if [ ! -f .backfilled ]; then
+    python manage.py rebuild_search_index && python manage.py backfill_station_issues && python manage.py backfill_kelompok_members && python manage.py rebuild_cs_daily_stats && touch .backfilled
+fi
 sudo systemctl restart ebast.service
\ No newline at end of file